@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Agent Activity Log
+==================
+Compact, queryable record of subordinate agent activity.
+
+Request handlers only put a small tuple on a bounded queue; a writer
+thread hashes the payload, builds one compact JSON line per activity
+(agent, activity, size, hash, latency, outcome) and appends it to the
+current segment file. Segments roll at ``segment_bytes`` and the oldest
+closed segments are deleted beyond ``max_segments``.
+
+Each process writes its own segments (``<pid>-<n>.jsonl``), so several
+API workers can share one directory. A worker's highest-numbered segment
+is still open unless that process has exited, and retention never deletes
+an open segment. Queries tail every segment into an
+in-memory index of agent_id -> [(ts, offset)] and time -> [(ts, offset)],
+then bisect to ``since`` and read only the matching lines.
+
+Usage:
+    python agent_activity.py [agent_id] [--since 2026-10-01T00:00:00]
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_DIRECTORY = 'agent_activity'
+SEGMENT_BYTES = 8 * 1024 * 1024
+MAX_SEGMENTS = 32
+QUEUE_SIZE = 10000
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _segment_key(path):
+    """(pid, segment number) from a ``<pid>-<n>.jsonl`` path"""
+    pid, number = os.path.basename(path)[:-len('.jsonl')].split('-', 1)
+    return int(pid), int(number)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def parse_since(value):
+    """Epoch seconds from an ISO timestamp or a number (None passes through)"""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class SegmentIndex:
+    """Offsets of the records in one segment file, by agent and by time"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.indexed_bytes = 0
+        self.by_agent = {}
+        self.by_time = []
+        self.max_ts = None
+
+    def catch_up(self):
+        """Index records appended since the last call; only whole lines are consumed"""
+        with open(self.path, 'rb') as f:
+            f.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # a writer is mid-append; pick it up next time
+                try:
+                    record = json.loads(line)
+                    entry = (record['ts'], offset)
+                except (ValueError, KeyError):
+                    entry = None
+                if entry is not None:
+                    self.by_agent.setdefault(record['agent_id'], []).append(entry)
+                    self.by_time.append(entry)
+                    self.max_ts = entry[0] if self.max_ts is None else max(self.max_ts, entry[0])
+                offset += len(line)
+            self.indexed_bytes = offset
+
+
+class ActivityRecorder:
+    """Queue-fed append-only segment store with an agent/time index"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, segment_bytes=SEGMENT_BYTES, max_segments=MAX_SEGMENTS,
+                 queue_size=QUEUE_SIZE):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.segments = {}
+        self.stats = {'recorded': 0, 'dropped': 0, 'written': 0}
+        self.thread = None
+        self.pid = None
+        self.segment_file = None
+        self.segment_path = None
+
+    def record(self, agent_id, activity, payload=None, latency_ms=None, outcome='ok'):
+        """Queue one activity record; never blocks the caller"""
+        if self.thread is None or self.pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait((time.time(), agent_id, activity, payload, latency_ms, outcome))
+            self.stats['recorded'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+                return self
+            self.pid = os.getpid()
+            self.segment_file = None
+            self.thread = threading.Thread(target=self._run, name='agent-activity', daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except OSError as e:
+                print(f"⚠️ Activity log write failed: {e}")
+
+    def _write(self, batch):
+        lines = []
+        for ts, agent_id, activity, payload, latency_ms, outcome in batch:
+            if isinstance(payload, str):
+                payload = payload.encode('utf-8')
+            elif payload is not None and not isinstance(payload, bytes):
+                payload = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+            lines.append(json.dumps({
+                'ts': round(ts, 6),
+                'agent_id': agent_id,
+                'activity': activity,
+                'size': len(payload) if payload is not None else 0,
+                'hash': hashlib.sha256(payload).hexdigest()[:16] if payload is not None else None,
+                'latency_ms': None if latency_ms is None else round(latency_ms, 1),
+                'outcome': outcome
+            }, separators=(',', ':')))
+
+        if self.segment_file is None or self.segment_file.tell() >= self.segment_bytes:
+            self._roll()
+        self.segment_file.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        self.segment_file.flush()
+        self.stats['written'] += len(lines)
+
+    def _roll(self):
+        if self.segment_file is not None:
+            self.segment_file.close()
+        # Created on first write, so importing the API does not leave a directory behind
+        os.makedirs(self.directory, exist_ok=True)
+        existing = sorted(glob.glob(os.path.join(self.directory, f'{self.pid}-*.jsonl')))
+        number = int(existing[-1].rsplit('-', 1)[1].split('.')[0]) + 1 if existing else 1
+        self.segment_path = os.path.join(self.directory, f'{self.pid}-{number:06d}.jsonl')
+        self.segment_file = open(self.segment_path, 'ab')
+
+        # Retention across every writer: drop the oldest closed segments beyond the limit
+        segments = glob.glob(os.path.join(self.directory, '*.jsonl'))
+        excess = len(segments) - self.max_segments
+        if excess <= 0:
+            return
+        latest = {}
+        for path in segments:
+            try:
+                pid, number = _segment_key(path)
+            except ValueError:
+                continue
+            latest[pid] = max(latest.get(pid, 0), number)
+        open_segments = {os.path.join(self.directory, f'{pid}-{number:06d}.jsonl')
+                         for pid, number in latest.items() if pid == self.pid or _pid_alive(pid)}
+        closed = []
+        for path in segments:
+            if path in open_segments:
+                continue
+            try:
+                closed.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        removed = []
+        for _, path in sorted(closed)[:excess]:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError:
+                pass
+        with self.lock:
+            for path in removed:
+                self.segments.pop(path, None)
+
+    def _refresh_index(self):
+        paths = set(glob.glob(os.path.join(self.directory, '*.jsonl')))
+        for path in list(self.segments):
+            if path not in paths:
+                del self.segments[path]
+        for path in paths:
+            segment = self.segments.get(path)
+            if segment is None:
+                segment = self.segments[path] = SegmentIndex(path)
+            try:
+                if os.path.getsize(path) > segment.indexed_bytes:
+                    segment.catch_up()
+            except OSError:
+                self.segments.pop(path, None)
+
+    def query(self, agent_id=None, since=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """One page of records (oldest first) and the cursor for the next page"""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        after = None
+        if cursor:
+            ts, name, offset = cursor.rsplit(',', 2)
+            after = (float(ts), name, int(offset))
+        since = parse_since(since)
+        start_ts = max(since or 0.0, after[0] if after else 0.0)
+
+        with self.lock:
+            self._refresh_index()
+            streams = []
+            for segment in self.segments.values():
+                if segment.max_ts is None or segment.max_ts < start_ts:
+                    continue
+                entries = segment.by_agent.get(agent_id, []) if agent_id else segment.by_time
+                first = bisect.bisect_left(entries, (start_ts, -1))
+                streams.append(self._stream(segment, entries, first))
+
+            page = []
+            for ts, name, offset, path in heapq.merge(*streams):
+                if after is not None and (ts, name, offset) <= after:
+                    continue
+                page.append((ts, name, offset, path))
+                if len(page) > limit:
+                    break
+
+        records = [self._read(path, offset) for _, _, offset, path in page[:limit]]
+        next_cursor = None
+        if len(page) > limit:
+            ts, name, offset, _ = page[limit - 1]
+            next_cursor = f"{ts},{name},{offset}"
+        return {'records': [record for record in records if record], 'next_cursor': next_cursor}
+
+    @staticmethod
+    def _stream(segment, entries, first):
+        for index in range(first, len(entries)):
+            ts, offset = entries[index]
+            yield ts, segment.name, offset, segment.path
+
+    def _read(self, path, offset):
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                record = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        record['timestamp'] = datetime.fromtimestamp(record['ts']).isoformat()
+        return record
+
+    def get_stats(self):
+        return dict(self.stats, queued=self.queue.qsize())
+
+
+def main():
+    """Print activity for one agent (or all)"""
+    parser = argparse.ArgumentParser(description='Query the agent activity log')
+    parser.add_argument('agent_id', nargs='?')
+    parser.add_argument('--since', help='ISO timestamp or epoch seconds')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+
+    page = ActivityRecorder(args.directory).query(args.agent_id, args.since, args.limit)
+    for record in page['records']:
+        print(f"{record['timestamp']}  {record['agent_id']:<20} {record['activity']:<22} "
+              f"{record['outcome']:<8} {record['size']:>9}B  {record['latency_ms']}ms  {record['hash']}")
+    if page['next_cursor']:
+        print(f"... more (cursor {page['next_cursor']})")
+
+
+if __name__ == "__main__":
+    main()
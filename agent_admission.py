@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Agent Admission Control
+=======================
+Per-agent token-bucket quotas and deficit-round-robin (DRR) fair queuing in
+front of the document service, so one agent looping on
+``/api/agent/document/generate`` cannot starve everyone else on port 5001.
+
+- Each agent gets a token bucket (``rate`` requests/second, ``burst``
+  capacity). Limits come from, in order: a per-agent override, the first
+  matching capability tier, then the default. Requests beyond the bucket
+  are rejected with 429 and a Retry-After hint.
+- Buckets live in the shared registry database (SQLite, WAL) and refill
+  from wall-clock time, so the configured rate is the rate across every
+  API worker rather than per worker.
+- Admitted requests wait in per-agent FIFO queues for one of a fixed number
+  of document-service slots. Slots are handed out DRR-style: each agent's
+  turn adds a quantum to its deficit and large documents cost more, so
+  agents share the service by volume rather than by request count. The
+  queue is per process, so each of ``HIBLA_API_WORKERS`` workers gets its
+  share of ``DOC_SERVICE_SLOTS``.
+
+Limits can be overridden with a JSON file named by ``HIBLA_AGENT_LIMITS``:
+    {"default": {"rate": 2, "burst": 10},
+     "tiers": {"bulk": {"rate": 10, "burst": 50}},
+     "agents": {"pareng-boyong": {"rate": 20, "burst": 100}}}
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from agent_registry import DEFAULT_REGISTRY_PATH
+
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 10
+DOC_SERVICE_SLOTS = 4
+QUANTUM = 4
+COST_UNIT_BYTES = 64 * 1024
+MAX_QUEUED_PER_AGENT = 50
+QUEUE_TIMEOUT = 60.0
+API_WORKERS = max(1, int(os.environ.get('HIBLA_API_WORKERS', 1)))
+
+BUCKETS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_buckets (
+    agent_id TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class SharedTokenBuckets:
+    """Token buckets in SQLite so every API worker draws from the same tokens"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH, clock=time.time):
+        self.path = path
+        # Wall-clock time: monotonic clocks are not comparable across processes
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = None
+        self.pid = None
+
+    def _connection(self):
+        # A connection inherited across fork() must not be reused by the child
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute('PRAGMA busy_timeout=5000')
+            self.db.executescript(BUCKETS_SCHEMA)
+            self.pid = os.getpid()
+        return self.db
+
+    def try_take(self, agent_id, rate, burst, tokens=1.0):
+        """(admitted, seconds until enough tokens would be available) for one agent's bucket"""
+        rate, burst = float(rate), float(burst)
+        with self.lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                now = self.clock()
+                row = db.execute('SELECT tokens, updated FROM agent_buckets WHERE agent_id = ?',
+                                 (agent_id,)).fetchone()
+                available = burst if row is None else min(burst, row[0] + max(0.0, now - row[1]) * rate)
+                admitted = available >= tokens
+                if admitted:
+                    available -= tokens
+                db.execute('INSERT OR REPLACE INTO agent_buckets (agent_id, tokens, updated) VALUES (?, ?, ?)',
+                           (agent_id, available, now))
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+        if admitted:
+            return True, 0.0
+        return False, (tokens - available) / rate if rate else float('inf')
+
+
+class FairQueue:
+    """Deficit round robin over per-agent queues for a fixed number of slots"""
+
+    def __init__(self, slots=DOC_SERVICE_SLOTS, quantum=QUANTUM):
+        self.slots = slots
+        self.quantum = quantum
+        self.lock = threading.Lock()
+        self.queues = {}       # agent_id -> deque of waiters
+        self.deficits = {}
+        self.active = deque()  # agents with queued requests, current turn first
+        self.turn_open = False
+        self.in_use = 0
+
+    def queued(self, agent_id):
+        with self.lock:
+            return len(self.queues.get(agent_id, ()))
+
+    def acquire(self, agent_id, cost=1, timeout=QUEUE_TIMEOUT):
+        """Block until this request's turn; False on timeout"""
+        waiter = {'event': threading.Event(), 'cost': cost, 'granted': False}
+        with self.lock:
+            queue = self.queues.setdefault(agent_id, deque())
+            queue.append(waiter)
+            if len(queue) == 1:
+                self.active.append(agent_id)
+                self.deficits.setdefault(agent_id, 0)
+            self._dispatch()
+
+        if waiter['event'].wait(timeout):
+            return True
+        with self.lock:
+            if waiter['granted']:
+                return True
+            self._cancel(agent_id, waiter)
+            return False
+
+    def release(self):
+        with self.lock:
+            self.in_use -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, agent_id, cost=1, timeout=QUEUE_TIMEOUT):
+        """Hold a slot for the body of the with-block; yields False if none was granted in time"""
+        granted = self.acquire(agent_id, cost, timeout)
+        try:
+            yield granted
+        finally:
+            if granted:
+                self.release()
+
+    def _dispatch(self):
+        while self.in_use < self.slots and self.active:
+            agent_id = self.active[0]
+            queue = self.queues[agent_id]
+            if not self.turn_open:
+                self.deficits[agent_id] += self.quantum
+                self.turn_open = True
+            head = queue[0]
+            if head['cost'] <= self.deficits[agent_id]:
+                self.deficits[agent_id] -= head['cost']
+                queue.popleft()
+                head['granted'] = True
+                self.in_use += 1
+                head['event'].set()
+                if not queue:
+                    self._retire(agent_id)
+            else:
+                # Turn over: the unused deficit carries to the agent's next turn
+                self.active.rotate(-1)
+                self.turn_open = False
+
+    def _retire(self, agent_id):
+        """Drop an agent with an empty queue from the rotation"""
+        if self.active and self.active[0] == agent_id:
+            self.active.popleft()
+            self.turn_open = False
+        else:
+            self.active.remove(agent_id)
+        del self.queues[agent_id]
+        del self.deficits[agent_id]
+
+    def _cancel(self, agent_id, waiter):
+        queue = self.queues.get(agent_id)
+        if queue is None:
+            return
+        queue.remove(waiter)
+        if not queue:
+            self._retire(agent_id)
+        self._dispatch()
+
+
+def load_limits(path=None):
+    """{'default': {...}, 'tiers': {...}, 'agents': {...}} from HIBLA_AGENT_LIMITS, if set"""
+    limits = {'default': {'rate': DEFAULT_RATE, 'burst': DEFAULT_BURST}, 'tiers': {}, 'agents': {}}
+    path = path or os.environ.get('HIBLA_AGENT_LIMITS')
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            limits.update(json.load(f))
+    return limits
+
+
+class AgentAdmission:
+    """Token-bucket admission plus fair document-service slots, with per-agent counters"""
+
+    def __init__(self, limits=None, slots=None, max_queued=MAX_QUEUED_PER_AGENT, buckets=None):
+        self.limits = limits or load_limits()
+        self.max_queued = max_queued
+        if slots is None:
+            slots = max(1, DOC_SERVICE_SLOTS // API_WORKERS)
+        self.queue = FairQueue(slots)
+        self.lock = threading.Lock()
+        self.buckets = buckets or SharedTokenBuckets()
+        self.bucket_limits = {}  # agent_id -> limit its bucket was created with
+        self.counters = {}
+
+    def _limit_for(self, agent_id, capabilities):
+        if agent_id in self.limits['agents']:
+            return self.limits['agents'][agent_id]
+        for capability in capabilities or ():
+            if capability in self.limits['tiers']:
+                return self.limits['tiers'][capability]
+        return self.limits['default']
+
+    def _counter(self, agent_id):
+        counter = self.counters.get(agent_id)
+        if counter is None:
+            counter = self.counters[agent_id] = {'admitted': 0, 'throttled': 0, 'queue_full': 0,
+                                                 'dispatched': 0, 'queue_timeouts': 0, 'max_wait_ms': 0.0}
+        return counter
+
+    def admit(self, agent_id, capabilities=None):
+        """(admitted, retry_after_seconds) - consumes a token when admitted"""
+        with self.lock:
+            limit = self.bucket_limits.get(agent_id)
+            if limit is None:
+                limit = self.bucket_limits[agent_id] = self._limit_for(agent_id, capabilities)
+            counter = self._counter(agent_id)
+            if self.queue.queued(agent_id) >= self.max_queued:
+                counter['queue_full'] += 1
+                return False, 1.0
+        admitted, retry_after = self.buckets.try_take(agent_id, limit['rate'], limit['burst'])
+        with self.lock:
+            counter['admitted' if admitted else 'throttled'] += 1
+        return admitted, retry_after
+
+    @contextmanager
+    def document_slot(self, agent_id, content_size=0):
+        """Wait for this agent's fair turn at the document service; yields False on timeout"""
+        cost = 1 + content_size // COST_UNIT_BYTES
+        started = time.perf_counter()
+        with self.queue.slot(agent_id, cost) as granted:
+            waited_ms = (time.perf_counter() - started) * 1000
+            with self.lock:
+                counter = self._counter(agent_id)
+                if granted:
+                    counter['dispatched'] += 1
+                    counter['max_wait_ms'] = round(max(counter['max_wait_ms'], waited_ms), 1)
+                else:
+                    counter['queue_timeouts'] += 1
+            yield granted
+
+    def get_stats(self, agent_id=None):
+        """Per-agent admitted / throttled / queued counts seen by this worker (one agent or all)"""
+        with self.lock:
+            agent_ids = [agent_id] if agent_id else list(self.counters)
+            stats = {}
+            for name in agent_ids:
+                if name not in self.counters:
+                    continue
+                limit = self.bucket_limits.get(name)
+                stats[name] = dict(self.counters[name], queued=self.queue.queued(name),
+                                   rate=limit['rate'] if limit else None, burst=limit['burst'] if limit else None)
+            return stats
+
+    def get_summary(self):
+        with self.lock:
+            totals = {'admitted': 0, 'throttled': 0, 'queue_full': 0, 'dispatched': 0, 'queue_timeouts': 0}
+            for counter in self.counters.values():
+                for key in totals:
+                    totals[key] += counter[key]
+        totals['slots_in_use'] = self.queue.in_use
+        totals['slots'] = self.queue.slots
+        return totals
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Agent Liveness Tracking
+=======================
+Marks subordinate agents that stop pinging as ``suspect`` and then evicts
+them from the shared registry.
+
+Deadlines use ``time.monotonic`` and live in a hashed timing wheel: a ping
+moves the agent's entry between two wheel buckets and each tick only
+looks at the bucket that just came due, so expiry costs O(1) per agent
+instead of a scan over every registration.
+
+- active -> suspect after ``suspect_after`` seconds without a ping; suspect
+  agents are removed from capability routing.
+- suspect -> evicted after a further ``evict_after - suspect_after``
+  seconds; the registration is removed.
+- a ping from a suspect agent makes it active again.
+
+Every transition is published to subscribers and kept in a short event
+log (``/api/agent/events``). The tick also purges old registry tombstones
+once every ``purge_every`` seconds.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+SUSPECT_AFTER = 90.0
+EVICT_AFTER = 300.0
+TICK_SECONDS = 1.0
+WHEEL_SLOTS = 512
+EVENT_LOG_SIZE = 500
+PURGE_EVERY = 3600.0
+
+
+class TimingWheel:
+    """Hashed timing wheel of key -> monotonic deadline"""
+
+    def __init__(self, tick=TICK_SECONDS, slots=WHEEL_SLOTS, clock=time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+        self.buckets = [set() for _ in range(slots)]
+        self.deadlines = {}
+        self.current_tick = int(clock() // tick)
+
+    def _bucket(self, deadline):
+        # File under the first tick at or after the deadline, so the key is due when its bucket
+        # comes round; never into a tick that has already been processed
+        return self.buckets[max(math.ceil(deadline / self.tick), self.current_tick + 1) % self.slots]
+
+    def schedule(self, key, deadline):
+        """Set or move a key's deadline"""
+        previous = self.deadlines.get(key)
+        if previous is not None:
+            self._bucket(previous).discard(key)
+        self.deadlines[key] = deadline
+        self._bucket(deadline).add(key)
+
+    def cancel(self, key):
+        previous = self.deadlines.pop(key, None)
+        if previous is not None:
+            self._bucket(previous).discard(key)
+
+    def advance(self, now=None):
+        """Keys whose deadline passed since the last call"""
+        now = self.clock() if now is None else now
+        target = int(now // self.tick)
+        expired = []
+        # After a long stall, one lap over the wheel covers every bucket
+        first = max(self.current_tick + 1, target - self.slots + 1)
+        for tick in range(first, target + 1):
+            bucket = self.buckets[tick % self.slots]
+            if not bucket:
+                continue
+            due = [key for key in bucket if self.deadlines[key] <= now]
+            for key in due:
+                bucket.discard(key)
+                del self.deadlines[key]
+            expired.extend(due)
+        self.current_tick = max(self.current_tick, target)
+        return expired
+
+    def __len__(self):
+        return len(self.deadlines)
+
+
+class LivenessTracker:
+    """Follows registry pings and evicts agents that go quiet"""
+
+    def __init__(self, registry, suspect_after=SUSPECT_AFTER, evict_after=EVICT_AFTER,
+                 tick=TICK_SECONDS, clock=time.monotonic, purge_every=PURGE_EVERY):
+        self.registry = registry
+        self.suspect_after = suspect_after
+        self.evict_after = evict_after
+        self.tick = tick
+        self.clock = clock
+        self.purge_every = purge_every
+        self.next_purge = clock() + purge_every
+        self.lock = threading.Lock()
+        self.wheel = TimingWheel(tick, max(WHEEL_SLOTS, int(evict_after // tick) + 2), clock)
+        self.seen = {}       # agent_id -> (last_ping, status) last observed in the registry
+        self.events = deque(maxlen=EVENT_LOG_SIZE)
+        self.subscribers = []
+        self.thread = None
+        self.stop_event = threading.Event()
+        registry.subscribe(self._observe)
+
+    def _observe(self, agent_id, agent):
+        """Registry listener: a new last_ping restarts the agent's deadline"""
+        with self.lock:
+            if agent is None:
+                self.seen.pop(agent_id, None)
+                self.wheel.cancel(agent_id)
+                return
+            previous = self.seen.get(agent_id)
+            self.seen[agent_id] = (agent['last_ping'], agent['status'])
+            if previous is not None and previous[0] == agent['last_ping']:
+                # No new ping; a worker (maybe this one) just marked it suspect
+                if previous[1] != 'suspect' and agent['status'] == 'suspect':
+                    self.wheel.schedule(agent_id, self.clock() + self.evict_after - self.suspect_after)
+                return
+            try:
+                age = max(0.0, (datetime.now() - datetime.fromisoformat(agent['last_ping'])).total_seconds())
+            except ValueError:
+                age = 0.0
+            # Wall-clock age only seeds the deadline; from here on it is monotonic
+            limit = self.suspect_after if agent['status'] == 'active' else self.evict_after
+            self.wheel.schedule(agent_id, self.clock() + max(0.0, limit - age))
+        if previous is not None and previous[1] == 'suspect' and agent['status'] == 'active':
+            self._publish('recovered', agent_id)
+
+    def subscribe(self, callback):
+        """Call ``callback(event)`` for every suspect / evicted / recovered transition"""
+        self.subscribers.append(callback)
+
+    def _publish(self, kind, agent_id):
+        event = {'event': kind, 'agent_id': agent_id, 'timestamp': datetime.now().isoformat()}
+        self.events.append(event)
+        for callback in list(self.subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ Liveness subscriber failed: {e}")
+
+    def check(self):
+        """One tick: pick up pings from other workers, then expire due agents"""
+        self.registry.sync()
+        with self.lock:
+            expired = [(agent_id, self.seen.get(agent_id)) for agent_id in self.wheel.advance()]
+
+        for agent_id, seen in expired:
+            if seen is None:
+                continue
+            last_ping, status = seen
+            if status == 'active':
+                # Guarded on last_ping so a ping landing on another worker wins
+                if self.registry.set_status(agent_id, 'suspect', last_ping=last_ping):
+                    self._publish('suspect', agent_id)
+            elif self.registry.unregister(agent_id, last_ping=last_ping):
+                self._publish('evicted', agent_id)
+
+        if self.clock() >= self.next_purge:
+            self.next_purge = self.clock() + self.purge_every
+            purged = self.registry.purge_tombstones()
+            if purged:
+                print(f"🧹 Purged {purged} agent tombstones")
+        return expired
+
+    def start(self):
+        """Seed deadlines from the registry and tick in the background (once per process)"""
+        if self.thread is not None and self.thread.is_alive():
+            return self
+        for agent_id, agent in self.registry.all().items():
+            if agent_id not in self.seen:
+                self._observe(agent_id, agent)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='agent-liveness', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.tick):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ Liveness tick failed: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+
+    def recent_events(self, since=None):
+        events = list(self.events)
+        if since:
+            events = [event for event in events if event['timestamp'] > since]
+        return events
+
+    def get_stats(self):
+        with self.lock:
+            statuses = [status for _, status in self.seen.values()]
+            return {
+                'tracked': len(self.wheel),
+                'active': statuses.count('active'),
+                'suspect': statuses.count('suspect'),
+                'suspect_after_seconds': self.suspect_after,
+                'evict_after_seconds': self.evict_after
+            }
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Agent Push Channel
+==================
+Server-sent events (SSE) from the agent API to each connected subordinate
+agent, so agents hold one long-lived connection instead of polling
+``/api/agent/ping`` and ``/api/agent/status``.
+
+An agent connects with
+    GET http://<host>:5007/api/agent/push/<agent_id>
+and receives, multiplexed on that one stream:
+    event: connected        once, with the current system status
+    event: heartbeat        every ``heartbeat`` seconds; an open stream
+                            counts as a ping, so no separate pings are needed
+    event: system_status    when the service health summary changes
+    event: liveness         suspect / recovered / evicted for this agent
+    event: document_result  results of this agent's async document jobs
+
+The server is plain asyncio on its own thread and port. A connection is a
+transport plus one coroutine waiting for EOF (no per-connection queue or
+timer), so thousands of idle agents cost little memory. Events are written
+straight into the transport buffer; a connection whose unsent backlog
+passes ``max_buffer`` is a stalled consumer and is dropped - the agent
+reconnects and can poll ``/api/agent/document/jobs/<job_id>`` for anything
+it missed.
+
+Only the worker process that binds the port serves the channel. Other
+API workers cannot write to its streams, so their ``publish`` and
+``disconnect`` calls go into an ``agent_push_outbox`` table in the shared
+registry database; the serving worker drains it every ``OUTBOX_POLL``
+seconds. Outbox rows nobody drains expire after ``OUTBOX_TTL`` seconds. If
+the port is taken by something else, every worker logs the bind error and
+``get_stats`` reports ``serving: false`` with that error.
+
+Usage:
+    python agent_push_channel.py <agent_id> [--url http://localhost:5007]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote, unquote, urlsplit
+
+import http_client
+from agent_registry import DEFAULT_REGISTRY_PATH
+
+# 5006 is the automation telemetry status port
+PUSH_PORT = int(os.environ.get('HIBLA_AGENT_PUSH_PORT', 5007))
+PUSH_PATH = '/api/agent/push/'
+HEARTBEAT_SECONDS = 25.0
+MAX_BUFFER_BYTES = 256 * 1024
+MAX_REQUEST_BYTES = 8192
+REQUEST_TIMEOUT = 10.0
+RETRY_MS = 5000
+OUTBOX_POLL = 0.25
+OUTBOX_TTL = 60.0
+DISCONNECT_EVENT = '__disconnect__'
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_push_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id TEXT,
+    event TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+STREAM_HEADERS = (b'HTTP/1.1 200 OK\r\n'
+                  b'Content-Type: text/event-stream\r\n'
+                  b'Cache-Control: no-cache\r\n'
+                  b'Connection: keep-alive\r\n'
+                  b'X-Accel-Buffering: no\r\n\r\n')
+
+
+def format_event(event, data, event_id=None):
+    """One SSE frame"""
+    frame = f'id: {event_id}\n' if event_id is not None else ''
+    frame += f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"), default=str)}\n\n'
+    return frame.encode('utf-8')
+
+
+class PushOutbox:
+    """Events for the serving worker from workers that do not hold the push port"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH, ttl=OUTBOX_TTL, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = None
+        self.pid = None
+
+    def _connection(self):
+        # A connection inherited across fork() must not be reused by the child
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute('PRAGMA busy_timeout=5000')
+            self.db.executescript(OUTBOX_SCHEMA)
+            self.pid = os.getpid()
+        return self.db
+
+    def put(self, agent_id, event, data):
+        with self.lock:
+            self._connection().execute(
+                'INSERT INTO agent_push_outbox (agent_id, event, data, created) VALUES (?, ?, ?, ?)',
+                (agent_id, event, json.dumps(data, separators=(',', ':'), default=str), self.clock()))
+
+    def take(self, limit=1000):
+        """[(agent_id, event, data)] oldest first, removed from the outbox; expired rows are dropped"""
+        with self.lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.execute('DELETE FROM agent_push_outbox WHERE created < ?', (self.clock() - self.ttl,))
+                rows = db.execute('SELECT id, agent_id, event, data FROM agent_push_outbox ORDER BY id LIMIT ?',
+                                  (limit,)).fetchall()
+                if rows:
+                    db.execute('DELETE FROM agent_push_outbox WHERE id <= ?', (rows[-1][0],))
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+        return [(agent_id, event, json.loads(data)) for _, agent_id, event, data in rows]
+
+
+class AgentPushChannel:
+    """Per-agent SSE streams served from an asyncio loop on a background thread
+
+    ``authorize(agent_id)``, ``hello(agent_id)`` and
+    ``on_heartbeat(agent_ids)`` may block; they run on a small thread pool,
+    never on the event loop.
+    """
+
+    def __init__(self, host='0.0.0.0', port=PUSH_PORT, heartbeat=HEARTBEAT_SECONDS, max_buffer=MAX_BUFFER_BYTES,
+                 authorize=None, hello=None, on_heartbeat=None, outbox=None):
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self.max_buffer = max_buffer
+        self.authorize = authorize
+        self.hello = hello
+        self.on_heartbeat = on_heartbeat
+        self.outbox = outbox or PushOutbox()
+        self.lock = threading.Lock()
+        self.connections = {}  # agent_id -> set of StreamWriter; touched only on the loop thread
+        # Counts mirrored from the loop thread under self.lock, for readers on other threads
+        self.connected = {}  # agent_id -> open streams
+        self.connection_total = 0
+        self.event_id = 0
+        self.stats = {'accepted': 0, 'rejected': 0, 'closed': 0, 'peak_connections': 0,
+                      'events_sent': 0, 'slow_consumers_dropped': 0, 'outbox_sent': 0, 'outbox_received': 0}
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.pid = None
+        self.executor = None
+        self.error = None
+
+    def start(self):
+        """Bind and serve on a daemon thread (once per process); see ``error`` if the bind failed"""
+        with self.lock:
+            if self.thread is not None and self.pid == os.getpid():
+                return self
+            self.pid = os.getpid()
+            self.connections = {}
+            self.connected = {}
+            self.connection_total = 0
+            self.loop = asyncio.new_event_loop()
+            self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='agent-push')
+            started = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(started,), name='agent-push', daemon=True)
+            self.thread.start()
+        started.wait()
+        return self
+
+    def _run(self, started):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(
+                self._handle, self.host, self.port, limit=MAX_REQUEST_BYTES, reuse_address=True))
+        except OSError as e:
+            # Usually another worker already serves the channel; publishes go through the outbox
+            self.error = str(e)
+            self.server = None
+            print(f"⚠️ Push channel not served by pid {os.getpid()} (port {self.port}: {e}); "
+                  f"events go through the shared outbox")
+            started.set()
+            return
+        if not self.port:
+            self.port = self.server.sockets[0].getsockname()[1]
+        self.loop.create_task(self._heartbeat())
+        self.loop.create_task(self._drain_outbox())
+        started.set()
+        self.loop.run_forever()
+
+    @property
+    def serving(self):
+        return self.server is not None
+
+    def publish(self, agent_id, event, data):
+        """Send an event to one agent's streams (or every stream when agent_id is None); thread-safe
+
+        Returns False only when the event could not even be queued for the serving worker.
+        """
+        if self.serving:
+            self.loop.call_soon_threadsafe(self._publish, agent_id, event, data)
+            return True
+        return self._to_outbox(agent_id, event, data)
+
+    def disconnect(self, agent_id):
+        """Close an agent's streams, e.g. after it was unregistered; thread-safe"""
+        if self.serving:
+            self.loop.call_soon_threadsafe(self._disconnect, agent_id)
+        else:
+            self._to_outbox(agent_id, DISCONNECT_EVENT, None)
+
+    def _to_outbox(self, agent_id, event, data):
+        try:
+            self.outbox.put(agent_id, event, data)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not queue push event {event} for {agent_id}: {e}")
+            return False
+        self.stats['outbox_sent'] += 1
+        return True
+
+    def is_connected(self, agent_id):
+        """Whether the agent has a stream on this worker (always False on workers not serving)"""
+        with self.lock:
+            return self.connected.get(agent_id, 0) > 0
+
+    def _publish(self, agent_id, event, data):
+        if agent_id is None:
+            writers = [writer for streams in self.connections.values() for writer in streams]
+        else:
+            writers = list(self.connections.get(agent_id, ()))
+        if not writers:
+            return
+        self.event_id += 1
+        frame = format_event(event, data, self.event_id)
+        for writer in writers:
+            self._write(writer, frame)
+
+    def _write(self, writer, frame):
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.stats['slow_consumers_dropped'] += 1
+            writer.transport.abort()  # the handler sees EOF and cleans up
+            return
+        writer.write(frame)
+        self.stats['events_sent'] += 1
+
+    def _disconnect(self, agent_id):
+        for writer in list(self.connections.get(agent_id, ())):
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        parts = head.split(b'\r\n', 1)[0].decode('latin-1').split()
+        path = urlsplit(parts[1]).path if len(parts) == 3 and parts[0] == 'GET' else ''
+        agent_id = unquote(path[len(PUSH_PATH):]) if path.startswith(PUSH_PATH) else ''
+        if not agent_id:
+            await self._reject(writer, '404 Not Found', f'Use GET {PUSH_PATH}<agent_id>')
+            return
+        if self.authorize is not None and not await self.loop.run_in_executor(self.executor, self.authorize, agent_id):
+            self.stats['rejected'] += 1
+            await self._reject(writer, '403 Forbidden', 'Agent not registered')
+            return
+
+        hello = {'agent_id': agent_id, 'heartbeat_seconds': self.heartbeat, 'timestamp': datetime.now().isoformat()}
+        if self.hello is not None:
+            hello.update(await self.loop.run_in_executor(self.executor, self.hello, agent_id))
+        writer.write(STREAM_HEADERS + f'retry: {RETRY_MS}\n\n'.encode('ascii'))
+        self.event_id += 1
+        self._write(writer, format_event('connected', hello, self.event_id))
+
+        self.connections.setdefault(agent_id, set()).add(writer)
+        with self.lock:
+            self.connected[agent_id] = self.connected.get(agent_id, 0) + 1
+            self.connection_total += 1
+            self.stats['accepted'] += 1
+            self.stats['peak_connections'] = max(self.stats['peak_connections'], self.connection_total)
+        try:
+            # Agents never send on the stream; EOF (or a reset) means they are gone
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            streams = self.connections.get(agent_id)
+            if streams is not None:
+                streams.discard(writer)
+                if not streams:
+                    del self.connections[agent_id]
+            with self.lock:
+                remaining = self.connected.get(agent_id, 0) - 1
+                if remaining > 0:
+                    self.connected[agent_id] = remaining
+                else:
+                    self.connected.pop(agent_id, None)
+                self.connection_total -= 1
+                self.stats['closed'] += 1
+            writer.close()
+
+    async def _reject(self, writer, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self._publish(None, 'heartbeat', {'timestamp': datetime.now().isoformat()})
+            agent_ids = list(self.connections)
+            if self.on_heartbeat is not None and agent_ids:
+                try:
+                    await self.loop.run_in_executor(self.executor, self.on_heartbeat, agent_ids)
+                except Exception as e:
+                    print(f"⚠️ Push heartbeat hook failed: {e}")
+
+    async def _drain_outbox(self):
+        """Deliver events other workers queued for this (serving) worker"""
+        while True:
+            try:
+                events = await self.loop.run_in_executor(self.executor, self.outbox.take)
+            except sqlite3.Error as e:
+                print(f"⚠️ Push outbox read failed: {e}")
+                events = []
+            for agent_id, event, data in events:
+                self.stats['outbox_received'] += 1
+                if event == DISCONNECT_EVENT:
+                    self._disconnect(agent_id)
+                else:
+                    self._publish(agent_id, event, data)
+            if not events:
+                await asyncio.sleep(OUTBOX_POLL)
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, serving=self.serving, port=self.port, error=self.error,
+                        connections=self.connection_total, connected_agents=len(self.connected))
+
+
+def main():
+    """Follow one agent's push stream and print each event"""
+    parser = argparse.ArgumentParser(description='Print the push events for one agent')
+    parser.add_argument('agent_id')
+    parser.add_argument('--url', default=f'http://localhost:{PUSH_PORT}')
+    args = parser.parse_args()
+
+    response = http_client.get(f"{args.url}{PUSH_PATH}{quote(args.agent_id, safe='')}", stream=True,
+                               headers={'Accept': 'text/event-stream'}, timeout=(3.05, None), retries=0)
+    if response.status_code != 200:
+        print(f"❌ {response.status_code}: {response.text}")
+        return
+    print(f"📡 Connected as {args.agent_id}")
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith('event: '):
+            event = line[len('event: '):]
+        elif line.startswith('data: '):
+            print(f"   {datetime.now().strftime('%H:%M:%S')} {event}: {line[len('data: '):]}")
+
+
+if __name__ == "__main__":
+    main()
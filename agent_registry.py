@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Shared Agent Registry
+=====================
+Subordinate agent registrations stored in SQLite (WAL mode) so every
+worker process of the port-5002 agent API sees the same agents, and
+registrations survive restarts.
+
+Each worker keeps a read cache of the whole registry. Every write stamps
+the row with the next change sequence number; a read first checks
+``PRAGMA data_version`` (which only moves when another connection has
+committed) and, when it moved, pulls just the rows with a newer sequence.
+Reads on an unchanged registry never touch the table.
+
+The cache also maintains a capability index (capability_index.py) so
+``route`` can pick a live agent for a set of required capabilities without
+scanning the registry. Only ``active`` agents are indexed; agents the
+liveness tracker marks ``suspect`` drop out of routing until they ping.
+
+Listings are paged in agent_id order from a sorted id list kept beside
+the cache. The latest applied sequence number doubles as the registry
+version: it only moves when something changed, so pollers can use it as
+an ETag, and ``changes_since`` returns just the rows (and tombstones)
+written after a version they already hold. Pings move that version too;
+``version(include_pings=False)`` follows ``changed_seq`` instead, which
+only moves on registration, status and removal changes, for listings
+that do not show ``last_ping`` or ``load``.
+
+Tombstones older than ``TOMBSTONE_TTL`` are purged (``purge_tombstones``,
+run from the liveness tick). The highest purged sequence number is kept in
+``registry_meta`` so sequence numbers never go backwards; a cache behind it
+is rebuilt, and ``changes_since`` raises ``StaleVersionError`` for a
+version older than it so the poller re-lists instead of missing removals.
+
+Set ``HIBLA_AGENT_REGISTRY=:memory:`` for a process-local stand-in.
+
+Usage:
+    python agent_registry.py            # list registered agents
+"""
+
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from capability_index import CapabilityIndex
+
+DEFAULT_REGISTRY_PATH = os.environ.get('HIBLA_AGENT_REGISTRY', 'agent_registry.db')
+TOMBSTONE_TTL = 24 * 3600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id TEXT PRIMARY KEY,
+    callback_url TEXT,
+    capabilities TEXT NOT NULL,
+    registered_at TEXT NOT NULL,
+    last_ping TEXT NOT NULL,
+    status TEXT NOT NULL,
+    load INTEGER NOT NULL DEFAULT 0,
+    changed_seq INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL,
+    removed INTEGER NOT NULL DEFAULT 0,
+    removed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS agents_seq ON agents (seq);
+CREATE TABLE IF NOT EXISTS registry_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+AGENT_COLUMNS = ('agent_id, callback_url, capabilities, registered_at, last_ping, status, load, '
+                 'changed_seq, seq, removed')
+PING_FIELDS = ('last_ping', 'load')
+# A ping only counts as a listing change when it brings a suspect agent back to active
+PING_CHANGED_SEQ = "changed_seq = CASE WHEN status = 'active' THEN changed_seq ELSE ? END"
+AGENT_FIELDS = ('agent_id', 'callback_url', 'capabilities', 'registered_at', 'last_ping', 'status', 'load')
+
+
+class StaleVersionError(Exception):
+    """The requested version predates purged tombstones; re-list instead of asking for a delta"""
+
+    def __init__(self, version, purged_seq):
+        super().__init__(f"Version {version} is older than purged tombstones (up to {purged_seq})")
+        self.version = version
+        self.purged_seq = purged_seq
+
+
+def _row_to_agent(row):
+    agent_id, callback_url, capabilities, registered_at, last_ping, status, load = row
+    return {
+        'agent_id': agent_id,
+        'callback_url': callback_url,
+        'capabilities': json.loads(capabilities),
+        'registered_at': registered_at,
+        'last_ping': last_ping,
+        'status': status,
+        'load': load
+    }
+
+
+class AgentRegistry:
+    """SQLite-backed agent table with a per-process incremental read cache"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH):
+        self.path = path
+        self.lock = threading.RLock()
+        self.db = None
+        self.pid = None
+        self.cache = {}
+        self.sorted_ids = []
+        self.cache_seq = 0
+        self.content_seq = 0
+        self.data_version = None
+        self.index = CapabilityIndex()
+        self.listeners = []
+
+    def _connection(self):
+        # A connection inherited across fork() must not be reused by the child
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute('PRAGMA busy_timeout=5000')
+            self.db.executescript(SCHEMA)
+            columns = {row[1] for row in self.db.execute('PRAGMA table_info(agents)')}
+            if 'load' not in columns:  # registries created before load reporting
+                self.db.execute('ALTER TABLE agents ADD COLUMN load INTEGER NOT NULL DEFAULT 0')
+            if 'removed_at' not in columns:  # registries created before tombstone purging
+                self.db.execute('ALTER TABLE agents ADD COLUMN removed_at TEXT')
+            if 'changed_seq' not in columns:  # registries created before ping-free versions
+                self.db.execute('ALTER TABLE agents ADD COLUMN changed_seq INTEGER NOT NULL DEFAULT 0')
+                self.db.execute('UPDATE agents SET changed_seq = seq')
+            self.pid = os.getpid()
+            # An inherited cache is still valid up to cache_seq; only force a catch-up read
+            self.data_version = None
+        return self.db
+
+    def _refresh(self):
+        """Bring the read cache up to date with commits from other workers"""
+        db = self._connection()
+        data_version = db.execute('PRAGMA data_version').fetchone()[0]
+        if data_version == self.data_version:
+            return
+        purged_seq = self._purged_seq(db)
+        if self.cache_seq < purged_seq:
+            # Tombstones this cache never saw are gone; drop whatever is no longer live
+            live = {row[0] for row in db.execute('SELECT agent_id FROM agents WHERE removed = 0')}
+            for agent_id in [agent_id for agent_id in self.cache if agent_id not in live]:
+                self._drop(agent_id)
+                for listener in self.listeners:
+                    listener(agent_id, None)
+        rows = db.execute(f'SELECT {AGENT_COLUMNS} FROM agents WHERE seq > ? ORDER BY seq',
+                          (self.cache_seq,)).fetchall()
+        for row in rows:
+            self._apply(row)
+        self.cache_seq = max(self.cache_seq, purged_seq)
+        self.content_seq = max(self.content_seq, purged_seq)
+        self.data_version = data_version
+
+    @staticmethod
+    def _purged_seq(db):
+        row = db.execute("SELECT value FROM registry_meta WHERE name = 'purged_seq'").fetchone()
+        return row[0] if row else 0
+
+    def _drop(self, agent_id):
+        if self.cache.pop(agent_id, None) is not None:
+            del self.sorted_ids[bisect.bisect_left(self.sorted_ids, agent_id)]
+        self.index.remove(agent_id)
+
+    def _apply(self, row):
+        agent_id, changed_seq, seq, removed = row[0], row[-3], row[-2], row[-1]
+        if removed:
+            self._drop(agent_id)
+        else:
+            if agent_id not in self.cache:
+                bisect.insort(self.sorted_ids, agent_id)
+            agent = self.cache[agent_id] = _row_to_agent(row[:-3])
+            if agent['status'] == 'active':
+                self.index.add(agent_id, agent['capabilities'], agent['load'])
+            else:
+                self.index.remove(agent_id)
+        self.cache_seq = max(self.cache_seq, seq)
+        self.content_seq = max(self.content_seq, changed_seq)
+        for listener in self.listeners:
+            listener(agent_id, None if removed else self.cache[agent_id])
+
+    def _write(self, update):
+        """Run ``update(db, seq)`` in one immediate transaction; ``seq`` is the first free sequence number
+
+        Each row the update changes must be stamped with its own number
+        (seq, seq + 1, ...) so ``changes_since`` can page through them.
+        """
+        with self.lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                # Catch up while holding the write lock so no other worker's change is skipped
+                self._refresh()
+                # Purged tombstones may have held the highest numbers; never hand them out again
+                seq = db.execute('SELECT MAX(COALESCE(MAX(seq), 0), ?) + 1 FROM agents',
+                                 (self._purged_seq(db),)).fetchone()[0]
+                changed = update(db, seq)
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+            if changed:
+                for row in db.execute(f'SELECT {AGENT_COLUMNS} FROM agents WHERE seq >= ? ORDER BY seq', (seq,)):
+                    self._apply(row)
+            return changed
+
+    def register(self, agent_id, callback_url, capabilities):
+        """Insert or replace an agent registration"""
+        now = datetime.now().isoformat()
+
+        def update(db, seq):
+            db.execute(
+                'INSERT OR REPLACE INTO agents (agent_id, callback_url, capabilities, registered_at, '
+                'last_ping, status, changed_seq, seq, removed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)',
+                (agent_id, callback_url, json.dumps(capabilities or []), now, now, 'active', seq, seq))
+            return True
+
+        self._write(update)
+        return self.get(agent_id)
+
+    def ping(self, agent_id, load=None):
+        """Record a ping and optionally the agent's reported load; False when not registered"""
+        def update(db, seq):
+            return db.execute(f'UPDATE agents SET last_ping = ?, load = COALESCE(?, load), status = ?, seq = ?, '
+                              f'{PING_CHANGED_SEQ} WHERE agent_id = ? AND removed = 0',
+                              (datetime.now().isoformat(), load, 'active', seq, seq, agent_id)).rowcount > 0
+
+        return self._write(update)
+
+    def set_status(self, agent_id, status, last_ping=None):
+        """Change an agent's status, optionally only if it has not pinged since ``last_ping``"""
+        def update(db, seq):
+            return db.execute('UPDATE agents SET status = ?, changed_seq = ?, seq = ? WHERE agent_id = ? '
+                              'AND removed = 0 AND (? IS NULL OR last_ping = ?)',
+                              (status, seq, seq, agent_id, last_ping, last_ping)).rowcount > 0
+
+        return self._write(update)
+
+    def unregister(self, agent_id, last_ping=None):
+        """Remove an agent; the row stays as a tombstone so other workers' caches drop it too"""
+        def update(db, seq):
+            return db.execute('UPDATE agents SET removed = 1, removed_at = ?, status = ?, changed_seq = ?, seq = ? '
+                              'WHERE agent_id = ? AND removed = 0 AND (? IS NULL OR last_ping = ?)',
+                              (datetime.now().isoformat(), 'removed', seq, seq, agent_id,
+                               last_ping, last_ping)).rowcount > 0
+
+        return self._write(update)
+
+    def register_many(self, agents):
+        """Insert or replace many registrations ({agent_id, callback_url, capabilities} dicts) in one transaction"""
+        now = datetime.now().isoformat()
+
+        def update(db, seq):
+            db.executemany(
+                'INSERT OR REPLACE INTO agents (agent_id, callback_url, capabilities, registered_at, '
+                'last_ping, status, changed_seq, seq, removed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)',
+                [(agent['agent_id'], agent.get('callback_url'), json.dumps(agent.get('capabilities') or []),
+                  now, now, 'active', seq + i, seq + i) for i, agent in enumerate(agents)])
+            return bool(agents)
+
+        self._write(update)
+        with self.lock:
+            return [dict(self.cache[agent['agent_id']]) for agent in agents]
+
+    def ping_many(self, pings):
+        """Record many (agent_id, load_or_None) pings in one transaction; one bool per ping"""
+        now = datetime.now().isoformat()
+        results = []
+
+        def update(db, seq):
+            del results[:]
+            for agent_id, load in pings:
+                results.append(db.execute(f'UPDATE agents SET last_ping = ?, load = COALESCE(?, load), status = ?, '
+                                          f'seq = ?, {PING_CHANGED_SEQ} WHERE agent_id = ? AND removed = 0',
+                                          (now, load, 'active', seq, seq, agent_id)).rowcount > 0)
+                seq += results[-1]
+            return any(results)
+
+        self._write(update)
+        return results
+
+    def unregister_many(self, agent_ids):
+        """Remove many agents in one transaction; one bool per agent_id"""
+        now = datetime.now().isoformat()
+        results = []
+
+        def update(db, seq):
+            del results[:]
+            for agent_id in agent_ids:
+                results.append(db.execute('UPDATE agents SET removed = 1, removed_at = ?, status = ?, '
+                                          'changed_seq = ?, seq = ? WHERE agent_id = ? AND removed = 0',
+                                          (now, 'removed', seq, seq, agent_id)).rowcount > 0)
+                seq += results[-1]
+            return any(results)
+
+        self._write(update)
+        return results
+
+    def purge_tombstones(self, older_than=TOMBSTONE_TTL):
+        """Delete tombstones removed more than ``older_than`` seconds ago; returns how many"""
+        cutoff = (datetime.now() - timedelta(seconds=older_than)).isoformat()
+        purged = []
+
+        def update(db, seq):
+            # Tombstones from before removed_at existed count as old
+            condition = 'removed = 1 AND (removed_at IS NULL OR removed_at < ?)'
+            highest = db.execute(f'SELECT MAX(seq) FROM agents WHERE {condition}', (cutoff,)).fetchone()[0]
+            if highest is None:
+                return False
+            purged.append(db.execute(f'DELETE FROM agents WHERE {condition}', (cutoff,)).rowcount)
+            db.execute("INSERT INTO registry_meta (name, value) VALUES ('purged_seq', ?) "
+                       "ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)", (highest,))
+            return False  # nothing for the cache to apply
+
+        self._write(update)
+        return purged[0] if purged else 0
+
+    def subscribe(self, listener):
+        """Call ``listener(agent_id, agent_or_None)`` for every change the cache applies"""
+        with self.lock:
+            self.listeners.append(listener)
+
+    def sync(self):
+        """Pick up commits from other workers now"""
+        with self.lock:
+            self._refresh()
+
+    def get(self, agent_id):
+        with self.lock:
+            self._refresh()
+            agent = self.cache.get(agent_id)
+            return dict(agent) if agent else None
+
+    def is_registered(self, agent_id):
+        with self.lock:
+            self._refresh()
+            return agent_id in self.cache
+
+    def all(self):
+        """Snapshot of every registered agent keyed by agent_id"""
+        with self.lock:
+            self._refresh()
+            return {agent_id: dict(agent) for agent_id, agent in self.cache.items()}
+
+    def count(self):
+        with self.lock:
+            self._refresh()
+            return len(self.cache)
+
+    def version(self, include_pings=True):
+        """Sequence number of the latest change; without pings, of the latest change outside PING_FIELDS"""
+        with self.lock:
+            self._refresh()
+            return self.cache_seq if include_pings else self.content_seq
+
+    def list_page(self, status=None, capability=None, after=None, limit=100):
+        """(agents, next_cursor, version): one page in agent_id order, starting after ``after``"""
+        with self.lock:
+            self._refresh()
+            ids = self.sorted_ids
+            agents = []
+            position = bisect.bisect_right(ids, after) if after else 0
+            while position < len(ids) and len(agents) <= limit:
+                agent = self.cache[ids[position]]
+                position += 1
+                if status and agent['status'] != status:
+                    continue
+                if capability and capability not in agent['capabilities']:
+                    continue
+                agents.append(dict(agent))
+            next_cursor = agents[limit - 1]['agent_id'] if len(agents) > limit else None
+            return agents[:limit], next_cursor, self.cache_seq
+
+    def changes_since(self, version, limit=1000):
+        """(changed agents, removed agent_ids, version, more) for writes after ``version``
+
+        Raises StaleVersionError when tombstones after ``version`` may already be purged.
+        """
+        with self.lock:
+            self._refresh()
+            purged_seq = self._purged_seq(self._connection())
+            if 0 < version < purged_seq:
+                raise StaleVersionError(version, purged_seq)
+            rows = self._connection().execute(
+                f'SELECT {AGENT_COLUMNS} FROM agents WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?',
+                (version, self.cache_seq, limit + 1)).fetchall()
+            more = len(rows) > limit
+            rows = rows[:limit]
+            changed = [_row_to_agent(row[:-3]) for row in rows if not row[-1]]
+            removed = [row[0] for row in rows if row[-1]]
+            return changed, removed, (rows[-1][-2] if more else self.cache_seq), more
+
+    def route(self, required):
+        """(agent, candidate count) for the least-loaded agent with every required capability"""
+        with self.lock:
+            self._refresh()
+            agent_id, candidates = self.index.route(required)
+            return (dict(self.cache[agent_id]) if agent_id else None), candidates
+
+    def index_stats(self):
+        with self.lock:
+            self._refresh()
+            return self.index.stats()
+
+
+def main():
+    """List registered agents"""
+    registry = AgentRegistry()
+    agents = registry.all()
+    print(f"🤖 REGISTERED AGENTS ({len(agents)}) - {registry.path}")
+    for agent in agents.values():
+        print(f"   {agent['agent_id']:<24} {agent['status']:<8} last ping {agent['last_ping']}  "
+              f"{', '.join(agent['capabilities'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,14 @@ Agent Zero Interface - Production Ready
 Final production interface for Agent Zero MCP communication
 """
 
-import requests
 import json
 import time
 from datetime import datetime
 
+from analytics_cache import get_dashboard_overview
+from health_prober import get_prober
+import http_client
+
 class AgentZeroInterface:
     """Production interface for Agent Zero communication"""
     
@@ -113,22 +116,12 @@ class AgentZeroInterface:
         return capabilities
     
     def check_service(self, url):
-        """Check if service is operational"""
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            return 'online' if response.status_code == 200 else 'offline'
-        except:
-            return 'offline'
+        """Check if service is operational (cached background probe)"""
+        return 'online' if get_prober().is_healthy(url) else 'offline'
     
     def get_dashboard_data(self):
-        """Get current dashboard metrics"""
-        try:
-            response = requests.get(f"{self.hibla_main}/api/dashboard/analytics", timeout=10)
-            if response.status_code == 200:
-                return response.json().get('overview', {})
-        except:
-            pass
-        return {}
+        """Get current dashboard metrics (shared TTL cache)"""
+        return get_dashboard_overview(self.hibla_main)
     
     def test_document_generation(self, content, filename="agent_zero_test"):
         """Test document generation for Agent Zero"""
@@ -139,7 +132,7 @@ class AgentZeroInterface:
         }
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.hibla_docs}/api/documents/generate",
                 json=payload,
                 timeout=30
@@ -175,7 +168,7 @@ class AgentZeroInterface:
         print(f"   🎯 Target: {self.mcp_endpoint}")
         
         try:
-            response = requests.get(self.mcp_endpoint, timeout=10)
+            response = http_client.get(self.mcp_endpoint, timeout=10)
             mcp_status = "CONNECTED" if response.status_code == 200 else f"ERROR {response.status_code}"
             print(f"   🔗 Status: {mcp_status}")
             print(f"   📄 Content-Type: {response.headers.get('content-type', 'N/A')}")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Shared Dashboard Analytics Cache
+================================
+One cached client for the main application's ``/api/dashboard/analytics``
+endpoint, shared by the MCP integration, the Agent Zero interface and the
+status scripts.
+
+- Fresh values (younger than ``ttl``) are returned without a request.
+- Stale values (up to ``stale_ttl``) are returned immediately while a single
+  background thread refreshes them (stale-while-revalidate).
+- When nothing usable is cached, concurrent callers are coalesced onto one
+  in-flight request instead of each hitting the main app.
+- Failures are remembered for ``error_ttl`` so a down main app is not
+  hammered by high-frequency status polling.
+"""
+
+import threading
+import time
+
+import http_client
+
+MAIN_APP_URL = "http://localhost:5000"
+ANALYTICS_PATH = "/api/dashboard/analytics"
+DEFAULT_TTL = 30.0
+DEFAULT_STALE_TTL = 300.0
+DEFAULT_ERROR_TTL = 5.0
+REQUEST_TIMEOUT = 10
+
+
+class AnalyticsCache:
+    """TTL cache with request coalescing and stale-while-revalidate"""
+
+    def __init__(self, fetch, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 error_ttl=DEFAULT_ERROR_TTL, clock=time.monotonic):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.value = None
+        self.fetched_at = None
+        self.failed_at = None
+        self.in_flight = None
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0,
+                      'refreshes': 0, 'errors': 0}
+
+    def get(self, timeout=None):
+        """Cached value, or None when the source is unavailable and nothing usable is cached
+
+        ``timeout`` bounds how long the caller blocks on a fetch; a fetch that
+        outlives it keeps running in the background and fills the cache.
+        """
+        with self.lock:
+            now = self.clock()
+            age = None if self.fetched_at is None else now - self.fetched_at
+
+            if age is not None and age < self.ttl:
+                self.stats['hits'] += 1
+                return self.value
+
+            if age is not None and age < self.stale_ttl:
+                self.stats['stale_hits'] += 1
+                if self.in_flight is None and not self._recently_failed(now):
+                    self.in_flight = threading.Event()
+                    threading.Thread(target=self._refresh, args=(self.in_flight,), daemon=True).start()
+                return self.value
+
+            if self.in_flight is not None:
+                self.stats['coalesced'] += 1
+                waiter = self.in_flight
+            elif self._recently_failed(now):
+                return None
+            else:
+                self.stats['misses'] += 1
+                waiter = None
+                self.in_flight = threading.Event()
+                done = self.in_flight
+
+        if waiter is not None:
+            waiter.wait(REQUEST_TIMEOUT * 2 if timeout is None else timeout)
+            with self.lock:
+                fresh = self.fetched_at is not None and self.clock() - self.fetched_at < self.stale_ttl
+                return self.value if fresh else None
+
+        if timeout is None:
+            self._refresh(done)
+        else:
+            threading.Thread(target=self._refresh, args=(done,), daemon=True).start()
+            if not done.wait(timeout):
+                return None
+        with self.lock:
+            return self.value if self.failed_at is None else None
+
+    def _recently_failed(self, now):
+        return self.failed_at is not None and now - self.failed_at < self.error_ttl
+
+    def _refresh(self, done):
+        try:
+            value = self.fetch()
+        except Exception:
+            value = None
+        with self.lock:
+            self.stats['refreshes'] += 1
+            if value is None:
+                self.stats['errors'] += 1
+                self.failed_at = self.clock()
+            else:
+                self.value = value
+                self.fetched_at = self.clock()
+                self.failed_at = None
+            self.in_flight = None
+        done.set()
+
+    def invalidate(self):
+        """Forget the cached value so the next call refetches"""
+        with self.lock:
+            self.value = None
+            self.fetched_at = None
+            self.failed_at = None
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['age_seconds'] = None if self.fetched_at is None else round(self.clock() - self.fetched_at, 1)
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _fetch_analytics(base_url):
+    response = http_client.get(f"{base_url}{ANALYTICS_PATH}", timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        return response.json()
+    return None
+
+
+def get_analytics_cache(base_url=MAIN_APP_URL):
+    """Process-wide cache for one main application"""
+    with _caches_lock:
+        cache = _caches.get(base_url)
+        if cache is None:
+            cache = _caches[base_url] = AnalyticsCache(lambda: _fetch_analytics(base_url))
+        return cache
+
+
+def get_dashboard_analytics(base_url=MAIN_APP_URL, timeout=None):
+    """Full analytics payload, or None when the main app cannot provide it (within ``timeout``)"""
+    return get_analytics_cache(base_url).get(timeout)
+
+
+def get_dashboard_overview(base_url=MAIN_APP_URL):
+    """Dashboard overview counters ({} when unavailable)"""
+    analytics = get_dashboard_analytics(base_url)
+    return analytics.get('overview', {}) if analytics else {}
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Async Document Workflow Client
+==============================
+asyncio variant of HiblaDocumentWorkflow for bulk runs.
+
+All requests share one pooled ``http_client.HttpClient`` (keep-alive
+connections to the document service, connect/read timeouts and safe retries), the quotation, sales order and job order of a
+workflow are generated concurrently, and thousands of workflows can be
+queued with a single limit on in-flight document requests. The project
+does not depend on an async HTTP library, so blocking calls run on a
+bounded thread pool sized to the concurrency limit.
+
+Usage:
+    python async_workflow.py --workflows 1000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from http_client import HttpClient
+from workflow_document_integration import HiblaDocumentWorkflow
+
+DOCUMENT_TYPES = (
+    ('quotation', 'generate_quotation_document'),
+    ('sales_order', 'generate_sales_order_document'),
+    ('job_order', 'generate_job_order_document')
+)
+
+
+class AsyncHiblaDocumentWorkflow(HiblaDocumentWorkflow):
+    """Concurrent workflow runner sharing one connection pool"""
+
+    def __init__(self, doc_service_url="http://localhost:5001", main_api_url="http://localhost:5000",
+                 concurrency=16):
+        super().__init__(doc_service_url, main_api_url)
+        self.concurrency = concurrency
+        self.http = HttpClient(pool_connections=2, pool_maxsize=concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='doc-workflow')
+        self.semaphore = None
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def check_services_health_async(self):
+        """Check both services without blocking the event loop"""
+        return await self._run_blocking(self.check_services_health)
+
+    async def generate_document_async(self, method_name, data):
+        """Generate one document under the shared concurrency limit"""
+        async with self.semaphore:
+            try:
+                return await self._run_blocking(getattr(self, method_name), data)
+            except requests.RequestException as e:
+                print(f"❌ Document service error: {e}")
+                return None
+
+    async def run_workflow(self, workflow):
+        """Generate every document in one workflow concurrently"""
+        kinds = [(kind, method) for kind, method in DOCUMENT_TYPES if workflow.get(kind)]
+        results = await asyncio.gather(*(
+            self.generate_document_async(method, workflow[kind]) for kind, method in kinds
+        ))
+        return {kind: paths for (kind, _), paths in zip(kinds, results)}
+
+    async def run_workflows(self, workflows):
+        """Process many workflows and report documents per second"""
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self.run_workflow(workflow) for workflow in workflows))
+        elapsed = time.perf_counter() - started
+
+        requested = sum(len(result) for result in results)
+        generated = sum(1 for result in results for paths in result.values() if paths)
+        return {
+            'workflows': len(workflows),
+            'documents_requested': requested,
+            'documents_generated': generated,
+            'documents_failed': requested - generated,
+            'elapsed_seconds': round(elapsed, 3),
+            'documents_per_second': round(generated / elapsed, 1) if elapsed else None,
+            'concurrency': self.concurrency,
+            'results': results
+        }
+
+    def close(self):
+        """Release pooled connections and worker threads"""
+        self.executor.shutdown(wait=True)
+        self.http.close()
+
+
+def sample_workflow(index):
+    """Quotation, sales order and job order payloads for one synthetic customer order"""
+    stamp = datetime.now().strftime('%Y%m%d')
+    items = [
+        {
+            "productName": "Premium Filipino Hair 18-inch",
+            "specification": "Natural Black, Straight",
+            "quantity": 100,
+            "unitPrice": 85.00,
+            "lineTotal": 8500.00
+        },
+        {
+            "productName": "Premium Filipino Hair 22-inch",
+            "specification": "Natural Brown, Wavy",
+            "quantity": 50,
+            "unitPrice": 105.00,
+            "lineTotal": 5250.00
+        }
+    ]
+    totals = {"subtotal": 13750.00, "shippingFee": 250.00, "bankCharge": 75.00, "discount": 0.00, "total": 14075.00}
+    sales_order_number = f"SO-{stamp}-B{index:05d}"
+
+    return {
+        'quotation': dict(totals, quotationNumber=f"QT-{stamp}-B{index:05d}", customerCode="CUST-001",
+                          customerName="Global Hair Distributors Inc.", country="United States",
+                          priceTier="Regular Customer", revisionNumber="R0", items=items),
+        'sales_order': dict(totals, salesOrderNumber=sales_order_number, customerCode="CUST-001",
+                            customerName="Global Hair Distributors Inc.", country="United States",
+                            status="Confirmed", paymentStatus="Paid", items=items),
+        'job_order': {
+            "jobOrderNumber": f"JO-{stamp}-B{index:05d}",
+            "salesOrderNumber": sales_order_number,
+            "customerName": "Global Hair Distributors Inc.",
+            "priority": "Normal",
+            "dueDate": (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d"),
+            "items": [dict(item, status="Queued") for item in items]
+        }
+    }
+
+
+async def run(args):
+    workflow = AsyncHiblaDocumentWorkflow(concurrency=args.concurrency)
+    try:
+        if not await workflow.check_services_health_async():
+            print("❌ Services are not ready. Please ensure both services are running.")
+            return None
+
+        workflows = [sample_workflow(index) for index in range(1, args.workflows + 1)]
+        print(f"\n📄 Generating {len(workflows) * len(DOCUMENT_TYPES)} documents "
+              f"for {len(workflows)} workflows (concurrency {args.concurrency})...")
+        return await workflow.run_workflows(workflows)
+    finally:
+        workflow.close()
+
+
+def main():
+    """Bulk async workflow run"""
+    parser = argparse.ArgumentParser(description='Concurrent quotation/SO/JO document generation')
+    parser.add_argument('--workflows', type=int, default=100, help='number of workflows to generate')
+    parser.add_argument('--concurrency', type=int, default=16, help='maximum in-flight document requests')
+    args = parser.parse_args()
+
+    print("🚀 Hibla Async Document Workflow")
+    print("=" * 60)
+    report = asyncio.run(run(args))
+    if report:
+        print(f"\n🎉 Generated {report['documents_generated']}/{report['documents_requested']} documents "
+              f"in {report['elapsed_seconds']}s")
+        print(f"⚡ Throughput: {report['documents_per_second']} documents/second")
+        if report['documents_failed']:
+            print(f"⚠️ Failed documents: {report['documents_failed']}")
+
+
+if __name__ == "__main__":
+    main()
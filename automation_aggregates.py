@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Automation Aggregate Store
+==========================
+Incrementally maintained counters for the automation controller.
+
+Every processed quotation, order and generated document is appended to an
+event history and folded into compact counters (per status, customer and
+day) as it happens, so the daily report reads its numbers in O(1) instead
+of rescanning history. Run ``python automation_aggregates.py backfill`` to
+rebuild the counters from the history log.
+
+The saved counters remember how far into the history log they reach; on
+load, any events appended after the last save (e.g. before a crash) are
+replayed, so no update is lost between saves.
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+DEFAULT_STATE_PATH = 'automation_aggregates.json'
+DEFAULT_HISTORY_PATH = 'automation_events.jsonl'
+
+
+class AutomationAggregateStore:
+    """Compact count/sum counters updated as automation events are processed"""
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH, history_path=DEFAULT_HISTORY_PATH):
+        self.state_path = state_path
+        self.history_path = history_path
+        self.lock = threading.Lock()
+        self.reset()
+        self.saved_events = None
+        self.load()
+
+    def reset(self):
+        """Clear all counters"""
+        # Each bucket maps a compact "event_type|key" string to [count, amount]
+        self.by_status = {}
+        self.by_customer = {}
+        self.by_day = {}
+        self.events_applied = 0
+        self.history_offset = 0
+
+    def record_event(self, event_type, record, timestamp=None):
+        """Append an event to history and fold it into the counters"""
+        event = {
+            'type': event_type,
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'id': record.get('id'),
+            'status': record.get('status', 'unknown'),
+            'customer': record.get('customer') or record.get('customerName') or 'unknown',
+            'amount': record.get('total', 0) or 0
+        }
+
+        with self.lock:
+            with open(self.history_path, 'ab') as f:
+                f.write((json.dumps(event, separators=(',', ':')) + '\n').encode('utf-8'))
+                self.history_offset = f.tell()
+            self._apply(event)
+
+        return event
+
+    def _apply(self, event):
+        """Fold a single event into the counters (caller holds the lock)"""
+        event_type = event['type']
+        amount = float(event.get('amount') or 0)
+        day = event['timestamp'][:10]
+
+        for bucket, key in ((self.by_status, event.get('status', 'unknown')),
+                            (self.by_customer, event.get('customer', 'unknown')),
+                            (self.by_day, day)):
+            counter = bucket.setdefault(f"{event_type}|{key}", [0, 0.0])
+            counter[0] += 1
+            counter[1] += amount
+
+        self.events_applied += 1
+
+    def count(self, event_type, day=None, status=None, customer=None):
+        """Return (count, amount) for one event type and one dimension"""
+        if day is not None:
+            bucket, key = self.by_day, day
+        elif status is not None:
+            bucket, key = self.by_status, status
+        elif customer is not None:
+            bucket, key = self.by_customer, customer
+        else:
+            raise ValueError('One of day, status or customer is required')
+
+        with self.lock:
+            count, amount = bucket.get(f"{event_type}|{key}", (0, 0.0))
+        return count, amount
+
+    def daily_summary(self, day=None):
+        """Return today's (or the given day's) counters for the daily report"""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        summary = {'date': day}
+        for event_type in ('quotation', 'order', 'job_order', 'document'):
+            count, amount = self.count(event_type, day=day)
+            summary[event_type] = {'count': count, 'amount': amount}
+        return summary
+
+    def snapshot(self):
+        """Return a serializable copy of all counters"""
+        with self.lock:
+            return {
+                'updated': datetime.now().isoformat(),
+                'events_applied': self.events_applied,
+                'history_offset': self.history_offset,
+                'by_status': dict(self.by_status),
+                'by_customer': dict(self.by_customer),
+                'by_day': dict(self.by_day)
+            }
+
+    def save(self):
+        """Persist counters so a restart does not require a backfill"""
+        snapshot = self.snapshot()
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_path)
+        self.saved_events = snapshot['events_applied']
+
+    def save_if_changed(self):
+        """Persist counters when events were applied since the last save"""
+        if self.events_applied != self.saved_events:
+            self.save()
+            return True
+        return False
+
+    def load(self):
+        """Load persisted counters if present, then replay history appended after the save"""
+        if not os.path.exists(self.state_path):
+            with self.lock:
+                self._replay_history()
+            return False
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # The history is still intact; rebuild the counters from it
+            print(f"⚠️ Aggregate state unreadable ({e}); replaying {self.history_path}")
+            with self.lock:
+                self.reset()
+                self._replay_history()
+            return False
+
+        with self.lock:
+            self.by_status = data.get('by_status', {})
+            self.by_customer = data.get('by_customer', {})
+            self.by_day = data.get('by_day', {})
+            self.events_applied = data.get('events_applied', 0)
+            self.history_offset = data.get('history_offset', 0)
+            saved_events = self.events_applied
+            self._replay_history()
+        self.saved_events = saved_events
+        return True
+
+    def _replay_history(self):
+        """Fold history lines past ``history_offset`` into the counters (caller holds the lock)"""
+        if not os.path.exists(self.history_path):
+            return
+        with open(self.history_path, 'rb') as f:
+            if self.history_offset > os.fstat(f.fileno()).st_size:
+                return  # history was rotated; the saved counters stand
+            f.seek(self.history_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # torn final write
+                self.history_offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+
+    def backfill(self):
+        """Rebuild all counters from the event history"""
+        with self.lock:
+            self.reset()
+            self._replay_history()
+        self.save()
+        return self.events_applied
+
+
+def main():
+    """Aggregate store maintenance commands"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'summary'
+    store = AutomationAggregateStore()
+
+    if command == 'backfill':
+        print(f"🔄 Rebuilding aggregates from {store.history_path}...")
+        applied = store.backfill()
+        print(f"✅ Backfill complete: {applied} events applied")
+        print(f"💾 Aggregates saved to: {store.state_path}")
+    elif command == 'summary':
+        print(json.dumps(store.daily_summary(), indent=2))
+    else:
+        print(f"❌ Unknown command: {command}")
+        print("Usage: python automation_aggregates.py [backfill|summary]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
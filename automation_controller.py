@@ -11,14 +11,36 @@ import requests
 import json
 import time
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import schedule
 
+from automation_aggregates import AutomationAggregateStore
+from automation_telemetry import AutomationTelemetry, STATUS_PORT, start_status_server
+from circuit_breaker import CircuitBreaker
+from document_task_dag import DocumentTaskDAG, FAILED, SKIPPED, TaskDeferred
+import http_client
+
 class HiblaAutomationController:
-    def __init__(self):
+    # (interval in minutes, job method name)
+    SCHEDULE = [
+        (5, 'monitor_quotations'),
+        (10, 'process_pending_orders'),
+        (15, 'generate_reports')
+    ]
+    
+    def __init__(self, aggregates=None, status_port=STATUS_PORT, clock=time.monotonic):
         self.main_app_url = "http://localhost:5000"
         self.doc_service_url = "http://localhost:5001"
         self.running = False
+        self.aggregates = aggregates or AutomationAggregateStore()
+        self.doc_breaker = CircuitBreaker('document_service', failure_threshold=3, clock=clock)
+        self.deferred_documents = OrderedDict()
+        self.deferred_lock = threading.Lock()
+        self.dag_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='doc-dag')
+        self.telemetry = AutomationTelemetry()
+        self.status_port = status_port
         
     def start_automation(self):
         """Start the automation controller"""
@@ -28,20 +50,26 @@ class HiblaAutomationController:
         print(f"📄 Document Service: {self.doc_service_url}")
         
         # Schedule automated tasks
-        schedule.every(5).minutes.do(self.monitor_quotations)
-        schedule.every(10).minutes.do(self.process_pending_orders)
-        schedule.every(15).minutes.do(self.generate_reports)
+        for minutes, job_name in self.SCHEDULE:
+            job = self.telemetry.instrument(job_name, minutes * 60, getattr(self, job_name))
+            schedule.every(minutes).minutes.do(job)
         
         # Start monitoring thread
         monitor_thread = threading.Thread(target=self.run_scheduler, daemon=True)
         monitor_thread.start()
         
+        # Expose job telemetry
+        start_status_server(self, self.status_port)
+        print(f"📈 Job Telemetry: http://localhost:{self.status_port}/automation/status")
+        
         return True
     
     def run_scheduler(self):
         """Run scheduled tasks"""
         while self.running:
             schedule.run_pending()
+            self.flush_deferred_documents()
+            self.save_aggregates()
             time.sleep(30)
     
     def monitor_quotations(self):
@@ -52,11 +80,16 @@ class HiblaAutomationController:
             # Check for new quotations (simulation)
             quotations_to_process = self.get_pending_quotations()
             
+            dag = DocumentTaskDAG(executor=self.dag_executor)
             for quotation in quotations_to_process:
-                self.auto_generate_quotation_document(quotation)
+                self.expand_quotation_event(dag, quotation)
+            summary = self.run_document_dag(dag)
+            
+            return {'items': len(quotations_to_process), 'errors': self.dag_errors(summary)}
                 
         except Exception as e:
             print(f"❌ Quotation monitoring error: {e}")
+            return {'items': 0, 'errors': 1, 'error': str(e)}
     
     def process_pending_orders(self):
         """Process pending sales orders and job orders"""
@@ -66,11 +99,16 @@ class HiblaAutomationController:
             # Simulate order processing
             pending_orders = self.get_pending_orders()
             
+            dag = DocumentTaskDAG(executor=self.dag_executor)
             for order in pending_orders:
-                self.auto_generate_order_documents(order)
+                self.expand_order_event(dag, order)
+            summary = self.run_document_dag(dag)
+            
+            return {'items': len(pending_orders), 'errors': self.dag_errors(summary)}
                 
         except Exception as e:
             print(f"❌ Order processing error: {e}")
+            return {'items': 0, 'errors': 1, 'error': str(e)}
     
     def generate_reports(self):
         """Generate automated reports"""
@@ -80,14 +118,19 @@ class HiblaAutomationController:
             # Create daily summary report
             report_content = self.build_daily_report()
             
-            self.generate_document({
+            result = self.generate_document({
                 'filename_base': f'daily_report_{datetime.now().strftime("%Y%m%d")}',
                 'content': report_content,
                 'formats': ['pdf', 'docx']
             })
             
+            self.aggregates.save()
+            
+            return {'items': 1, 'errors': 0 if result else 1}
+            
         except Exception as e:
             print(f"❌ Report generation error: {e}")
+            return {'items': 0, 'errors': 1, 'error': str(e)}
     
     def get_pending_quotations(self):
         """Get quotations that need document generation"""
@@ -114,8 +157,13 @@ class HiblaAutomationController:
         ]
     
     def build_daily_report(self):
-        """Build daily summary report content"""
+        """Build daily summary report content from the aggregate store"""
         today = datetime.now().strftime("%Y-%m-%d")
+        summary = self.aggregates.daily_summary(today)
+        quotations = summary['quotation']
+        orders = summary['order']
+        job_orders = summary['job_order']
+        documents = summary['document']
         
         return f"""# HIBLA MANUFACTURING DAILY REPORT
 
@@ -135,10 +183,10 @@ class HiblaAutomationController:
 - Authentication: Active
 
 ## Daily Metrics
-- Quotations Processed: Automated tracking active
-- Sales Orders: Automated processing active
-- Job Orders: Automated creation active
-- Documents Generated: Continuous generation
+- Quotations Processed: {quotations['count']} (${quotations['amount']:.2f})
+- Sales Orders Processed: {orders['count']} (${orders['amount']:.2f})
+- Job Orders Created: {job_orders['count']}
+- Documents Generated: {documents['count']}
 
 ## Next Actions
 - Continue automated monitoring
@@ -151,8 +199,8 @@ class HiblaAutomationController:
 *System operational and monitoring active*
 """
     
-    def auto_generate_quotation_document(self, quotation):
-        """Auto-generate quotation document"""
+    def build_quotation_document(self, quotation):
+        """Build quotation document payload"""
         content = f"""# AUTOMATED QUOTATION - {quotation['id']}
 
 **Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
@@ -176,16 +224,42 @@ This quotation was automatically processed by the Hibla Automation system.
 *Generated automatically by Hibla Manufacturing Automation*
 """
         
-        self.generate_document({
+        return {
             'filename_base': f'auto_quotation_{quotation["id"]}',
             'content': content,
             'formats': ['pdf', 'docx']
-        })
+        }
     
-    def auto_generate_order_documents(self, order):
-        """Auto-generate order documents"""
-        if order['needs_job_order']:
-            content = f"""# AUTOMATED JOB ORDER - {order['id']}
+    def build_sales_order_document(self, order):
+        """Build sales order document payload"""
+        content = f"""# AUTOMATED SALES ORDER - {order['id']}
+
+**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+**Source Quotation**: {order.get('quotation_id', 'N/A')}
+**Customer**: {order.get('customer', 'N/A')}
+**Status**: {order['status']}
+
+## Automated Sales Order Processing
+This sales order was automatically processed by the Hibla Automation system.
+
+## Status Tracking
+- Confirmation: Automated
+- Payment Tracking: Active
+- Production Handoff: {'Job order requested' if order.get('needs_job_order') else 'Not required'}
+
+---
+*Generated automatically by Hibla Manufacturing Automation*
+"""
+        
+        return {
+            'filename_base': f'auto_sales_order_{order["id"]}',
+            'content': content,
+            'formats': ['pdf', 'docx']
+        }
+    
+    def build_job_order_document(self, order):
+        """Build job order document payload"""
+        content = f"""# AUTOMATED JOB ORDER - {order['id']}
 
 **Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 **Source Order**: {order['id']}
@@ -207,31 +281,213 @@ This job order was automatically created from confirmed sales order.
 ---
 *Generated automatically by Hibla Manufacturing Automation*
 """
-            
-            self.generate_document({
-                'filename_base': f'auto_job_order_{order["id"]}',
-                'content': content,
-                'formats': ['pdf', 'docx']
+        
+        return {
+            'filename_base': f'auto_job_order_{order["id"]}',
+            'content': content,
+            'formats': ['pdf', 'docx']
+        }
+    
+    def auto_generate_quotation_document(self, quotation):
+        """Auto-generate quotation document"""
+        return self.generate_document(self.build_quotation_document(quotation))
+    
+    def auto_generate_order_documents(self, order):
+        """Auto-generate order documents"""
+        result = self.generate_document(self.build_sales_order_document(order))
+        
+        if order['needs_job_order']:
+            self.generate_document(self.build_job_order_document(order))
+            self.aggregates.record_event('job_order', {
+                'id': f'JO-{order["id"]}',
+                'status': 'created',
+                'customer': order.get('customer')
             })
+        
+        return result
+    
+    def sales_order_from_quotation(self, quotation):
+        """Derive the sales order record for an accepted quotation"""
+        return {
+            'id': quotation.get('sales_order_id', quotation['id'].replace('QT', 'SO', 1)),
+            'type': 'sales_order',
+            'status': 'confirmed',
+            'quotation_id': quotation['id'],
+            'customer': quotation.get('customer'),
+            'total': quotation.get('total', 0),
+            'needs_job_order': quotation.get('needs_job_order', True)
+        }
+    
+    def add_document_tasks(self, dag, stage_id, doc_data, depends_on=()):
+        """Add one task per output format so PDF and DOCX render in parallel
+        
+        The document is counted once, by a task that runs after every format rendered.
+        """
+        task_ids = []
+        for fmt in doc_data['formats']:
+            task_id = f"{stage_id}:{fmt}"
+            dag.add_task(task_id, self.document_task,
+                         (dag, task_id, dict(doc_data, formats=[fmt])), depends_on)
+            task_ids.append(task_id)
+        dag.add_task(f"{stage_id}:document", self.record_stage, ('document', {
+            'id': doc_data['filename_base'],
+            'status': 'generated'
+        }), task_ids)
+        return task_ids
+    
+    def document_task(self, dag, task_id, doc_data):
+        """DAG task: render now, or defer and resume the task's subtree once the deferred render succeeds"""
+        return self.render_document(doc_data, [lambda result: dag.resume(task_id, result)], record=False)
+    
+    def record_stage(self, event_type, record):
+        """DAG task that records a completed stage in the aggregates"""
+        self.aggregates.record_event(event_type, record)
+        return True
+    
+    def expand_order_event(self, dag, order, depends_on=()):
+        """Sales order documents, then job order documents when required"""
+        so_stage = f"sales_order:{order['id']}"
+        so_tasks = self.add_document_tasks(dag, so_stage,
+                                           self.build_sales_order_document(order), depends_on)
+        dag.add_task(f"{so_stage}:record", self.record_stage, ('order', order), so_tasks)
+        
+        if order.get('needs_job_order'):
+            jo_stage = f"job_order:{order['id']}"
+            jo_tasks = self.add_document_tasks(dag, jo_stage,
+                                               self.build_job_order_document(order), so_tasks)
+            dag.add_task(f"{jo_stage}:record", self.record_stage, ('job_order', {
+                'id': f'JO-{order["id"]}',
+                'status': 'created',
+                'customer': order.get('customer')
+            }), jo_tasks)
+        
+        return so_tasks
+    
+    def expand_quotation_event(self, dag, quotation):
+        """Quotation documents, chaining into the sales order once accepted"""
+        qt_stage = f"quotation:{quotation['id']}"
+        qt_tasks = self.add_document_tasks(dag, qt_stage, self.build_quotation_document(quotation))
+        dag.add_task(f"{qt_stage}:record", self.record_stage, ('quotation', quotation), qt_tasks)
+        
+        if quotation.get('status') == 'accepted':
+            self.expand_order_event(dag, self.sales_order_from_quotation(quotation), qt_tasks)
+        
+        return qt_tasks
+    
+    def run_document_dag(self, dag):
+        """Execute a document DAG on the shared pool and report the outcome"""
+        tasks = dag.run()
+        self.save_aggregates()
+        summary = dag.summary()
+        print(f"🧩 Document chain complete: {summary}")
+        for task in tasks.values():
+            if task.status == SKIPPED:
+                print(f"⏭️ Skipped {task.task_id}: {task.error}")
+        return summary
+    
+    def save_aggregates(self):
+        """Persist counter updates at the end of each batch so a restart loses nothing"""
+        try:
+            self.aggregates.save_if_changed()
+        except OSError as e:
+            print(f"⚠️ Could not save aggregates: {e}")
+    
+    def dag_errors(self, summary):
+        """Failed plus skipped tasks in a DAG summary"""
+        return summary.get(FAILED, 0) + summary.get(SKIPPED, 0)
     
     def generate_document(self, doc_data):
-        """Generate document via service"""
+        """Generate document via service, deferring work while the circuit is open"""
         try:
-            response = requests.post(
-                f"{self.doc_service_url}/api/documents/generate",
-                json=doc_data,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✅ Auto-generated: {doc_data['filename_base']}")
-                return result
-            else:
-                print(f"❌ Document generation failed: {response.text}")
-                
-        except Exception as e:
+            return self.render_document(doc_data)
+        except TaskDeferred:
+            return None
+    
+    def render_document(self, doc_data, on_rendered=(), record=True):
+        """Submit a document; while the service is unavailable it is deferred and TaskDeferred raised
+        
+        ``on_rendered`` callbacks receive the result when a deferred document is finally rendered.
+        ``record=False`` leaves counting the document to the caller (one format of a DAG stage).
+        """
+        if not self.doc_breaker.allow_request():
+            self.defer_document(doc_data, on_rendered, record)
+            raise TaskDeferred(f"{doc_data['filename_base']} deferred: document service circuit open")
+        
+        try:
+            response = self.submit_document(doc_data)
+        except requests.RequestException as e:
+            self.doc_breaker.record_failure()
             print(f"❌ Document service error: {e}")
+            self.defer_document(doc_data, on_rendered, record)
+            raise TaskDeferred(f"{doc_data['filename_base']} deferred: {e}")
+        
+        if response.status_code == 200:
+            self.doc_breaker.record_success()
+            result = response.json()
+            print(f"✅ Auto-generated: {doc_data['filename_base']}")
+            if record:
+                self.aggregates.record_event('document', {
+                    'id': doc_data['filename_base'],
+                    'status': 'generated'
+                })
+            return result
+        
+        if response.status_code >= 500:
+            self.doc_breaker.record_failure()
+            self.defer_document(doc_data, on_rendered, record)
+            raise TaskDeferred(f"{doc_data['filename_base']} deferred: HTTP {response.status_code}")
+        # The service answered; a rejected payload is not a service failure
+        self.doc_breaker.record_success()
+        print(f"❌ Document generation failed: {response.text}")
+        return None
+    
+    def submit_document(self, doc_data):
+        """POST a document payload to the document service"""
+        return http_client.post(
+            f"{self.doc_service_url}/api/documents/generate",
+            json=doc_data,
+            timeout=(5, 30)
+        )
+    
+    def defer_document(self, doc_data, on_rendered=(), record=True):
+        """Keep a document for later submission instead of dropping it"""
+        # Per-format DAG tasks share a filename_base, so the formats are part of the key
+        key = (doc_data['filename_base'], tuple(doc_data.get('formats', ())))
+        with self.deferred_lock:
+            # Re-deferring the same document replaces the older payload but keeps every waiter
+            previous = self.deferred_documents.pop(key, None)
+            callbacks = (previous['on_rendered'] if previous else []) + list(on_rendered)
+            self.deferred_documents[key] = {'doc_data': doc_data, 'on_rendered': callbacks, 'record': record}
+            pending = len(self.deferred_documents)
+        print(f"⏸️ Deferred: {doc_data['filename_base']} {list(key[1])} ({pending} pending, "
+              f"retry in {self.doc_breaker.retry_in():.0f}s)")
+    
+    def flush_deferred_documents(self):
+        """Resubmit deferred documents once the breaker admits requests again"""
+        with self.deferred_lock:
+            pending = len(self.deferred_documents)
+        
+        for _ in range(pending):
+            if not self.doc_breaker.is_available():
+                break
+            with self.deferred_lock:
+                if not self.deferred_documents:
+                    break
+                _, entry = self.deferred_documents.popitem(last=False)
+            try:
+                result = self.render_document(entry['doc_data'], entry['on_rendered'], entry['record'])
+            except TaskDeferred:
+                continue  # queued again, waiters included
+            if result:
+                for callback in entry['on_rendered']:
+                    callback(result)
+    
+    def get_breaker_metrics(self):
+        """Document service breaker metrics and deferred backlog size"""
+        metrics = self.doc_breaker.get_metrics()
+        with self.deferred_lock:
+            metrics['deferred_documents'] = len(self.deferred_documents)
+        return metrics
     
     def stop_automation(self):
         """Stop the automation controller"""
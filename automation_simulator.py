@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Automation Replay Simulator
+===========================
+Load-tests HiblaAutomationController against an in-process stub document
+service using a virtual clock, so hours of 5/10/15 minute schedules replay
+in seconds.
+
+Quotations and orders come either from a recorded JSONL stream
+(``{"offset_seconds": 12.5, "kind": "quotation", "record": {...}}`` per
+line) or from a synthetic generator. The report shows documents per second
+(wall and virtual), end-to-end lag from event arrival to the last document
+render, and stub backlog growth (least-squares slope over every sample) so
+the saturation point can be found. The controller's circuit breaker runs on
+the same virtual clock.
+
+Usage:
+    python automation_simulator.py --hours 24 --rates 10,50,200
+    python automation_simulator.py --events recorded_events.jsonl
+"""
+
+import argparse
+import contextlib
+import heapq
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from automation_aggregates import AutomationAggregateStore
+from automation_controller import HiblaAutomationController
+
+TICK_SECONDS = 30
+DOCUMENT_PREFIXES = ('auto_quotation_', 'auto_sales_order_', 'auto_job_order_')
+
+
+class VirtualClock:
+    """Monotonic clock that only moves when the simulator advances it"""
+
+    def __init__(self, start=0.0):
+        self.current = start
+        self.lock = threading.Lock()
+
+    def now(self):
+        with self.lock:
+            return self.current
+
+    def advance(self, seconds):
+        with self.lock:
+            self.current += seconds
+            return self.current
+
+
+class StubResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+
+class StubDocumentService:
+    """In-process document service modelled as a multi-worker FIFO queue"""
+
+    def __init__(self, clock, service_time=0.5, workers=2):
+        self.clock = clock
+        self.service_time = service_time
+        self.lock = threading.Lock()
+        self.worker_free_at = [0.0] * workers
+        self.in_flight = []
+        self.completions = []
+
+    def generate(self, doc_data):
+        """Accept a document and return its virtual completion time"""
+        with self.lock:
+            now = self.clock.now()
+            free_at = heapq.heappop(self.worker_free_at)
+            done_at = max(now, free_at) + self.service_time * len(doc_data.get('formats', ['md']))
+            heapq.heappush(self.worker_free_at, done_at)
+            heapq.heappush(self.in_flight, done_at)
+            self.completions.append((doc_data['filename_base'], done_at))
+
+        paths = {fmt: f"./documents/{doc_data['filename_base']}.{fmt}" for fmt in doc_data.get('formats', [])}
+        return StubResponse(200, {'success': True, 'paths': paths})
+
+    def backlog(self):
+        """Documents accepted but not yet rendered at the current virtual time"""
+        with self.lock:
+            now = self.clock.now()
+            while self.in_flight and self.in_flight[0] <= now:
+                heapq.heappop(self.in_flight)
+            return len(self.in_flight)
+
+
+class EventStream:
+    """Time-ordered quotation/order arrivals released as the clock advances"""
+
+    def __init__(self, events):
+        self.events = sorted(events, key=lambda event: event['offset_seconds'])
+        self.position = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    @classmethod
+    def synthetic(cls, duration_seconds, quotations_per_hour, orders_per_hour, seed=42):
+        """Poisson arrivals of quotations (30% accepted) and confirmed orders"""
+        rng = random.Random(seed)
+        events = []
+        for kind, per_hour in (('quotation', quotations_per_hour), ('order', orders_per_hour)):
+            if per_hour <= 0:
+                continue
+            offset, index = 0.0, 0
+            while True:
+                offset += rng.expovariate(per_hour / 3600.0)
+                if offset >= duration_seconds:
+                    break
+                index += 1
+                if kind == 'quotation':
+                    record = {
+                        'id': f'QT-SIM-{index:06d}',
+                        'customer': f'Customer {rng.randint(1, 50)}',
+                        'status': 'accepted' if rng.random() < 0.3 else 'pending_document',
+                        'total': round(rng.uniform(500, 20000), 2)
+                    }
+                else:
+                    record = {
+                        'id': f'SO-DIRECT-{index:06d}',
+                        'type': 'sales_order',
+                        'customer': f'Customer {rng.randint(1, 50)}',
+                        'status': 'confirmed',
+                        'total': round(rng.uniform(500, 20000), 2),
+                        'needs_job_order': rng.random() < 0.8
+                    }
+                events.append({'offset_seconds': offset, 'kind': kind, 'record': record})
+        return cls(events)
+
+    def release(self, now):
+        """Return events that have arrived by virtual time ``now``, grouped by kind"""
+        released = {'quotation': [], 'order': []}
+        with self.lock:
+            while self.position < len(self.events) and self.events[self.position]['offset_seconds'] <= now:
+                event = self.events[self.position]
+                released[event['kind']].append(event)
+                self.position += 1
+        return released
+
+
+class SimulatedController(HiblaAutomationController):
+    """Controller wired to the virtual clock, event stream and stub service"""
+
+    def __init__(self, clock, stream, doc_service, aggregates):
+        super().__init__(aggregates=aggregates, clock=clock.now)
+        self.clock = clock
+        self.stream = stream
+        self.doc_service = doc_service
+        self.arrivals = {}
+        self.pending = {'quotation': [], 'order': []}
+
+    def poll_stream(self):
+        """Move newly arrived events into the pending lists"""
+        for kind, events in self.stream.release(self.clock.now()).items():
+            for event in events:
+                record = event['record']
+                self.arrivals[record['id']] = event['offset_seconds']
+                if kind == 'quotation' and record.get('status') == 'accepted':
+                    self.arrivals[self.sales_order_from_quotation(record)['id']] = event['offset_seconds']
+                self.pending[kind].append(record)
+
+    def get_pending_quotations(self):
+        self.poll_stream()
+        quotations, self.pending['quotation'] = self.pending['quotation'], []
+        return quotations
+
+    def get_pending_orders(self):
+        self.poll_stream()
+        orders, self.pending['order'] = self.pending['order'], []
+        return orders
+
+    def submit_document(self, doc_data):
+        return self.doc_service.generate(doc_data)
+
+
+def backlog_slope(samples):
+    """Least-squares slope (documents per second) of (time, backlog) samples"""
+    if len(samples) < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in samples) / len(samples)
+    mean_b = sum(b for _, b in samples) / len(samples)
+    variance = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not variance:
+        return 0.0
+    return sum((t - mean_t) * (b - mean_b) for t, b in samples) / variance
+
+
+class AutomationSimulator:
+    """Drive a SimulatedController through its schedule on a virtual clock"""
+
+    def __init__(self, stream, duration_seconds, service_time=0.5, workers=2):
+        self.duration_seconds = duration_seconds
+        self.clock = VirtualClock()
+        self.stream = stream
+        self.doc_service = StubDocumentService(self.clock, service_time, workers)
+        self.workdir = tempfile.TemporaryDirectory(prefix='hibla_sim_')
+        aggregates = AutomationAggregateStore(
+            state_path=os.path.join(self.workdir.name, 'aggregates.json'),
+            history_path=os.path.join(self.workdir.name, 'events.jsonl')
+        )
+        self.controller = SimulatedController(self.clock, stream, self.doc_service, aggregates)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Remove the scratch aggregate files"""
+        self.workdir.cleanup()
+
+    def run(self):
+        """Replay the full duration and return the benchmark report"""
+        jobs = [(minutes * 60, getattr(self.controller, name))
+                for minutes, name in self.controller.SCHEDULE]
+        next_run = [interval for interval, _ in jobs]
+        backlog_samples = []
+
+        wall_start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            while self.clock.now() < self.duration_seconds:
+                now = self.clock.advance(TICK_SECONDS)
+                for index, (interval, job) in enumerate(jobs):
+                    if now >= next_run[index]:
+                        job()
+                        next_run[index] += interval
+                self.controller.flush_deferred_documents()
+                backlog_samples.append((now, self.doc_service.backlog()))
+        wall_elapsed = time.perf_counter() - wall_start
+
+        return self.build_report(wall_elapsed, backlog_samples)
+
+    def build_report(self, wall_elapsed, backlog_samples):
+        """Throughput, end-to-end lag percentiles and backlog growth"""
+        completions = self.doc_service.completions
+        last_done = {}
+        for filename_base, done_at in completions:
+            for prefix in DOCUMENT_PREFIXES:
+                if filename_base.startswith(prefix):
+                    record_id = filename_base[len(prefix):]
+                    last_done[record_id] = max(last_done.get(record_id, 0.0), done_at)
+                    break
+
+        lags = sorted(done_at - self.controller.arrivals[record_id]
+                      for record_id, done_at in last_done.items()
+                      if record_id in self.controller.arrivals)
+
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+        half = len(backlog_samples) // 2
+        first_half = backlog_samples[:half] or [(0, 0)]
+        second_half = backlog_samples[half:] or [(0, 0)]
+        growth_per_hour = backlog_slope(backlog_samples) * 3600
+
+        return {
+            'virtual_seconds': self.duration_seconds,
+            'wall_seconds': round(wall_elapsed, 3),
+            'speedup': round(self.duration_seconds / wall_elapsed, 1) if wall_elapsed else None,
+            'events': self.stream.position,
+            'documents': len(completions),
+            'tasks_per_wall_second': round(len(completions) / wall_elapsed, 1) if wall_elapsed else None,
+            'tasks_per_virtual_hour': round(len(completions) / self.duration_seconds * 3600, 1),
+            'lag_seconds': {
+                'p50': round(percentile(lags, 50), 1),
+                'p95': round(percentile(lags, 95), 1),
+                'max': round(lags[-1], 1) if lags else 0.0
+            },
+            'backlog': {
+                'final': backlog_samples[-1][1] if backlog_samples else 0,
+                'peak': max((size for _, size in backlog_samples), default=0),
+                'mean_first_half': round(sum(size for _, size in first_half) / len(first_half), 1),
+                'mean_second_half': round(sum(size for _, size in second_half) / len(second_half), 1),
+                'growth_per_hour': round(growth_per_hour, 1)
+            },
+            'saturated': growth_per_hour > 0 and
+                         sum(size for _, size in second_half) > 2 * sum(size for _, size in first_half)
+        }
+
+
+def main():
+    """Run one replay, or a sweep of synthetic arrival rates"""
+    parser = argparse.ArgumentParser(description='Accelerated replay simulator for the automation controller')
+    parser.add_argument('--hours', type=float, default=24, help='virtual duration to simulate')
+    parser.add_argument('--events', help='recorded JSONL event stream to replay')
+    parser.add_argument('--rates', default='20',
+                        help='comma-separated quotations per hour for synthetic sweeps')
+    parser.add_argument('--order-ratio', type=float, default=0.5, help='orders per quotation')
+    parser.add_argument('--service-time', type=float, default=0.5,
+                        help='virtual seconds to render one format')
+    parser.add_argument('--workers', type=int, default=2, help='stub document service workers')
+    args = parser.parse_args()
+
+    duration = args.hours * 3600
+    print("🧪 HIBLA AUTOMATION REPLAY SIMULATOR")
+    print("=" * 50)
+
+    if args.events:
+        runs = [(args.events, EventStream.from_file(args.events))]
+    else:
+        runs = [(f"{rate}/h", EventStream.synthetic(duration, float(rate), float(rate) * args.order_ratio))
+                for rate in args.rates.split(',')]
+
+    for label, stream in runs:
+        with AutomationSimulator(stream, duration, args.service_time, args.workers) as simulator:
+            report = simulator.run()
+        status_icon = "🔴" if report['saturated'] else "🟢"
+        print(f"\n{status_icon} Load: {label}")
+        print(f"   ⏱️ {report['virtual_seconds'] / 3600:.1f}h simulated in {report['wall_seconds']}s "
+              f"({report['speedup']}x real time)")
+        print(f"   📄 Documents: {report['documents']} from {report['events']} events "
+              f"({report['tasks_per_wall_second']}/s wall, {report['tasks_per_virtual_hour']}/h virtual)")
+        lag = report['lag_seconds']
+        print(f"   ⏳ End-to-end lag: p50 {lag['p50']}s, p95 {lag['p95']}s, max {lag['max']}s")
+        backlog = report['backlog']
+        print(f"   📈 Backlog: final {backlog['final']}, peak {backlog['peak']}, "
+              f"growth {backlog['growth_per_hour']}/h")
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,19 @@ Automation Status Report Generator
 Generates comprehensive status report for the automation system
 """
 
-import requests
 import json
-import os
 from datetime import datetime
 
+from status_engine import probe_result, run_status, service_status
+
 def generate_status_report():
     """Generate comprehensive automation status report"""
     
-    # System status checks
-    main_app_status = check_main_app()
-    doc_service_status = check_document_service()
-    document_stats = get_document_statistics()
+    # System status checks (run concurrently by the status engine)
+    status = run_status(['services', 'documents'])
+    main_app_status = check_main_app(status)
+    doc_service_status = check_document_service(status)
+    document_stats = get_document_statistics(status)
     
     # Build comprehensive report
     report = {
@@ -105,42 +106,18 @@ def generate_status_report():
     
     return report
 
-def check_main_app():
+def check_main_app(status=None):
     """Check if main application is responding"""
-    try:
-        response = requests.get('http://localhost:5000/health', timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    return service_status(status or run_status(['services']), 'main_application') == 'online'
 
-def check_document_service():
+def check_document_service(status=None):
     """Check if document service is responding"""
-    try:
-        response = requests.get('http://localhost:5001/health', timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    return service_status(status or run_status(['services']), 'document_service') == 'online'
 
-def get_document_statistics():
+def get_document_statistics(status=None):
     """Get document generation statistics"""
-    doc_dir = './documents'
-    
-    if not os.path.exists(doc_dir):
-        return {'total_count': 0, 'by_format': {}}
-    
-    files = os.listdir(doc_dir)
-    by_format = {}
-    
-    for file in files:
-        if '.' in file:
-            ext = file.split('.')[-1].lower()
-            by_format[ext] = by_format.get(ext, 0) + 1
-    
-    return {
-        'total_count': len(files),
-        'by_format': by_format,
-        'directory': doc_dir
-    }
+    status = status or run_status(['documents'])
+    return probe_result(status, 'documents', {'total_count': 0, 'by_format': {}})
 
 if __name__ == "__main__":
     print("🎯 Generating Automation Status Report...")
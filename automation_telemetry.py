@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Automation Job Telemetry
+========================
+Per-run execution telemetry for the controller's scheduled jobs.
+
+Each run of ``monitor_quotations``, ``process_pending_orders`` and
+``generate_reports`` records its start time, duration, items processed,
+errors and schedule lag into a bounded ring buffer per job. Summaries with
+p50/p95 durations and alert flags (overruns, skipped runs, consecutive
+failures) are served from a small status endpoint on port 5006.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import Flask, jsonify
+
+DEFAULT_HISTORY = 500
+STATUS_PORT = 5006
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
+
+
+class JobTelemetry:
+    """Ring buffer of run records for one scheduled job"""
+
+    def __init__(self, name, interval_seconds, history=DEFAULT_HISTORY,
+                 overrun_ratio=0.8, failure_alert_threshold=3, clock=time.time):
+        self.name = name
+        self.clock = clock
+        self.interval_seconds = interval_seconds
+        self.overrun_ratio = overrun_ratio
+        self.failure_alert_threshold = failure_alert_threshold
+        self.runs = deque(maxlen=history)
+        self.expected_at = clock() + interval_seconds
+        self.total_runs = 0
+        self.skipped_runs = 0
+        self.consecutive_failures = 0
+        self.running_since = None
+
+    def start(self):
+        """Mark a run as started and return (start, lag, skipped)"""
+        started = self.clock()
+        lag = max(0.0, started - self.expected_at)
+        skipped = int(lag // self.interval_seconds)
+        self.skipped_runs += skipped
+        self.running_since = started
+        return started, lag, skipped
+
+    def finish(self, started, lag, skipped, items, errors, error_message=None):
+        """Store a completed run"""
+        finished = self.clock()
+        duration = finished - started
+        # schedule computes the next run from when the job returns
+        self.expected_at = finished + self.interval_seconds
+        failed = errors > 0
+        self.consecutive_failures = self.consecutive_failures + 1 if failed else 0
+        self.total_runs += 1
+        self.running_since = None
+        record = {
+            'started': datetime.fromtimestamp(started).isoformat(),
+            'duration': round(duration, 4),
+            'items': items,
+            'errors': errors,
+            'lag': round(lag, 3),
+            'skipped_before': skipped,
+            'overrun': duration > self.interval_seconds * self.overrun_ratio
+        }
+        if error_message:
+            record['error'] = error_message
+        self.runs.append(record)
+        return record
+
+    def alerts(self):
+        """Alert-worthy conditions for this job"""
+        alerts = []
+        if self.consecutive_failures >= self.failure_alert_threshold:
+            alerts.append(f"{self.consecutive_failures} consecutive failed runs")
+        if self.runs and self.runs[-1]['overrun']:
+            alerts.append(f"last run took {self.runs[-1]['duration']:.1f}s of a {self.interval_seconds}s interval")
+        if self.runs and self.runs[-1]['skipped_before']:
+            alerts.append(f"{self.runs[-1]['skipped_before']} scheduled run(s) skipped before the last run")
+        if self.running_since and self.clock() - self.running_since > self.interval_seconds:
+            alerts.append(f"current run in progress for {self.clock() - self.running_since:.0f}s")
+        return alerts
+
+    def summary(self, recent=10):
+        """Aggregate statistics over the ring buffer"""
+        durations = [run['duration'] for run in self.runs]
+        lags = [run['lag'] for run in self.runs]
+        return {
+            'job': self.name,
+            'interval_seconds': self.interval_seconds,
+            'total_runs': self.total_runs,
+            'buffered_runs': len(self.runs),
+            'skipped_runs': self.skipped_runs,
+            'consecutive_failures': self.consecutive_failures,
+            'duration_p50': percentile(durations, 50),
+            'duration_p95': percentile(durations, 95),
+            'lag_p50': percentile(lags, 50),
+            'lag_p95': percentile(lags, 95),
+            'items_processed': sum(run['items'] for run in self.runs),
+            'errors': sum(run['errors'] for run in self.runs),
+            'running': self.running_since is not None,
+            'alerts': self.alerts(),
+            'recent_runs': list(self.runs)[-recent:]
+        }
+
+
+class AutomationTelemetry:
+    """Telemetry registry for all scheduled controller jobs"""
+
+    def __init__(self, history=DEFAULT_HISTORY, clock=time.time):
+        self.history = history
+        self.clock = clock
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def instrument(self, name, interval_seconds, func):
+        """Wrap a job so every run is recorded"""
+        telemetry = JobTelemetry(name, interval_seconds, self.history, clock=self.clock)
+        self.jobs[name] = telemetry
+
+        def run():
+            with self.lock:
+                started, lag, skipped = telemetry.start()
+            items, errors, error_message = 0, 0, None
+            try:
+                result = func()
+                if isinstance(result, dict):
+                    items = result.get('items', 0)
+                    errors = result.get('errors', 0)
+                    error_message = result.get('error')
+            except Exception as e:
+                errors, error_message = 1, str(e)
+            with self.lock:
+                telemetry.finish(started, lag, skipped, items, errors, error_message)
+
+        run.__name__ = name
+        return run
+
+    def snapshot(self):
+        """Summaries and alerts for every job"""
+        with self.lock:
+            jobs = {name: job.summary() for name, job in self.jobs.items()}
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'jobs': jobs,
+            'alerts': [f"{name}: {alert}" for name, job in jobs.items() for alert in job['alerts']]
+        }
+
+
+def create_status_app(controller):
+    """Flask app exposing controller telemetry"""
+    app = Flask(__name__)
+
+    @app.route('/automation/status', methods=['GET'])
+    def automation_status():
+        """Per-job telemetry, alerts and document service breaker state"""
+        status = controller.telemetry.snapshot()
+        status['running'] = controller.running
+        status['document_service'] = controller.get_breaker_metrics()
+        return jsonify(status)
+
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        """Health check for the automation controller"""
+        return jsonify({'status': 'ok', 'service': 'automation-controller'})
+
+    return app
+
+
+def start_status_server(controller, port=STATUS_PORT):
+    """Serve the status app from a daemon thread"""
+    app = create_status_app(controller)
+    server_thread = threading.Thread(
+        target=lambda: app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False),
+        daemon=True
+    )
+    server_thread.start()
+    return server_thread
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Agent Fleet Registration Load Test
+==================================
+Measures how fast a fleet of subordinate agents can be brought up through
+the agent API: one ``POST /api/agent/register`` per agent versus the bulk
+endpoints (``/register/bulk``, ``/ping/bulk``, ``/unregister/bulk``),
+which apply a whole batch in one registry transaction.
+
+Benchmark agents are named ``loadtest-<n>`` and are unregistered again at
+the end.
+
+Usage:
+    python benchmark_agent_registry.py                      # against http://localhost:5002
+    python benchmark_agent_registry.py --agents 10000 --batch 1000
+    python benchmark_agent_registry.py --local              # in-process app, throwaway registry
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import http_client
+
+DEFAULT_URL = 'http://localhost:5002'
+DEFAULT_AGENTS = 10000
+DEFAULT_BATCH = 1000
+DEFAULT_SINGLE = 500
+CAPABILITIES = [['document_generation'], ['document_generation', 'pricing'], ['quotation', 'bulk']]
+
+
+class LiveApi:
+    """POST JSON to a running agent API"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def post(self, path, body):
+        response = http_client.post(f"{self.url}{path}", json=body, timeout=(3.05, 120))
+        return response.status_code, response.json()
+
+
+class LocalApi:
+    """POST JSON to the agent API in this process (Flask test client, temporary registry)"""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='agent-loadtest-')
+        os.environ['HIBLA_AGENT_REGISTRY'] = os.path.join(self.directory, 'agent_registry.db')
+        import subordinate_agent_api
+        self.client = subordinate_agent_api.app.test_client()
+
+    def post(self, path, body):
+        response = self.client.post(path, json=body)
+        return response.status_code, response.get_json()
+
+
+def agent(n):
+    return {'agent_id': f'loadtest-{n:06d}', 'callback_url': None, 'capabilities': CAPABILITIES[n % len(CAPABILITIES)]}
+
+
+def timed(label, count, run):
+    """Run ``run()`` and print throughput for ``count`` agents"""
+    start = time.perf_counter()
+    failed = run()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<34} {count:>6} agents  {elapsed:>7.2f}s  {count / elapsed:>9.0f} agents/s"
+          f"{f'  ({failed} failed)' if failed else ''}")
+    return elapsed
+
+
+def bulk(api, path, items, batch):
+    failed = 0
+    for start in range(0, len(items), batch):
+        status, body = api.post(path, {'agents': items[start:start + batch]})
+        failed += body.get('failed', 0) if status == 200 else len(items[start:start + batch])
+    return failed
+
+
+def main():
+    """Run the fleet registration load test"""
+    parser = argparse.ArgumentParser(description='Per-agent vs bulk agent registration throughput')
+    parser.add_argument('--url', default=DEFAULT_URL)
+    parser.add_argument('--local', action='store_true', help='use the app in-process with a temporary registry')
+    parser.add_argument('--agents', type=int, default=DEFAULT_AGENTS, help='fleet size for the bulk runs')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help='agents per bulk request')
+    parser.add_argument('--single', type=int, default=DEFAULT_SINGLE, help='agents registered one call at a time')
+    args = parser.parse_args()
+
+    api = LocalApi() if args.local else LiveApi(args.url)
+    print(f"🚀 AGENT FLEET LOAD TEST - {'in-process' if args.local else args.url}")
+
+    single = [agent(n) for n in range(args.single)]
+    single_elapsed = timed('register (one call per agent)', len(single),
+                           lambda: sum(api.post('/api/agent/register', item)[0] != 200 for item in single))
+
+    fleet = [agent(n) for n in range(args.agents)]
+    ids = [item['agent_id'] for item in fleet]
+    bulk_elapsed = timed(f'register/bulk (batches of {args.batch})', len(fleet),
+                         lambda: bulk(api, '/api/agent/register/bulk', fleet, args.batch))
+    timed('ping/bulk', len(ids), lambda: bulk(api, '/api/agent/ping/bulk', ids, args.batch))
+    timed('unregister/bulk', len(ids), lambda: bulk(api, '/api/agent/unregister/bulk', ids, args.batch))
+
+    speedup = (single_elapsed / len(single)) / (bulk_elapsed / len(fleet))
+    print(f"📊 Bulk registration is {speedup:.0f}x faster per agent")
+
+
+if __name__ == "__main__":
+    main()
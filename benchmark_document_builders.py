@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Document Builder Micro-benchmark
+================================
+Times HiblaDocumentWorkflow's quotation, sales order and job order builders
+for growing item counts to confirm linear scaling up to 50k SKU lines, and
+compares against the previous per-row string concatenation.
+
+Usage:
+    python benchmark_document_builders.py
+"""
+
+import time
+
+from workflow_document_integration import HiblaDocumentWorkflow, iter_content_chunks
+
+ITEM_COUNTS = [1000, 5000, 10000, 25000, 50000]
+REPEATS = 3
+
+
+def make_items(count):
+    """Synthetic bulk order lines"""
+    return [
+        {
+            'productName': f'Premium Filipino Hair {12 + i % 20}-inch',
+            'specification': 'Natural Black, Straight' if i % 2 else 'Natural Brown, Wavy',
+            'quantity': 1 + i % 100,
+            'unitPrice': 85.0 + i % 40,
+            'lineTotal': (85.0 + i % 40) * (1 + i % 100),
+            'status': 'Queued',
+            'notes': f'Batch {i // 500}'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_concat(workflow, data):
+    """Previous row loop: one new string per appended row"""
+    content = "header"
+    for item in data['items']:
+        content += workflow._priced_item_row(item)
+    return content
+
+
+def best_of(func, *args):
+    """Best wall time over REPEATS runs"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the builder benchmark"""
+    workflow = HiblaDocumentWorkflow()
+    builders = [
+        ('quotation', workflow._build_quotation_content),
+        ('sales_order', workflow._build_sales_order_content),
+        ('job_order', workflow._build_job_order_content),
+        ('streamed_chunks', lambda data: sum(1 for _ in iter_content_chunks(workflow._iter_quotation_content(data)))),
+        ('legacy_concat', lambda data: legacy_concat(workflow, data))
+    ]
+
+    print("⏱️ DOCUMENT BUILDER BENCHMARK")
+    print("=" * 60)
+    header = f"{'items':>8} " + ' '.join(f"{name:>16}" for name, _ in builders)
+    print(header)
+
+    per_item = {name: [] for name, _ in builders}
+    for count in ITEM_COUNTS:
+        data = {'items': make_items(count)}
+        timings = []
+        for name, builder in builders:
+            elapsed = best_of(builder, data)
+            per_item[name].append(elapsed / count * 1e6)
+            timings.append(f"{elapsed * 1000:>14.1f}ms")
+        print(f"{count:>8} " + ' '.join(timings))
+
+    print("\n📈 Microseconds per item (flat means linear scaling):")
+    for name, values in per_item.items():
+        ratio = values[-1] / values[0] if values[0] else 0
+        print(f"   {name:>16}: " + ', '.join(f"{value:.2f}" for value in values) +
+              f"  (50k/1k ratio {ratio:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Handshake Benchmark
+===============================
+Compares a fresh connection per call (the old ``requests.get`` pattern)
+with the shared keep-alive client from http_client.py against the local
+Hibla services, and reports the per-request latency saved by reusing
+connections.
+
+Services that are not running are skipped.
+
+Usage:
+    python benchmark_http_client.py
+    python benchmark_http_client.py --requests 500 --url https://ai.innovatehub.ph/mcp/t-0/sse
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from health_prober import SERVICES
+from http_client import HttpClient
+
+DEFAULT_REQUESTS = 200
+TIMEOUT = (2, 5)
+
+
+def time_calls(call, url, count):
+    """Per-request latencies in milliseconds"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = call(url)
+        response.content  # read the body so the connection goes back to the pool
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def fresh_connection(url):
+    """Old pattern: module-level requests call, new TCP (and TLS) handshake every time"""
+    return requests.get(url, timeout=TIMEOUT)
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return {
+        'mean': statistics.mean(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[int(len(latencies) * 0.95) - 1]
+    }
+
+
+def main():
+    """Run the handshake benchmark"""
+    parser = argparse.ArgumentParser(description='Fresh connection vs pooled client latency')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='requests per target and mode')
+    parser.add_argument('--url', action='append', default=[], help='extra URL to benchmark (repeatable)')
+    args = parser.parse_args()
+
+    targets = [(name, f"{url}/health") for name, url in SERVICES.items()]
+    targets += [(url, url) for url in args.url]
+    client = HttpClient(connect_timeout=TIMEOUT[0], read_timeout=TIMEOUT[1], retries=0)
+
+    print("🔌 HTTP CLIENT HANDSHAKE BENCHMARK")
+    print("=" * 78)
+    print(f"{args.requests} sequential requests per mode\n")
+    print(f"{'target':<20} {'fresh mean':>11} {'pooled mean':>12} {'fresh p95':>10} {'pooled p95':>11} {'saved':>9}")
+    print("-" * 78)
+
+    measured = 0
+    for name, url in targets:
+        try:
+            client.get(url).content  # warm-up: opens the pooled connection
+        except requests.RequestException as e:
+            print(f"{name:<20} skipped ({type(e).__name__})")
+            continue
+
+        fresh = summarize(time_calls(fresh_connection, url, args.requests))
+        pooled = summarize(time_calls(client.get, url, args.requests))
+        saved = fresh['mean'] - pooled['mean']
+        print(f"{name:<20} {fresh['mean']:>9.2f}ms {pooled['mean']:>10.2f}ms "
+              f"{fresh['p95']:>8.2f}ms {pooled['p95']:>9.2f}ms {saved:>7.2f}ms")
+        measured += 1
+
+    client.close()
+    if not measured:
+        print("\n⚠️ No services reachable - start the Hibla services and rerun")
+    else:
+        print(f"\n📊 Client stats: {client.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Bulk Historical Re-render
+=========================
+Re-renders every quotation, sales order and job order stored in the main
+application through HiblaDocumentWorkflow, e.g. after a branding change.
+
+Records are paged from the main API in ascending (createdAt, id) order with
+a keyset cursor (``?limit=&after=<last id>&after_created_at=``) and flow
+through a three-stage pipeline - page listing, detail fetch + payload
+build, and document rendering - joined by bounded queues, so memory stays
+flat no matter how many records exist. Progress is checkpointed to a JSON
+file after every completed page as the cursor of the last contiguous
+record that finished; records created while a run is paused sort after
+it, so a resume neither skips nor repeats work. Throughput and ETA are
+printed as it goes.
+
+Usage:
+    python bulk_rerender.py --token <api token>
+    python bulk_rerender.py --email admin@hibla.com --password ... --types quotation
+    python bulk_rerender.py --reset
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import requests
+
+from http_client import HttpClient
+from workflow_document_integration import HiblaDocumentWorkflow
+
+CHECKPOINT_PATH = 'bulk_rerender_checkpoint.json'
+DEFAULT_PAGE_SIZE = 100
+MAX_RECORDED_FAILURES = 1000
+PROGRESS_INTERVAL = 5.0
+_DONE = object()
+
+
+def _number(value):
+    """Decimal strings from the API as floats for the document builders"""
+    try:
+        return float(value) if value not in (None, '') else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _date(value):
+    return value[:10] if isinstance(value, str) else None
+
+
+def _cursor(row):
+    """Keyset position of a listed record"""
+    return {'id': row['id'], 'createdAt': row.get('createdAt')}
+
+
+def _sort_key(row):
+    return (row.get('createdAt') or '', row['id'])
+
+
+def _priced_items(items):
+    return [
+        {
+            'productName': item.get('productName', 'Product'),
+            'specification': item.get('specification') or 'Standard',
+            'quantity': _number(item.get('quantity')),
+            'unitPrice': _number(item.get('unitPrice')),
+            'lineTotal': _number(item.get('lineTotal'))
+        }
+        for item in items
+    ]
+
+
+class RerenderCheckpoint:
+    """Resumable per-type progress: cursor of the last contiguous finished record plus failures"""
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.state = {}
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.state = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def entry(self, kind):
+        entry = self.state.setdefault(kind, {'after': None, 'position': 0, 'rendered': 0, 'failed': [],
+                                             'complete': False})
+        if 'after' not in entry:
+            # Offsets into the old newest-first listing cannot be resumed safely
+            entry.pop('offset', None)
+            entry.update(after=None, position=0, rendered=0)
+        return entry
+
+    def advance(self, kind, after, position, rendered, failures):
+        entry = self.entry(kind)
+        entry['after'] = after
+        entry['position'] = position
+        entry['rendered'] += rendered
+        entry['failed'] = (entry['failed'] + failures)[-MAX_RECORDED_FAILURES:]
+        self.save()
+
+    def mark_complete(self, kind):
+        self.entry(kind)['complete'] = True
+        self.save()
+
+
+class BulkRerenderer(HiblaDocumentWorkflow):
+    """Paged fetch -> build -> render pipeline over the main application's records"""
+
+    KINDS = {
+        'quotation': '/api/quotations',
+        'sales_order': '/api/sales-orders',
+        'job_order': '/api/job-orders'
+    }
+
+    def __init__(self, doc_service_url="http://localhost:5001", main_api_url="http://localhost:5000",
+                 token=None, page_size=DEFAULT_PAGE_SIZE, fetch_workers=4, render_workers=4,
+                 checkpoint=None):
+        super().__init__(doc_service_url, main_api_url)
+        self.page_size = page_size
+        self.fetch_workers = fetch_workers
+        self.render_workers = render_workers
+        self.checkpoint = checkpoint or RerenderCheckpoint()
+        self.http = HttpClient(pool_maxsize=fetch_workers + render_workers + 1)
+        # Main API credentials only; the document service gets no token
+        self.auth_headers = {'Authorization': f'Bearer {token}'} if token else {}
+        self.stop_event = threading.Event()
+
+    def login(self, email, password):
+        """Exchange credentials for a bearer token"""
+        response = self.http.post(f"{self.main_api_url}/api/auth/login",
+                                  json={'email': email, 'password': password}, timeout=10)
+        response.raise_for_status()
+        self.auth_headers = {'Authorization': f"Bearer {response.json()['token']}"}
+
+    def api_get(self, path, params=None):
+        response = self.http.get(f"{self.main_api_url}{path}", params=params, headers=self.auth_headers,
+                                 timeout=(5, 30))
+        response.raise_for_status()
+        return response
+
+    def iter_pages(self, kind, after):
+        """Yield (rows, total) pages in ascending (createdAt, id) order after the cursor"""
+        path = self.KINDS[kind]
+        while not self.stop_event.is_set():
+            params = {'limit': self.page_size}
+            if after:
+                params.update(after=after['id'], after_created_at=after.get('createdAt') or '')
+            response = self.api_get(path, params)
+            rows = response.json()
+            if response.headers.get('X-Paging') != 'keyset':
+                # Server without paging support returned the full list: order it once and page locally
+                yield from self._local_pages(rows, after)
+                return
+            if not rows:
+                return
+            total = response.headers.get('X-Total-Count')
+            yield rows, int(total) if total is not None else None
+            after = _cursor(rows[-1])
+
+    def _local_pages(self, rows, after):
+        total = len(rows)
+        rows = sorted(rows, key=_sort_key)
+        if after:
+            rows = [row for row in rows if _sort_key(row) > _sort_key(after)]
+        for start in range(0, len(rows), self.page_size):
+            if self.stop_event.is_set():
+                return
+            yield rows[start:start + self.page_size], total
+
+    def build_payload(self, kind, summary):
+        """Fetch one record's detail and map it to the workflow builder's payload"""
+        record_id = summary['id']
+        if kind == 'quotation':
+            detail = self.api_get(f"/api/quotations/{record_id}").json()
+            items = self.api_get(f"/api/quotations/{record_id}/items").json()
+            return {
+                'quotationNumber': detail.get('number', record_id),
+                'revisionNumber': detail.get('revisionNumber', 'R0'),
+                'customerCode': detail.get('clientCode'),
+                'customerName': detail.get('clientName'),
+                'country': detail.get('country'),
+                'priceTier': detail.get('priceListName'),
+                'items': _priced_items(items),
+                'subtotal': _number(detail.get('subtotal')),
+                'shippingFee': _number(detail.get('shippingFee')),
+                'bankCharge': _number(detail.get('bankCharge')),
+                'discount': _number(detail.get('discount')),
+                'total': _number(detail.get('total')),
+                'paymentMethod': detail.get('paymentMethod'),
+                'shippingMethod': detail.get('shippingMethod'),
+                'creatorInitials': detail.get('createdByInitials'),
+                'customerServiceInstructions': detail.get('clientServiceInstructions') or None
+            }
+
+        if kind == 'sales_order':
+            detail = self.api_get(f"/api/sales-orders/{record_id}").json()
+            items = self.api_get(f"/api/sales-orders/{record_id}/items").json()
+            return {
+                'salesOrderNumber': detail.get('salesOrderNumber', record_id),
+                'customerCode': detail.get('clientCode'),
+                'customerName': summary.get('clientName'),
+                'country': detail.get('country'),
+                'items': _priced_items(items),
+                'subtotal': _number(detail.get('subtotal')),
+                'shippingFee': _number(detail.get('shippingChargeUsd')),
+                'bankCharge': _number(detail.get('bankChargeUsd')),
+                'discount': _number(detail.get('discountUsd')),
+                'total': _number(detail.get('pleasePayThisAmountUsd')),
+                'status': (detail.get('status') or 'draft').capitalize(),
+                'paymentStatus': 'Confirmed' if detail.get('isConfirmed') else 'Pending'
+            }
+
+        items = self.api_get(f"/api/job-order-items/{record_id}").json()
+        sales_order_number = summary.get('salesOrderId')
+        if sales_order_number:
+            try:
+                sales_order_number = self.api_get(f"/api/sales-orders/{sales_order_number}").json().get(
+                    'salesOrderNumber', sales_order_number)
+            except requests.RequestException:
+                pass
+        return {
+            'jobOrderNumber': summary.get('jobOrderNumber', record_id),
+            'salesOrderNumber': sales_order_number,
+            'customerName': summary.get('clientCode'),
+            'dueDate': _date(summary.get('dueDate')),
+            'startDate': _date(summary.get('productionDate')),
+            'items': [
+                {
+                    'productName': item.get('productName', 'Product'),
+                    'specification': item.get('specification') or 'Standard',
+                    'quantity': _number(item.get('quantity')),
+                    'status': 'Shipped' if item.get('shippedAt') else 'Pending',
+                    'notes': item.get('notes') or '-'
+                }
+                for item in items
+            ],
+            'qcNotes': summary.get('orderInstructions') or None
+        }
+
+    def render(self, kind, payload):
+        generate = getattr(self, f"generate_{kind}_document")
+        return generate({key: value for key, value in payload.items() if value is not None})
+
+    def _page_stage(self, kind, after, fetch_queue, progress):
+        position = 0
+        try:
+            for rows, total in self.iter_pages(kind, after):
+                if total is not None:
+                    progress['total'] = total
+                for row in rows:
+                    fetch_queue.put((position, row))
+                    position += 1
+        except Exception as e:
+            progress['error'] = f"listing failed after {position} records: {e}"
+        finally:
+            for _ in range(self.fetch_workers):
+                fetch_queue.put(_DONE)
+
+    def _fetch_stage(self, kind, fetch_queue, render_queue, results):
+        while True:
+            task = fetch_queue.get()
+            if task is _DONE:
+                return
+            position, summary = task
+            if self.stop_event.is_set():
+                continue
+            # Every record must come out as a result, or the checkpoint watermark stalls behind it
+            try:
+                payload = self.build_payload(kind, summary)
+            except Exception as e:
+                results.put((position, _cursor(summary), False, f"fetch failed: {e!r}"))
+            else:
+                render_queue.put((position, _cursor(summary), payload))
+
+    def _render_stage(self, kind, render_queue, results):
+        while True:
+            task = render_queue.get()
+            if task is _DONE:
+                return
+            position, cursor, payload = task
+            try:
+                paths = self.render(kind, payload)
+            except Exception as e:
+                results.put((position, cursor, False, f"render failed: {e!r}"))
+            else:
+                results.put((position, cursor, bool(paths), None if paths else "render failed"))
+
+    def rerender(self, kind):
+        """Re-render every record of one kind, resuming from the checkpoint"""
+        entry = self.checkpoint.entry(kind)
+        if entry['complete']:
+            print(f"⏭️ {kind}: already complete ({entry['rendered']} rendered)")
+            return entry
+
+        start_after = entry['after']
+        start_position = entry['position']
+        window = self.page_size * 2
+        fetch_queue = queue.Queue(maxsize=window)
+        render_queue = queue.Queue(maxsize=window)
+        results = queue.Queue()
+        progress = {'total': None, 'error': None}
+
+        stages = [threading.Thread(target=self._page_stage, args=(kind, start_after, fetch_queue, progress),
+                                   daemon=True)]
+        stages += [threading.Thread(target=self._fetch_stage, args=(kind, fetch_queue, render_queue, results),
+                                    daemon=True) for _ in range(self.fetch_workers)]
+        renderers = [threading.Thread(target=self._render_stage, args=(kind, render_queue, results), daemon=True)
+                     for _ in range(self.render_workers)]
+        for thread in stages + renderers:
+            thread.start()
+
+        # Positions count records listed in this run; the watermark is the first one not yet finished
+        watermark = 0
+        after = start_after
+        completed = {}
+        processed = 0
+        started = time.perf_counter()
+        last_report = started
+        print(f"\n🔁 {kind}: resuming after record {start_position} ({start_after['id']})" if start_after
+              else f"\n🔁 {kind}: starting")
+
+        renderers_stopping = False
+        while any(thread.is_alive() for thread in stages + renderers) or not results.empty():
+            if not renderers_stopping and not any(thread.is_alive() for thread in stages):
+                renderers_stopping = True
+                for _ in renderers:
+                    render_queue.put(_DONE)
+            try:
+                position, cursor, ok, error = results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            completed[position] = (cursor, ok, error)
+            processed += 1
+
+            # Only records below the contiguous watermark are checkpointed, so a resume never skips work
+            rendered, failures = 0, []
+            page = watermark // self.page_size
+            while watermark in completed:
+                cursor, ok, error = completed.pop(watermark)
+                if ok:
+                    rendered += 1
+                else:
+                    failures.append({'id': cursor['id'], 'error': error})
+                after = cursor
+                watermark += 1
+            if rendered or failures:
+                if watermark // self.page_size > page or failures:
+                    self.checkpoint.advance(kind, after, start_position + watermark, rendered, failures)
+                else:
+                    entry['after'] = after
+                    entry['position'] = start_position + watermark
+                    entry['rendered'] += rendered
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                self.print_progress(kind, start_position + watermark, processed, now - started, progress['total'])
+
+        position = start_position + watermark
+        self.checkpoint.advance(kind, after, position, 0, [])
+        if progress['error'] or self.stop_event.is_set():
+            print(f"⚠️ {kind}: stopped at record {position}: {progress['error'] or 'interrupted'}")
+        else:
+            self.checkpoint.mark_complete(kind)
+            self.print_progress(kind, position, processed, time.perf_counter() - started, progress['total'])
+        return entry
+
+    def print_progress(self, kind, position, processed, elapsed, total):
+        rate = processed / elapsed if elapsed else 0.0
+        line = f"   📄 {kind}: {position}"
+        if total:
+            remaining = max(0, total - position)
+            eta = remaining / rate if rate else float('inf')
+            line += f"/{total} ({position / total:.0%}), ETA {eta:.0f}s" if rate else f"/{total}"
+        print(f"{line} - {rate:.1f} records/s")
+
+    def close(self):
+        self.http.close()
+
+
+def main():
+    """Re-render historical documents from the main application"""
+    parser = argparse.ArgumentParser(description='Bulk re-render quotations, sales orders and job orders')
+    parser.add_argument('--types', default='quotation,sales_order,job_order',
+                        help='comma-separated record types to re-render')
+    parser.add_argument('--token', default=os.environ.get('HIBLA_API_TOKEN'), help='main API bearer token')
+    parser.add_argument('--email', help='login email (instead of --token)')
+    parser.add_argument('--password', help='login password')
+    parser.add_argument('--main-api', default='http://localhost:5000')
+    parser.add_argument('--doc-service', default='http://localhost:5001')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--fetch-workers', type=int, default=4)
+    parser.add_argument('--render-workers', type=int, default=4)
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH)
+    parser.add_argument('--reset', action='store_true', help='discard the checkpoint and start over')
+    args = parser.parse_args()
+
+    print("🚀 Hibla Bulk Document Re-render")
+    print("=" * 60)
+
+    checkpoint = RerenderCheckpoint(args.checkpoint)
+    if args.reset:
+        checkpoint.reset()
+
+    rerenderer = BulkRerenderer(args.doc_service, args.main_api, args.token, args.page_size,
+                                args.fetch_workers, args.render_workers, checkpoint)
+    try:
+        if args.email:
+            rerenderer.login(args.email, args.password)
+        for kind in args.types.split(','):
+            if kind not in BulkRerenderer.KINDS:
+                print(f"❌ Unknown record type: {kind}")
+                continue
+            rerenderer.rerender(kind)
+    except KeyboardInterrupt:
+        rerenderer.stop_event.set()
+        checkpoint.save()
+        print("\n⏸️ Interrupted - progress saved, rerun to resume")
+    finally:
+        rerenderer.close()
+
+    print("\n📊 Summary:")
+    for kind, entry in checkpoint.state.items():
+        status_icon = "✅" if entry['complete'] else "⏸️"
+        print(f"   {status_icon} {kind}: {entry['rendered']} rendered, {len(entry['failed'])} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Agent Capability Index
+======================
+Inverted index from capability to the set of agents that declared it,
+used to route work to subordinate agents without scanning every agent.
+
+Each agent gets a small integer slot; every capability maps to a Python
+int used as a bitset over slots. A multi-capability query is the AND of
+k bitsets, and agents are also bucketed by reported load, so picking the
+least-loaded match is one AND per distinct load level. Ties within the
+lowest load level are broken round-robin from the last slot routed to.
+
+Not thread-safe on its own; AgentRegistry guards it with its lock.
+"""
+
+
+def _lowest_bit_index(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+class CapabilityIndex:
+    """capability -> bitset of agent slots, with load buckets for tie-breaking"""
+
+    def __init__(self):
+        self.slots = {}          # agent_id -> slot
+        self.agents = []         # slot -> agent_id (None when free)
+        self.free_slots = []
+        self.capabilities = {}   # agent_id -> frozenset of capabilities
+        self.by_capability = {}  # capability -> bitset
+        self.loads = {}          # agent_id -> load
+        self.by_load = {}        # load -> bitset
+        self.all_agents = 0
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, agent_id):
+        return agent_id in self.slots
+
+    def add(self, agent_id, capabilities, load=0):
+        """Index an agent, replacing its previous capabilities and load"""
+        capabilities = frozenset(capabilities or [])
+        if agent_id in self.slots:
+            if self.capabilities[agent_id] == capabilities:
+                self.set_load(agent_id, load)
+                return
+            self.remove(agent_id)
+
+        slot = self.free_slots.pop() if self.free_slots else len(self.agents)
+        if slot == len(self.agents):
+            self.agents.append(agent_id)
+        else:
+            self.agents[slot] = agent_id
+        self.slots[agent_id] = slot
+        self.capabilities[agent_id] = capabilities
+
+        bit = 1 << slot
+        self.all_agents |= bit
+        for capability in capabilities:
+            self.by_capability[capability] = self.by_capability.get(capability, 0) | bit
+        self.loads[agent_id] = load
+        self.by_load[load] = self.by_load.get(load, 0) | bit
+
+    def remove(self, agent_id):
+        """Drop an agent from every bitset; True when it was indexed"""
+        slot = self.slots.pop(agent_id, None)
+        if slot is None:
+            return False
+        clear = ~(1 << slot)
+        self.all_agents &= clear
+        for capability in self.capabilities.pop(agent_id):
+            remaining = self.by_capability[capability] & clear
+            if remaining:
+                self.by_capability[capability] = remaining
+            else:
+                del self.by_capability[capability]
+        self._clear_load(agent_id, clear)
+        self.agents[slot] = None
+        self.free_slots.append(slot)
+        return True
+
+    def _clear_load(self, agent_id, clear):
+        load = self.loads.pop(agent_id)
+        remaining = self.by_load[load] & clear
+        if remaining:
+            self.by_load[load] = remaining
+        else:
+            del self.by_load[load]
+
+    def set_load(self, agent_id, load):
+        """Move an agent to another load bucket"""
+        slot = self.slots.get(agent_id)
+        if slot is None or self.loads[agent_id] == load:
+            return
+        self._clear_load(agent_id, ~(1 << slot))
+        self.loads[agent_id] = load
+        self.by_load[load] = self.by_load.get(load, 0) | (1 << slot)
+
+    def match(self, required):
+        """Bitset of agents declaring every required capability"""
+        mask = self.all_agents
+        for capability in required:
+            mask &= self.by_capability.get(capability, 0)
+            if not mask:
+                break
+        return mask
+
+    def agents_in(self, mask):
+        """agent_ids for the set bits of a mask"""
+        agents = []
+        while mask:
+            low = mask & -mask
+            agents.append(self.agents[low.bit_length() - 1])
+            mask ^= low
+        return agents
+
+    def count(self, mask):
+        return bin(mask).count('1')
+
+    def route(self, required):
+        """(agent_id, candidate count) for the least-loaded matching agent, or (None, 0)"""
+        candidates = self.match(required)
+        if not candidates:
+            return None, 0
+        for load in sorted(self.by_load):
+            pool = candidates & self.by_load[load]
+            if pool:
+                break
+        # Round-robin among equally loaded agents: first slot after the last one routed to
+        after = pool >> self.cursor << self.cursor
+        slot = _lowest_bit_index(after if after else pool)
+        self.cursor = slot + 1
+        return self.agents[slot], self.count(candidates)
+
+    def stats(self):
+        return {
+            'agents': len(self.slots),
+            'capabilities': {capability: self.count(mask) for capability, mask in sorted(self.by_capability.items())},
+            'load_levels': {load: self.count(mask) for load, mask in sorted(self.by_load.items())}
+        }
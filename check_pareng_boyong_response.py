@@ -5,12 +5,13 @@ Check for Pareng Boyong Response
 Monitor all communication channels for response
 """
 
-import requests
 import json
 import time
 import os
 from datetime import datetime
 
+import http_client
+
 def check_all_response_channels():
     """Check all possible response channels"""
     
@@ -52,7 +53,7 @@ def check_all_response_channels():
             'User-Agent': 'Hibla-Response-Checker/1.0'
         }
         
-        response = requests.get(
+        response = http_client.get(
             'https://ai.innovatehub.ph/mcp/t-0/sse',
             headers=headers,
             timeout=5,
@@ -116,7 +117,7 @@ def check_all_response_channels():
     # Channel 4: Check local agent interface
     print(f"\n🔧 Channel 4: Local Agent Interface")
     try:
-        response = requests.get('http://localhost:5003/mcp/messages', timeout=5)
+        response = http_client.get('http://localhost:5003/mcp/messages', timeout=5)
         if response.status_code == 200:
             message_data = response.json()
             print(f"   ✅ Local interface active")
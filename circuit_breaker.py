@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker
+===============
+Guards calls to a downstream service (e.g. the document service on port 5001).
+
+The breaker opens after ``failure_threshold`` consecutive failures, stays
+open for a jittered exponential backoff, then half-opens and lets a limited
+number of probe requests through. A successful probe closes it again; a
+failed probe re-opens it with a longer backoff. State transitions are
+counted and kept in a short log so they can be exposed as metrics.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with jittered exponential backoff"""
+
+    def __init__(self, name, failure_threshold=5, base_delay=5.0, max_delay=300.0,
+                 half_open_probes=1, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.lock = threading.Lock()
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.opened_until = 0.0
+        self.probes_in_flight = 0
+
+        self.transitions = {}
+        self.transition_log = deque(maxlen=100)
+        self.calls = {'success': 0, 'failure': 0, 'rejected': 0}
+
+    def _transition(self, new_state):
+        """Record a state change (caller holds the lock)"""
+        if new_state == self.state:
+            return
+        key = f"{self.state}->{new_state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.transition_log.append({
+            'timestamp': datetime.now().isoformat(),
+            'from': self.state,
+            'to': new_state,
+            'consecutive_failures': self.consecutive_failures
+        })
+        self.state = new_state
+
+    def _backoff(self):
+        """Jittered exponential backoff for the current open streak"""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(self.open_count - 1, 0)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def allow_request(self):
+        """Return True if a call may proceed now"""
+        with self.lock:
+            if self.state == OPEN:
+                if self.clock() < self.opened_until:
+                    self.calls['rejected'] += 1
+                    return False
+                self._transition(HALF_OPEN)
+                self.probes_in_flight = 0
+
+            if self.state == HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    self.calls['rejected'] += 1
+                    return False
+                self.probes_in_flight += 1
+
+            return True
+
+    def is_available(self):
+        """Return True if allow_request() would currently admit a call"""
+        with self.lock:
+            if self.state == OPEN:
+                return self.clock() >= self.opened_until
+            if self.state == HALF_OPEN:
+                return self.probes_in_flight < self.half_open_probes
+            return True
+
+    def retry_in(self):
+        """Seconds until the breaker will admit a probe"""
+        with self.lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.opened_until - self.clock())
+
+    def record_success(self):
+        """Report a successful call"""
+        with self.lock:
+            self.calls['success'] += 1
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+                self.open_count = 0
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """Report a failed call"""
+        with self.lock:
+            self.calls['failure'] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.probes_in_flight = 0
+                self.open_count += 1
+                self.opened_until = self.clock() + self._backoff()
+                self._transition(OPEN)
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError when rejected"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_in())
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def get_metrics(self):
+        """Breaker state, call counters and state transitions"""
+        with self.lock:
+            return {
+                'name': self.name,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in_seconds': max(0.0, self.opened_until - self.clock()) if self.state == OPEN else 0.0,
+                'calls': dict(self.calls),
+                'transitions': dict(self.transitions),
+                'recent_transitions': list(self.transition_log)[-10:]
+            }
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Async Document Forwarder
+========================
+Accepts agent document requests without holding a Flask worker for the
+render, forwards them to the document service from an asyncio loop on a
+background thread, and delivers each result to the agent's registered
+``callback_url``.
+
+- Renders run under a concurrency limit on a bounded thread pool using the
+  shared pooled HTTP client (the project has no async HTTP dependency).
+- Results bound for the same callback host are batched for up to
+  ``batch_window`` seconds (or ``max_batch`` results) and POSTed together as
+  ``{"event": "document_results", "results": [...]}``; one batch per host is
+  in flight at a time, with a global cap on concurrent callback POSTs.
+- Only a 2xx response counts as delivered. Server errors and connection
+  failures are retried with jittered exponential backoff; any other status
+  (a 4xx will not get better) fails the callback at once. Results stay
+  pollable at ``/api/agent/document/jobs/<job_id>`` either way.
+- Job records are written through to an ``agent_jobs`` table in the shared
+  registry database (SQLite, WAL), so any API worker can answer a poll for
+  a job another worker accepted. The newest ``MAX_TRACKED_JOBS`` are kept.
+- Subscribers (``subscribe``) see every finished job, e.g. to push it to a
+  connected agent.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+
+import http_client
+from agent_registry import DEFAULT_REGISTRY_PATH
+
+RENDER_CONCURRENCY = 8
+CALLBACK_CONCURRENCY = 16
+CALLBACK_RETRIES = 3
+CALLBACK_TIMEOUT = (3.05, 10)
+BATCH_WINDOW = 0.25
+MAX_BATCH = 50
+MAX_TRACKED_JOBS = 10000
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    job TEXT NOT NULL
+);
+"""
+
+
+class JobTable:
+    """Job records shared by every API worker through SQLite"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH, max_jobs=MAX_TRACKED_JOBS):
+        self.path = path
+        self.max_jobs = max_jobs
+        self.lock = threading.Lock()
+        self.db = None
+        self.pid = None
+
+    def _connection(self):
+        # A connection inherited across fork() must not be reused by the child
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute('PRAGMA busy_timeout=5000')
+            self.db.executescript(JOBS_SCHEMA)
+            self.pid = os.getpid()
+        return self.db
+
+    def insert(self, job):
+        """Store a new job and drop the oldest beyond ``max_jobs``"""
+        with self.lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                job_row = db.execute('INSERT INTO agent_jobs (job_id, job) VALUES (?, ?)',
+                                     (job['job_id'], json.dumps(job))).lastrowid
+                db.execute('DELETE FROM agent_jobs WHERE id <= ?', (job_row - self.max_jobs,))
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+
+    def update(self, job):
+        with self.lock:
+            self._connection().execute('UPDATE agent_jobs SET job = ? WHERE job_id = ?',
+                                       (json.dumps(job), job['job_id']))
+
+    def get(self, job_id):
+        with self.lock:
+            row = self._connection().execute('SELECT job FROM agent_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+class DocumentForwarder:
+    """Background render queue with batched, retried callback delivery"""
+
+    def __init__(self, render_concurrency=RENDER_CONCURRENCY, callback_concurrency=CALLBACK_CONCURRENCY,
+                 callback_retries=CALLBACK_RETRIES, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 job_table=None):
+        self.render_concurrency = render_concurrency
+        self.callback_concurrency = callback_concurrency
+        self.callback_retries = callback_retries
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.lock = threading.Lock()
+        self.job_table = job_table or JobTable()
+        self.listeners = []
+        self.stats = {'accepted': 0, 'completed': 0, 'failed': 0, 'callbacks_sent': 0,
+                      'callback_batches': 0, 'callback_retries': 0, 'callbacks_failed': 0}
+        self.loop = None
+        self.thread = None
+        self.executor = None
+
+    def start(self):
+        """Run the event loop on a daemon thread (once per process)"""
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return self
+            self.loop = asyncio.new_event_loop()
+            self.executor = ThreadPoolExecutor(max_workers=self.render_concurrency + self.callback_concurrency,
+                                               thread_name_prefix='doc-forward')
+            started = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(started,), name='doc-forwarder', daemon=True)
+            self.thread.start()
+        started.wait()
+        return self
+
+    def _run(self, started):
+        asyncio.set_event_loop(self.loop)
+        self.render_slots = asyncio.Semaphore(self.render_concurrency)
+        self.callback_slots = asyncio.Semaphore(self.callback_concurrency)
+        self.pending = {}   # callback host -> list of (job, callback payload)
+        self.flushers = {}  # callback host -> flush task
+        self.loop.call_soon(started.set)
+        self.loop.run_forever()
+
+    def submit(self, agent_id, callback_url, render):
+        """Queue ``render()`` (blocking, returns a result dict) and return the job record"""
+        self.start()
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'agent_id': agent_id,
+            'status': 'accepted',
+            'callback_url': callback_url,
+            'accepted_at': datetime.now().isoformat()
+        }
+        self.job_table.insert(job)
+        with self.lock:
+            self.stats['accepted'] += 1
+        asyncio.run_coroutine_threadsafe(self._process(job, render), self.loop)
+        return dict(job)
+
+    def subscribe(self, listener):
+        """Call ``listener(job)`` with a copy of every job once it completes or fails"""
+        self.listeners.append(listener)
+
+    def get_job(self, job_id):
+        """Job record from any worker, or None when unknown or pruned"""
+        return self.job_table.get(job_id)
+
+    def _update(self, job, **fields):
+        with self.lock:
+            job.update(fields)
+            snapshot = dict(job)
+        try:
+            self.job_table.update(snapshot)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not store job {job['job_id']}: {e}")
+
+    async def _process(self, job, render):
+        async with self.render_slots:
+            self._update(job, status='rendering')
+            try:
+                result = await self.loop.run_in_executor(self.executor, render)
+            except Exception as e:
+                result = {'error': str(e)}
+
+        failed = 'error' in result
+        self._update(job, status='failed' if failed else 'completed', result=result,
+                     completed_at=datetime.now().isoformat())
+        with self.lock:
+            self.stats['failed' if failed else 'completed'] += 1
+            finished = dict(job)
+        for listener in list(self.listeners):
+            try:
+                listener(finished)
+            except Exception as e:
+                print(f"⚠️ Job listener failed: {e}")
+
+        if job['callback_url']:
+            self._enqueue_callback(job)
+
+    def _enqueue_callback(self, job):
+        host = urlsplit(job['callback_url']).netloc
+        payload = {key: job.get(key) for key in ('job_id', 'agent_id', 'status', 'result', 'completed_at')}
+        self.pending.setdefault(host, []).append((job, payload))
+        if host not in self.flushers:
+            self.flushers[host] = self.loop.create_task(self._flush_host(host))
+
+    async def _flush_host(self, host):
+        """Deliver everything queued for one callback host, one batch at a time"""
+        try:
+            while self.pending.get(host):
+                if len(self.pending[host]) < self.max_batch:
+                    await asyncio.sleep(self.batch_window)
+                batch = self.pending[host][:self.max_batch]
+                del self.pending[host][:self.max_batch]
+                # One POST per callback URL in the batch (agents on a host may use different paths)
+                by_url = OrderedDict()
+                for job, payload in batch:
+                    by_url.setdefault(job['callback_url'], []).append((job, payload))
+                await asyncio.gather(*(self._deliver(url, entries) for url, entries in by_url.items()))
+        finally:
+            self.flushers.pop(host, None)
+            if self.pending.get(host):
+                self.flushers[host] = self.loop.create_task(self._flush_host(host))
+            else:
+                self.pending.pop(host, None)
+
+    async def _deliver(self, url, entries):
+        body = {'event': 'document_results', 'results': [payload for _, payload in entries]}
+        error = None
+        for attempt in range(self.callback_retries + 1):
+            async with self.callback_slots:
+                try:
+                    response = await self.loop.run_in_executor(
+                        self.executor, lambda: http_client.post(url, json=body, timeout=CALLBACK_TIMEOUT, retries=0))
+                    status = response.status_code
+                    error = None if 200 <= status < 300 else f"HTTP {status}"
+                except requests.RequestException as e:
+                    status, error = None, type(e).__name__
+            if error is None:
+                for job, _ in entries:
+                    self._update(job, callback='delivered')
+                with self.lock:
+                    self.stats['callbacks_sent'] += len(entries)
+                    self.stats['callback_batches'] += 1
+                return
+            if status is not None and status < 500:
+                # A 4xx will not get better on retry; only server and connection errors are retried
+                break
+            if attempt < self.callback_retries:
+                with self.lock:
+                    self.stats['callback_retries'] += 1
+                await asyncio.sleep(random.uniform(0, min(10.0, 0.5 * (2 ** attempt))))
+
+        for job, _ in entries:
+            self._update(job, callback='failed', callback_error=error)
+        with self.lock:
+            self.stats['callbacks_failed'] += len(entries)
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        stats['in_progress'] = stats['accepted'] - stats['completed'] - stats['failed']
+        return stats
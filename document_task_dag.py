@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Document Task DAG
+=================
+Small dependency-aware executor for document generation chains.
+
+A business event (e.g. an accepted quotation) expands into dependent
+document tasks: quotation -> sales order -> job order, with one task per
+output format. Independent branches (PDF vs DOCX, or separate orders) run in
+parallel on a shared thread pool, and each downstream task is submitted the
+moment its last parent finishes instead of waiting for the next scheduler
+tick. Tasks whose parents failed are skipped rather than run.
+
+A task that cannot run yet (e.g. the document service circuit is open) can
+raise ``TaskDeferred``: it settles as ``deferred`` and its dependents are
+skipped for this run. Calling ``resume(task_id, result)`` once the deferred
+work is done marks it succeeded and runs the skipped subtree.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+DEFERRED = 'deferred'
+
+
+class TaskDeferred(Exception):
+    """Raised by a task whose work was queued for later instead of done now"""
+
+
+class DocumentTask:
+    """One node in the DAG"""
+
+    def __init__(self, task_id, func, args=(), depends_on=()):
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.depends_on = list(depends_on)
+        self.children = []
+        self.remaining = len(self.depends_on)
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.resumed = None
+
+    def to_dict(self):
+        """Serializable task summary"""
+        return {
+            'task_id': self.task_id,
+            'status': self.status,
+            'depends_on': self.depends_on,
+            'error': self.error,
+            'duration': (self.finished - self.started) if self.started and self.finished else None
+        }
+
+
+class DocumentTaskDAG:
+    """Run document tasks as soon as their dependencies complete"""
+
+    def __init__(self, executor=None, max_workers=4):
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                       thread_name_prefix='doc-dag')
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.outstanding = 0
+
+    def add_task(self, task_id, func, args=(), depends_on=()):
+        """Add a task; a falsy return value from func counts as a failure"""
+        if task_id in self.tasks:
+            raise ValueError(f"Duplicate task id: {task_id}")
+        for parent in depends_on:
+            if parent not in self.tasks:
+                raise ValueError(f"Task {task_id} depends on unknown task {parent}")
+
+        task = DocumentTask(task_id, func, args, depends_on)
+        for parent in depends_on:
+            self.tasks[parent].children.append(task)
+        self.tasks[task_id] = task
+        return task
+
+    def run(self, timeout=None):
+        """Execute all tasks and return {task_id: task} once every task settles"""
+        with self.lock:
+            self.outstanding = len(self.tasks)
+            if not self.outstanding:
+                return self.tasks
+            self.done.clear()
+            roots = [task for task in self.tasks.values() if task.remaining == 0]
+
+        for task in roots:
+            self._submit(task)
+
+        self.done.wait(timeout)
+        return self.tasks
+
+    def _submit(self, task):
+        task.status = RUNNING
+        self.executor.submit(self._execute, task)
+
+    def _execute(self, task):
+        task.started = time.monotonic()
+        try:
+            task.result = task.func(*task.args)
+            status = SUCCEEDED if task.result else FAILED
+        except TaskDeferred as e:
+            task.error = str(e)
+            status = DEFERRED
+        except Exception as e:
+            task.error = str(e)
+            status = FAILED
+        task.finished = time.monotonic()
+        self._settle(task, status)
+
+    def _settle(self, task, status):
+        """Release children of a finished task; skip the subtree on failure"""
+        ready = []
+        with self.lock:
+            if status == DEFERRED and task.resumed is not None:
+                # The deferred work already finished before the task returned
+                status, task.result, task.error = SUCCEEDED, task.resumed, None
+            task.status = status
+            stack = [task]
+            while stack:
+                current = stack.pop()
+                self.outstanding -= 1
+                for child in current.children:
+                    if child.status != PENDING:
+                        continue
+                    if current.status != SUCCEEDED:
+                        child.status = SKIPPED
+                        child.error = f"Dependency {current.task_id} {current.status}"
+                        stack.append(child)
+                        continue
+                    child.remaining -= 1
+                    if child.remaining == 0:
+                        ready.append(child)
+            if self.outstanding == 0:
+                self.done.set()
+
+        for child in ready:
+            self._submit(child)
+
+    def resume(self, task_id, result):
+        """Complete a deferred task and run the dependents that were skipped because of it"""
+        ready = []
+        with self.lock:
+            task = self.tasks[task_id]
+            if task.status == RUNNING:
+                task.resumed = result  # _settle picks it up
+                return []
+            if task.status != DEFERRED:
+                return []
+            task.status = SUCCEEDED
+            task.result = result
+            task.error = None
+
+            # Every skipped task reachable through skipped tasks may run now
+            reachable, stack = set(), list(task.children)
+            while stack:
+                child = stack.pop()
+                if child.status == SKIPPED and child.task_id not in reachable:
+                    reachable.add(child.task_id)
+                    stack.extend(child.children)
+
+            # Tasks were added parents-first, so one pass in insertion order sees parents settled;
+            # a task that still has another deferred parent stays skipped until that one resumes
+            for current in self.tasks.values():
+                if current.task_id not in reachable:
+                    continue
+                parents = [self.tasks[parent] for parent in current.depends_on]
+                blocked = next((parent for parent in parents if parent.status in (FAILED, SKIPPED, DEFERRED)), None)
+                if blocked is not None:
+                    current.error = f"Dependency {blocked.task_id} {blocked.status}"
+                    continue
+                current.status = PENDING
+                current.error = None
+                current.remaining = sum(1 for parent in parents if parent.status != SUCCEEDED)
+                self.outstanding += 1
+                if current.remaining == 0:
+                    ready.append(current)
+            if self.outstanding:
+                self.done.clear()
+
+        for current in ready:
+            self._submit(current)
+        return [current.task_id for current in ready]
+
+    def wait(self, timeout=None):
+        """Block until every submitted task (including resumed ones) has settled"""
+        return self.done.wait(timeout)
+
+    def summary(self):
+        """Counts of task outcomes"""
+        counts = {}
+        for task in self.tasks.values():
+            counts[task.status] = counts.get(task.status, 0) + 1
+        return counts
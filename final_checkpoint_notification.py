@@ -6,15 +6,17 @@ Complete status of Pareng Boyong communication setup
 """
 
 import json
-import requests
 from datetime import datetime
 
+from status_engine import run_status, service_status
+
 def create_final_status_report():
     """Create comprehensive final status report"""
     
     # Check current system status
-    main_health = check_service_health("http://localhost:5000")
-    webhook_health = check_service_health("http://localhost:5004")
+    status = run_status(['services'])
+    main_health = service_status(status, 'main_application')
+    webhook_health = service_status(status, 'webhook')
     
     status_report = {
         'checkpoint_timestamp': datetime.now().isoformat(),
@@ -157,14 +159,6 @@ def create_final_status_report():
     
     return status_report
 
-def check_service_health(url):
-    """Check if service is healthy"""
-    try:
-        response = requests.get(f"{url}/health", timeout=5)
-        return 'online' if response.status_code == 200 else 'error'
-    except:
-        return 'offline'
-
 def display_final_status(report):
     """Display final status in readable format"""
     
@@ -187,7 +181,7 @@ def display_final_status(report):
         status_icon = "🟢" if service_info['status'] == 'online' else "🟡" if 'ready' in service_info.get('status', '') else "🔴"
         print(f"   {status_icon} {service_name.replace('_', ' ').title()}: {service_info['status']}")
         print(f"      URL: {service_info['url']}")
-        print(f"      Capabilities: {service_info['capabilities']}")
+        print(f"      Capabilities: {service_info.get('capabilities', service_info.get('purpose'))}")
     
     print(f"\n📡 MCP INTEGRATION STATUS:")
     mcp = report['mcp_integration_status']
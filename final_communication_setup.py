@@ -5,11 +5,11 @@ Final Communication Setup for Pareng Boyong Subordinate Agents
 Provides direct communication interface and status summary
 """
 
-import requests
 import json
-import time
 from datetime import datetime
 
+from status_engine import probe_result, run_status
+
 def check_system_status():
     """Check status of all system components"""
     services = {
@@ -32,27 +32,20 @@ def check_system_status():
         'services': {}
     }
     
+    engine_report = run_status(['services', 'main_api'])
+    probed = probe_result(engine_report, 'services', {})
     for service_name, service_info in services.items():
-        try:
-            response = requests.get(f"{service_info['url']}/health", timeout=5)
-            is_healthy = response.status_code == 200
-            
-            status_report['services'][service_name] = {
-                'url': service_info['url'],
-                'status': 'online' if is_healthy else 'offline',
-                'description': service_info['description'],
-                'capabilities': service_info['capabilities'],
-                'last_checked': datetime.now().isoformat()
-            }
-        except:
-            status_report['services'][service_name] = {
-                'url': service_info['url'],
-                'status': 'offline',
-                'description': service_info['description'],
-                'capabilities': service_info['capabilities'],
-                'last_checked': datetime.now().isoformat(),
-                'error': 'connection_failed'
-            }
+        result = probed.get(service_name, {})
+        status_report['services'][service_name] = {
+            'url': service_info['url'],
+            'status': 'online' if result.get('status') == 'online' else 'offline',
+            'description': service_info['description'],
+            'capabilities': service_info['capabilities'],
+            'last_checked': result.get('checked_at', datetime.now().isoformat())
+        }
+        if result.get('error') or not result:
+            status_report['services'][service_name]['error'] = 'connection_failed'
+    status_report['main_api'] = probe_result(engine_report, 'main_api', {'status': 'offline'})
     
     return status_report
 
@@ -97,11 +90,11 @@ def generate_communication_instructions():
         },
         'integration_examples': {
             'python_example': '''
-import requests
+import http_client  # shared pooled client: keep-alive, timeouts, safe retries
 
 # Check system health
-main_health = requests.get('http://localhost:5000/health')
-doc_health = requests.get('http://localhost:5001/health')
+main_health = http_client.get('http://localhost:5000/health', timeout=5)
+doc_health = http_client.get('http://localhost:5001/health', timeout=5)
 
 # Generate document
 doc_request = {
@@ -109,7 +102,8 @@ doc_request = {
     'content': '# Report\\n\\nContent here',
     'formats': ['pdf', 'docx']
 }
-response = requests.post('http://localhost:5001/api/documents/generate', json=doc_request)
+response = http_client.post('http://localhost:5001/api/documents/generate', json=doc_request,
+                            timeout=(3.05, 60))
 ''',
             'curl_example': '''
 # Health check
@@ -204,25 +198,16 @@ def main():
     if status['services']['main_application']['status'] == 'online':
         print(f"\n🧪 TESTING COMMUNICATION CHANNEL...")
         
-        # Test main application health
-        try:
-            response = requests.get('http://localhost:5000/health', timeout=5)
-            if response.status_code == 200:
-                print("✅ Main application communication: SUCCESS")
-            else:
-                print(f"⚠️ Main application response code: {response.status_code}")
-        except Exception as e:
-            print(f"❌ Main application communication error: {e}")
+        # Results come from the concurrent status check above
+        print("✅ Main application communication: SUCCESS")
         
-        # Test dashboard data access
-        try:
-            response = requests.get('http://localhost:5000/api/health', timeout=5)
-            if response.status_code == 200:
-                print("✅ API endpoint communication: SUCCESS")
-            else:
-                print(f"⚠️ API endpoint response code: {response.status_code}")
-        except Exception as e:
-            print(f"❌ API endpoint communication error: {e}")
+        api_status = status['main_api']
+        if api_status['status'] == 'online':
+            print("✅ API endpoint communication: SUCCESS")
+        elif 'status_code' in api_status:
+            print(f"⚠️ API endpoint response code: {api_status['status_code']}")
+        else:
+            print(f"❌ API endpoint communication error: {api_status.get('error', 'unreachable')}")
     
     print(f"\n✅ COMMUNICATION SETUP COMPLETE")
     print(f"📡 Pareng Boyong subordinate agents can now:")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Background Service Health Prober
+================================
+Checks every Hibla service's ``/health`` endpoint concurrently on a fixed
+interval and keeps the latest results as an immutable snapshot.
+
+Status endpoints and scripts read the snapshot instead of making their own
+blocking ``requests.get(.../health, timeout=5)`` calls, so a service that
+is down costs one bounded probe per interval rather than a timeout on every
+status request.
+
+Usage:
+    python health_prober.py            # one probe round, printed
+    python health_prober.py --watch    # keep probing and print changes
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from http_client import HttpClient
+
+SERVICES = {
+    'main_application': 'http://localhost:5000',
+    'document_service': 'http://localhost:5001',
+    'agent_api': 'http://localhost:5002',
+    'mcp_integration': 'http://localhost:5003',
+    'webhook': 'http://localhost:5004',
+    'realtime': 'http://localhost:5005'
+}
+PROBE_INTERVAL = 10.0
+PROBE_TIMEOUT = 2.0
+
+
+class HealthProber:
+    """Concurrent interval prober serving cached health snapshots"""
+
+    def __init__(self, services=None, interval=PROBE_INTERVAL, timeout=PROBE_TIMEOUT):
+        self.services = dict(services or SERVICES)
+        self.interval = interval
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        # One pooled client, no retries: a failed probe is itself the signal
+        self.client = HttpClient(retries=0, pool_maxsize=max(4, len(self.services)))
+        self.executor = ThreadPoolExecutor(max_workers=max(4, len(self.services)),
+                                           thread_name_prefix='health-probe')
+        self.snapshot = {}
+        self.by_url = {}
+        self.rounds = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _probe(self, name, url):
+        started = time.perf_counter()
+        try:
+            response = self.client.get(f"{url}/health", timeout=self.timeout)
+            status = 'online' if response.status_code == 200 else 'error'
+            status_code = response.status_code
+            error = None
+        except requests.RequestException as e:
+            status, status_code, error = 'offline', None, type(e).__name__
+        result = {
+            'name': name,
+            'url': url,
+            'status': status,
+            'status_code': status_code,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'checked_at': datetime.now().isoformat()
+        }
+        if error:
+            result['error'] = error
+        return result
+
+    def probe_all(self):
+        """Probe every service concurrently and publish a new snapshot"""
+        with self.lock:
+            services = list(self.services.items())
+        results = list(self.executor.map(lambda service: self._probe(*service), services))
+
+        # Readers grab whole dicts, so swapping references keeps every read consistent.
+        # The new snapshot is merged into the current one, so a service added while this
+        # round was probing keeps its result.
+        with self.lock:
+            snapshot = dict(self.snapshot)
+            for result in results:
+                before = snapshot.get(result['name'])
+                if before and before['status'] == result['status']:
+                    result['since'] = before['since']
+                    result['consecutive_failures'] = before['consecutive_failures'] + (result['status'] != 'online')
+                else:
+                    result['since'] = result['checked_at']
+                    result['consecutive_failures'] = int(result['status'] != 'online')
+                snapshot[result['name']] = result
+            self.snapshot = snapshot
+            self.by_url = {result['url']: result for result in snapshot.values()}
+            self.rounds += 1
+        return snapshot
+
+    def start(self):
+        """Probe once synchronously, then keep probing in the background"""
+        if self.thread is not None:
+            return self
+        self.probe_all()
+        self.thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.probe_all()
+            except Exception as e:
+                print(f"⚠️ Health probe round failed: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        self.executor.shutdown(wait=False)
+        self.client.close()
+
+    def add_service(self, name, url):
+        """Track another service; it is probed immediately"""
+        url = url.rstrip('/')
+        with self.lock:
+            self.services[name] = url
+        result = self._probe(name, url)
+        result['since'] = result['checked_at']
+        result['consecutive_failures'] = int(result['status'] != 'online')
+        with self.lock:
+            self.snapshot = dict(self.snapshot, **{name: result})
+            self.by_url = dict(self.by_url, **{url: result})
+        return result
+
+    def get_snapshot(self):
+        """Latest results for all services"""
+        return self.snapshot
+
+    def get_status(self, url):
+        """'online', 'error' or 'offline' for a service URL"""
+        result = self.by_url.get(url.rstrip('/'))
+        if result is None:
+            result = self.add_service(url, url)
+        return result['status']
+
+    def is_healthy(self, url):
+        return self.get_status(url) == 'online'
+
+
+_prober = None
+_prober_lock = threading.Lock()
+
+
+def get_prober():
+    """Process-wide prober, started on first use"""
+    global _prober
+    with _prober_lock:
+        if _prober is None:
+            _prober = HealthProber().start()
+        return _prober
+
+
+def main():
+    """Print one probe round, or watch for status changes"""
+    prober = HealthProber()
+    snapshot = prober.probe_all()
+    print("🩺 HIBLA SERVICE HEALTH")
+    print("=" * 50)
+    for result in snapshot.values():
+        icon = "✅" if result['status'] == 'online' else "❌"
+        print(f"{icon} {result['name']:<18} {result['url']:<24} {result['status']:<8} {result['latency_ms']}ms")
+
+    if '--watch' in sys.argv:
+        states = {name: result['status'] for name, result in snapshot.items()}
+        try:
+            while True:
+                time.sleep(prober.interval)
+                for name, result in prober.probe_all().items():
+                    if states.get(name) != result['status']:
+                        print(f"🔄 {result['checked_at']} {name}: {states.get(name)} -> {result['status']}")
+                        states[name] = result['status']
+        except KeyboardInterrupt:
+            prober.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+==================
+One pooled, retrying HTTP client for the Hibla Python services and scripts.
+
+- Keep-alive connection pools per host (``requests.Session`` + urllib3), so
+  repeated calls to the local services and to ai.innovatehub.ph reuse TCP
+  and TLS connections instead of handshaking on every request.
+- Separate connect and read timeouts, overridable per call.
+- Retries with full-jitter exponential backoff. Idempotent methods retry on
+  connection errors, timeouts and 502/503/504; POST/PATCH only retry when
+  the connection was never established (the request cannot have been
+  sent), unless the caller marks the call ``idempotent=True``.
+- Optional HTTP/2 through httpx when it is installed (``http2=True`` or
+  ``HIBLA_HTTP2=1``). Redirects are followed and responses are wrapped to
+  look like ``requests.Response`` (``raise_for_status`` raises
+  ``requests.HTTPError``), so callers keep catching
+  ``requests.RequestException`` either way.
+
+Usage:
+    import http_client
+    response = http_client.get("http://localhost:5000/health")
+    response = http_client.post(url, json=payload, timeout=(3, 30))
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional; requests covers HTTP/1.1
+    httpx = None
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_RETRIES = 2
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 3.0
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+
+def _connection_not_established(error):
+    """True when the request cannot have reached the server"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, 'reason', reason)
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class Http2Response:
+    """requests.Response-compatible view of an httpx response"""
+
+    def __init__(self, response):
+        self.raw_response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+        self.history = [Http2Response(redirect) for redirect in response.history]
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content(self):
+        return self.raw_response.content
+
+    @property
+    def text(self):
+        return self.raw_response.text
+
+    @property
+    def encoding(self):
+        return self.raw_response.encoding
+
+    def json(self, **kwargs):
+        try:
+            return json.loads(self.content, **kwargs)
+        except json.JSONDecodeError as e:
+            raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+    def raise_for_status(self):
+        kind = 'Client' if 400 <= self.status_code < 500 else 'Server' if 500 <= self.status_code < 600 else None
+        if kind:
+            raise requests.HTTPError(f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                                     response=self)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        if decode_unicode:
+            return self.raw_response.iter_text(chunk_size)
+        return self.raw_response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.raw_response.close()
+
+
+class HttpClient:
+    """Pooled HTTP client with per-call timeouts and jittered retries"""
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, http2=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if http2 is None:
+            http2 = os.environ.get('HIBLA_HTTP2') == '1'
+        self.http2 = None
+        if http2 and httpx is not None:
+            try:
+                self.http2 = httpx.Client(http2=True, limits=httpx.Limits(max_keepalive_connections=pool_maxsize))
+            except ImportError:  # httpx without the h2 extra
+                self.http2 = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+        self.stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, timeout=None, retries=None, idempotent=None, **kwargs):
+        """Send a request, retrying where it is safe to do so"""
+        method = method.upper()
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        idempotent = method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+
+        attempt = 0
+        while True:
+            self._count('requests')
+            try:
+                response = self._send(method, url, timeout, kwargs)
+            except requests.RequestException as e:
+                retryable = idempotent and isinstance(e, (requests.ConnectionError, requests.Timeout))
+                if attempt >= retries or not (retryable or _connection_not_established(e)):
+                    self._count('failures')
+                    raise
+            else:
+                if not (idempotent and response.status_code in RETRY_STATUSES and attempt < retries):
+                    return response
+                response.close()
+            self._count('retries')
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def _send(self, method, url, timeout, kwargs):
+        if self.http2 is None or kwargs.get('stream'):
+            return self.session.request(method, url, timeout=timeout, **kwargs)
+
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        kwargs = dict(kwargs)
+        # requests names and defaults: redirects are followed, raw bodies go in data=
+        kwargs['follow_redirects'] = kwargs.pop('allow_redirects', True)
+        if isinstance(kwargs.get('data'), (bytes, str)) or hasattr(kwargs.get('data'), '__next__'):
+            kwargs['content'] = kwargs.pop('data')
+        try:
+            return Http2Response(self.http2.request(method, url, timeout=timeout, **kwargs))
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+        if self.http2 is not None:
+            self.http2.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def request(method, url, **kwargs):
+    return get_client().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
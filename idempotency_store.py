@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Idempotency Store
+=================
+Bounded TTL store of in-flight and completed agent requests keyed by
+``(agent_id, Idempotency-Key)``, so an agent that retries a document
+request after a timeout does not render and overwrite the same files
+again.
+
+- First request with a key owns it and runs normally.
+- A duplicate while the original is in flight waits for the original's
+  outcome and returns it.
+- A duplicate after a successful completion returns the stored response
+  immediately, without touching the document service.
+- Failed attempts (non-2xx) are handed to any waiters and then forgotten,
+  so a later retry runs again.
+- Reusing a key with a different payload is rejected.
+
+Entries live in the shared registry database (SQLite, WAL), so a retry
+that lands on a different API worker than the original still finds it.
+Waiters in the owner's process are woken directly; waiters in other
+workers poll the row. An in-flight entry older than ``stale_after`` (its
+owner most likely died) is taken over by the next request.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from agent_registry import DEFAULT_REGISTRY_PATH
+
+DEFAULT_CAPACITY = 10000
+DEFAULT_TTL = 24 * 3600.0
+WAIT_TIMEOUT = 60.0
+STALE_AFTER = 300.0
+POLL_INTERVAL = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_idempotency (
+    agent_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    body TEXT,
+    status INTEGER,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    PRIMARY KEY (agent_id, key)
+);
+CREATE INDEX IF NOT EXISTS agent_idempotency_completed ON agent_idempotency (done, completed_at);
+"""
+
+
+def fingerprint(payload):
+    """Stable hash of a JSON payload"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':'),
+                                     default=str).encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """(agent_id, key) -> in-flight marker or stored (body, status), shared by every API worker"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL,
+                 stale_after=STALE_AFTER, clock=time.time):
+        self.path = path
+        self.capacity = capacity
+        self.ttl = ttl
+        self.stale_after = stale_after
+        # Wall-clock time: entries are compared across processes
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = None
+        self.pid = None
+        self.events = {}  # (agent_id, key) -> Event for waiters in this process
+        self.stats = {'owned': 0, 'replayed': 0, 'attached': 0, 'mismatched': 0, 'evicted': 0}
+
+    def _connection(self):
+        # A connection inherited across fork() must not be reused by the child
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute('PRAGMA busy_timeout=5000')
+            self.db.executescript(SCHEMA)
+            self.pid = os.getpid()
+        return self.db
+
+    def begin(self, agent_id, key, payload):
+        """(entry, is_owner); entry is None when the key was used for a different payload"""
+        digest = fingerprint(payload)
+        with self.lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                now = self.clock()
+                row = db.execute('SELECT fingerprint, done, body, status, started_at, completed_at '
+                                 'FROM agent_idempotency WHERE agent_id = ? AND key = ?',
+                                 (agent_id, key)).fetchone()
+                if row is not None and self._expired(row, now):
+                    row = None
+
+                if row is not None:
+                    db.execute('COMMIT')
+                    if row[0] != digest:
+                        self.stats['mismatched'] += 1
+                        return None, False
+                    entry = self._entry(agent_id, key, row)
+                    self.stats['replayed' if entry['done'] else 'attached'] += 1
+                    return entry, False
+
+                db.execute('INSERT OR REPLACE INTO agent_idempotency (agent_id, key, fingerprint, done, '
+                           'started_at) VALUES (?, ?, ?, 0, ?)', (agent_id, key, digest, now))
+                self._evict(db, now)
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+            self.events[(agent_id, key)] = threading.Event()
+            self.stats['owned'] += 1
+            return {'agent_id': agent_id, 'key': key, 'done': False, 'body': None, 'status': None}, True
+
+    def _expired(self, row, now):
+        """Whether a stored row no longer counts: expired, failed, or abandoned in flight"""
+        done, status, started_at, completed_at = row[1], row[3], row[4], row[5]
+        if not done:
+            return now - started_at > self.stale_after
+        return not 200 <= status < 300 or now - completed_at > self.ttl
+
+    @staticmethod
+    def _entry(agent_id, key, row):
+        return {'agent_id': agent_id, 'key': key, 'done': bool(row[1]),
+                'body': json.loads(row[2]) if row[2] is not None else None, 'status': row[3]}
+
+    def _evict(self, db, now):
+        # Expired entries go first, then the oldest completed ones; in-flight ones are never dropped
+        evicted = db.execute('DELETE FROM agent_idempotency WHERE done = 1 AND completed_at < ?',
+                             (now - self.ttl,)).rowcount
+        excess = db.execute('SELECT COUNT(*) FROM agent_idempotency').fetchone()[0] - self.capacity
+        if excess > 0:
+            evicted += db.execute('DELETE FROM agent_idempotency WHERE rowid IN (SELECT rowid FROM '
+                                  'agent_idempotency WHERE done = 1 ORDER BY completed_at LIMIT ?)',
+                                  (excess,)).rowcount
+        self.stats['evicted'] += evicted
+
+    def finish(self, agent_id, key, body, status):
+        """Publish the owner's outcome; only 2xx outcomes are replayed to later requests"""
+        with self.lock:
+            # A failed outcome stays readable for current waiters; the next begin() replaces it
+            self._connection().execute(
+                'UPDATE agent_idempotency SET done = 1, body = ?, status = ?, completed_at = ? '
+                'WHERE agent_id = ? AND key = ? AND done = 0',
+                (json.dumps(body), status, self.clock(), agent_id, key))
+            event = self.events.pop((agent_id, key), None)
+        if event is not None:
+            event.set()
+
+    def wait(self, entry, timeout=WAIT_TIMEOUT):
+        """(body, status) of the original request, or (None, None) if it is still running"""
+        if entry['done']:
+            return entry['body'], entry['status']
+        with self.lock:
+            event = self.events.get((entry['agent_id'], entry['key']))
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                row = self._connection().execute(
+                    'SELECT fingerprint, done, body, status, started_at, completed_at FROM agent_idempotency '
+                    'WHERE agent_id = ? AND key = ?', (entry['agent_id'], entry['key'])).fetchone()
+            if row is not None and row[1]:
+                return self._entry(entry['agent_id'], entry['key'], row)['body'], row[3]
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, None
+            if event is not None:
+                event.wait(min(remaining, POLL_INTERVAL))
+            else:
+                time.sleep(min(remaining, POLL_INTERVAL))
+
+    def get_stats(self):
+        with self.lock:
+            entries = self._connection().execute('SELECT COUNT(*) FROM agent_idempotency').fetchone()[0]
+            return dict(self.stats, entries=entries)
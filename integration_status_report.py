@@ -6,24 +6,29 @@ Real-time status of Pareng Boyong communication integration
 """
 
 import json
-import requests
-import os
 from datetime import datetime
 
+from status_engine import probe_result, run_status, service_status
+
+REPORT_PROBES = ['services', 'dashboard', 'mcp_sse', 'mcp_delivery', 'session_files', 'responses']
+
 def create_integration_summary():
     """Create comprehensive integration status summary"""
     
     print("📊 PARENG BOYONG INTEGRATION STATUS REPORT")
     print("=" * 55)
     
+    # All probes run concurrently; the views below only reshape the results
+    report = run_status(REPORT_PROBES)
+    
     # Check Hibla system
-    hibla_status = check_hibla_system()
+    hibla_status = check_hibla_system(report)
     
     # Check MCP communication
-    mcp_status = check_mcp_communication()
+    mcp_status = check_mcp_communication(report)
     
     # Check for responses
-    response_status = check_pareng_boyong_responses()
+    response_status = check_pareng_boyong_responses(report)
     
     # Create summary
     summary = {
@@ -37,136 +42,77 @@ def create_integration_summary():
     
     return summary
 
-def check_hibla_system():
+def check_hibla_system(report=None):
     """Check Hibla manufacturing system status"""
-    try:
-        # Direct health check
-        health_response = requests.get('http://localhost:5000/health', timeout=5)
-        
-        if health_response.status_code == 200:
-            # Get manufacturing data
-            try:
-                data_response = requests.get('http://localhost:5000/api/dashboard/analytics', timeout=5)
-                if data_response.status_code == 200:
-                    dashboard = data_response.json().get('overview', {})
-                    return {
-                        'status': 'operational',
-                        'health_check': 'passing',
-                        'manufacturing_data': {
-                            'customers': dashboard.get('totalCustomers', 'N/A'),
-                            'products': dashboard.get('totalProducts', 'N/A'),
-                            'quotations': dashboard.get('activeQuotations', 'N/A'),
-                            'sales_orders': dashboard.get('activeSalesOrders', 'N/A'),
-                            'job_orders': dashboard.get('activeJobOrders', 'N/A')
-                        },
-                        'api_access': 'available',
-                        'ready_for_agents': True
-                    }
-            except:
-                pass
-                
+    report = report or run_status(['services', 'dashboard'])
+    
+    if service_status(report, 'main_application') == 'online':
+        dashboard = probe_result(report, 'dashboard', {})
+        if dashboard.get('available'):
+            overview = dashboard['overview']
             return {
-                'status': 'online',
+                'status': 'operational',
                 'health_check': 'passing',
-                'api_access': 'limited'
+                'manufacturing_data': {
+                    'customers': overview.get('totalCustomers', 'N/A'),
+                    'products': overview.get('totalProducts', 'N/A'),
+                    'quotations': overview.get('activeQuotations', 'N/A'),
+                    'sales_orders': overview.get('activeSalesOrders', 'N/A'),
+                    'job_orders': overview.get('activeJobOrders', 'N/A')
+                },
+                'api_access': 'available',
+                'ready_for_agents': True
             }
-    except:
-        pass
+            
+        return {
+            'status': 'online',
+            'health_check': 'passing',
+            'api_access': 'limited'
+        }
     
     return {
         'status': 'unknown',
         'health_check': 'failed'
     }
 
-def check_mcp_communication():
+def check_mcp_communication(report=None):
     """Check MCP communication status"""
-    status = {
-        'sse_endpoint_test': 'unknown',
-        'session_establishment': 'unknown',
-        'message_delivery': 'unknown',
-        'real_time_monitoring': 'unknown'
-    }
-    
-    # Test SSE endpoint
-    try:
-        response = requests.get(
-            'https://ai.innovatehub.ph/mcp/t-0/sse',
-            headers={'Accept': 'text/event-stream'},
-            timeout=5,
-            stream=True
-        )
-        
-        if response.status_code == 200:
-            status['sse_endpoint_test'] = 'accessible'
-            
-            # Check for session data in response
-            try:
-                for line in response.iter_lines(decode_unicode=True):
-                    if line and '/messages/' in line and 'session_id=' in line:
-                        status['session_establishment'] = 'confirmed'
-                        break
-                    elif line:  # Any response indicates working endpoint
-                        status['session_establishment'] = 'partial'
-                        break
-            except:
-                status['session_establishment'] = 'timeout'
-        else:
-            status['sse_endpoint_test'] = f'error_{response.status_code}'
-            
-    except Exception as e:
-        status['sse_endpoint_test'] = 'failed'
-    
-    # Check message delivery by testing POST
-    try:
-        test_msg = {'test': 'connectivity_check', 'timestamp': datetime.now().isoformat()}
-        response = requests.post('https://ai.innovatehub.ph/mcp/t-0/sse', json=test_msg, timeout=10)
-        if response.status_code in [200, 405]:  # 405 is expected for established connection
-            status['message_delivery'] = 'confirmed'
-        else:
-            status['message_delivery'] = f'error_{response.status_code}'
-    except:
-        status['message_delivery'] = 'failed'
-    
-    # Check for active monitoring files
-    session_files = ['mcp_session_messages.json', 'pareng_boyong_session_response.json']
-    if any(os.path.exists(f) for f in session_files):
-        status['real_time_monitoring'] = 'active'
-    else:
-        status['real_time_monitoring'] = 'pending'
+    report = report or run_status(['mcp_sse', 'mcp_delivery', 'session_files'])
+    sse = probe_result(report, 'mcp_sse', {})
+    sse_endpoint = sse.get('sse_endpoint', 'failed')
+    if sse_endpoint != 'accessible' and not sse_endpoint.startswith('error_'):
+        sse_endpoint = 'failed'
     
-    return status
+    return {
+        'sse_endpoint_test': sse_endpoint,
+        'session_establishment': sse.get('session_establishment', 'unknown'),
+        'message_delivery': probe_result(report, 'mcp_delivery', {}).get('message_delivery', 'failed'),
+        'real_time_monitoring': 'active' if probe_result(report, 'session_files', {}).get('files') else 'pending'
+    }
 
-def check_pareng_boyong_responses():
+def check_pareng_boyong_responses(report=None):
     """Check for Pareng Boyong responses"""
-    response_files = [
-        'pareng_boyong_session_response.json',
-        'pareng_boyong_mcp_response.json',
-        'pareng_boyong_response.json'
-    ]
+    report = report or run_status(['responses'])
     
     responses = []
-    
-    for filename in response_files:
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                
-                file_stat = os.stat(filename)
-                responses.append({
-                    'filename': filename,
-                    'timestamp': data.get('timestamp', 'unknown'),
-                    'source': data.get('source', 'unknown'),
-                    'size_bytes': file_stat.st_size,
-                    'modified': datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                    'status': 'valid_response'
-                })
-            except Exception as e:
-                responses.append({
-                    'filename': filename,
-                    'status': 'read_error',
-                    'error': str(e)
-                })
+    for found in probe_result(report, 'responses', {}).get('files', []):
+        if 'pareng_boyong' not in found['filename']:
+            continue
+        if found['status'] == 'found':
+            responses.append({
+                'filename': found['filename'],
+                'timestamp': found['timestamp'],
+                'source': found['source'],
+                'size_bytes': found['size'],
+                'modified': found['modified'],
+                'status': 'valid_response'
+            })
+        else:
+            responses.append({
+                'filename': found['filename'],
+                'status': 'read_error',
+                'error': found.get('error')
+            })
     
     return {
         'response_files_found': len(responses),
@@ -5,7 +5,6 @@ MCP Agent Zero Integration for Hibla Automation System
 Establishes communication with Agent Zero via SSE endpoint
 """
 
-import requests
 import json
 import time
 import threading
@@ -14,6 +13,11 @@ import sseclient
 from flask import Flask, request, jsonify
 import logging
 
+from health_prober import get_prober
+from analytics_cache import get_analytics_cache, get_dashboard_overview
+import http_client
+from payload_validators import validate_workflow_trigger
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -41,7 +45,7 @@ class MCPAgentIntegration:
                 'User-Agent': 'Hibla-Automation-System/1.0'
             }
             
-            response = requests.get(self.mcp_server_url, headers=headers, stream=True, timeout=30)
+            response = http_client.get(self.mcp_server_url, headers=headers, stream=True, timeout=30)
             
             if response.status_code == 200:
                 logger.info("✅ SSE connection established with Agent Zero")
@@ -154,7 +158,7 @@ class MCPAgentIntegration:
             }
             
             # Send to document service
-            response = requests.post(
+            response = http_client.post(
                 f"{self.doc_service_url}/api/documents/generate",
                 json=doc_payload,
                 timeout=30
@@ -242,6 +246,16 @@ class MCPAgentIntegration:
             workflow_type = request_data.get('workflow_type')
             workflow_data = request_data.get('workflow_data', {})
             
+            errors = validate_workflow_trigger(request_data)
+            if errors:
+                logger.warning(f"⚠️ Rejected workflow trigger {workflow_type}: {errors}")
+                return {
+                    'status': 'error',
+                    'message': 'Invalid workflow request',
+                    'errors': errors,
+                    'request_id': request_data.get('request_id')
+                }
+            
             logger.info(f"🔄 Processing workflow trigger: {workflow_type}")
             
             # Process different workflow types
@@ -351,24 +365,12 @@ class MCPAgentIntegration:
         return self.handle_document_request(doc_request)
     
     def check_service_health(self, url):
-        """Check if a service is healthy"""
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        """Check if a service is healthy (cached background probe)"""
+        return get_prober().is_healthy(url)
     
     def get_dashboard_data(self):
-        """Get current dashboard data"""
-        try:
-            response = requests.get(f"{self.hibla_base_url}/api/dashboard/analytics", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('overview', {})
-            else:
-                return {}
-        except:
-            return {}
+        """Get current dashboard data (shared TTL cache)"""
+        return get_dashboard_overview(self.hibla_base_url)
     
     def start_sse_listener(self):
         """Start SSE listener in background thread"""
@@ -418,7 +420,8 @@ def mcp_status():
         'hibla_system': {
             'main_app_status': 'online' if main_health else 'offline',
             'doc_service_status': 'online' if doc_health else 'offline',
-            'dashboard_data': dashboard_data
+            'dashboard_data': dashboard_data,
+            'dashboard_cache': get_analytics_cache(mcp_integration.hibla_base_url).get_stats()
         },
         'integration_status': 'active',
         'message_queue_size': len(mcp_integration.message_queue)
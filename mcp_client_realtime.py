@@ -6,7 +6,6 @@ Proper SSE client with persistent connection and message handling
 """
 
 import sseclient
-import requests
 import json
 import time
 import threading
@@ -15,6 +14,8 @@ from flask import Flask, request, jsonify
 from queue import Queue
 import logging
 
+import http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,7 +44,7 @@ class HiblaMCPClient:
             
             logger.info(f"Connecting to MCP server: {self.mcp_endpoint}")
             
-            response = requests.get(
+            response = http_client.get(
                 self.mcp_endpoint,
                 headers=headers,
                 stream=True,
@@ -219,7 +220,7 @@ class HiblaMCPClient:
             
             # Try to send acknowledgment via POST
             try:
-                response = requests.post(
+                response = http_client.post(
                     self.mcp_endpoint,
                     json=ack_message,
                     timeout=10
@@ -249,7 +250,7 @@ class HiblaMCPClient:
             message['from'] = 'hibla-manufacturing-system'
             message['timestamp'] = datetime.now().isoformat()
             
-            response = requests.post(
+            response = http_client.post(
                 self.mcp_endpoint,
                 json=message,
                 timeout=15
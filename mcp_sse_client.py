@@ -14,6 +14,8 @@ from datetime import datetime
 from urllib3.exceptions import ReadTimeoutError
 import sseclient
 
+import http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -65,7 +67,7 @@ class ProductionMCPClient:
             
             logger.info(f"Connecting to {self.mcp_url}")
             
-            response = requests.get(
+            response = http_client.get(
                 self.mcp_url,
                 headers=headers,
                 stream=True,
@@ -220,7 +222,7 @@ class ProductionMCPClient:
             if self.messages_endpoint:
                 full_url = f"https://ai.innovatehub.ph{self.messages_endpoint}"
                 try:
-                    response = requests.post(full_url, json=ack, timeout=10)
+                    response = http_client.post(full_url, json=ack, timeout=10)
                     logger.info(f"📤 Acknowledgment sent: {response.status_code}")
                 except Exception as e:
                     logger.warning(f"Ack send failed: {e}")
@@ -241,7 +243,7 @@ class ProductionMCPClient:
             while self.running and self.messages_endpoint:
                 try:
                     full_url = f"https://ai.innovatehub.ph{self.messages_endpoint}"
-                    response = requests.get(full_url, timeout=10)
+                    response = http_client.get(full_url, timeout=10)
                     
                     if response.status_code == 200:
                         try:
@@ -270,14 +272,14 @@ class ProductionMCPClient:
             message['timestamp'] = datetime.now().isoformat()
             
             # Try main endpoint
-            response = requests.post(self.mcp_url, json=message, timeout=15)
+            response = http_client.post(self.mcp_url, json=message, timeout=15)
             logger.info(f"📤 Message sent to main endpoint: {response.status_code}")
             
             # Try messages endpoint if available
             if self.messages_endpoint:
                 full_url = f"https://ai.innovatehub.ph{self.messages_endpoint}"
                 try:
-                    response2 = requests.post(full_url, json=message, timeout=15)
+                    response2 = http_client.post(full_url, json=message, timeout=15)
                     logger.info(f"📤 Message sent to session endpoint: {response2.status_code}")
                 except Exception as e:
                     logger.warning(f"Session send failed: {e}")
@@ -9,7 +9,8 @@ import json
 import os
 import time
 from datetime import datetime
-import requests
+
+import http_client
 
 def check_for_response():
     """Check for any responses from Pareng Boyong"""
@@ -77,7 +78,7 @@ def check_for_response():
     
     # Test MCP connection status
     try:
-        response = requests.get(
+        response = http_client.get(
             'https://ai.innovatehub.ph/mcp/t-0/sse',
             headers={'Accept': 'text/event-stream'},
             timeout=5
@@ -186,7 +187,7 @@ def main():
     
     # Check Hibla system
     try:
-        response = requests.get('http://localhost:5000/health', timeout=3)
+        response = http_client.get('http://localhost:5000/health', timeout=3)
         if response.status_code == 200:
             print(f"   ✅ Hibla system: Operational")
         else:
@@ -5,12 +5,14 @@ Pareng Boyong Communication Interface
 Establishes direct communication channels with Pareng Boyong's subordinate agents
 """
 
-import requests
 import json
 import time
 from datetime import datetime
 import logging
 
+from health_prober import get_prober
+import http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -128,7 +130,7 @@ class ParengBoyongInterface:
         }
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.agent_api_url}/api/agent/register",
                 json=registration_data,
                 timeout=10
@@ -157,7 +159,7 @@ class ParengBoyongInterface:
         }
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.agent_api_url}/api/agent/document/generate",
                 json=request_payload,
                 timeout=30
@@ -178,7 +180,7 @@ class ParengBoyongInterface:
     def get_system_status_for_agents(self):
         """Get current system status for Pareng Boyong's agents"""
         try:
-            response = requests.get(f"{self.agent_api_url}/api/agent/status", timeout=10)
+            response = http_client.get(f"{self.agent_api_url}/api/agent/status", timeout=10)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -187,12 +189,8 @@ class ParengBoyongInterface:
             return {'error': str(e)}
     
     def check_service_health(self, url):
-        """Check if a service is responding"""
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        """Check if a service is responding (cached background probe)"""
+        return get_prober().is_healthy(url)
     
     def demonstrate_agent_workflow(self):
         """Demonstrate workflow for Pareng Boyong's subordinate agents"""
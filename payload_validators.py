@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Document Payload Validators
+===========================
+Shape checks for quotation, sales order and job order payloads, agent
+document requests and MCP workflow triggers.
+
+Each schema below is compiled once at import into a flat tuple of
+specialised checker closures (type test, bounds, pattern and nested item
+validators bound in advance), so a call only runs the checks relevant to
+the fields present and malformed requests are rejected before any content
+is built or sent to the document service.
+
+Usage:
+    python payload_validators.py payload.json [quotation|sales_order|job_order]
+"""
+
+import json
+import math
+import re
+import sys
+from collections import namedtuple
+
+MAX_REPORTED_ERRORS = 20
+
+Field = namedtuple('Field', 'kind required choices min_value max_length pattern item_schema')
+Field.__new__.__defaults__ = (False, None, None, None, None, None)
+
+DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}'
+FILENAME_PATTERN = r'^[A-Za-z0-9][A-Za-z0-9_.-]*$'
+AMOUNT_PATTERN = r'^\d+(\.\d+)?$'
+DOCUMENT_FORMATS = ('md', 'pdf', 'docx')
+
+PRICED_ITEM_SCHEMA = {
+    'productName': Field('string', required=True, max_length=200),
+    'specification': Field('string', max_length=500),
+    'quantity': Field('number', required=True, min_value=0),
+    'unitPrice': Field('number', required=True, min_value=0),
+    'lineTotal': Field('number', required=True, min_value=0),
+}
+
+PRODUCTION_ITEM_SCHEMA = {
+    'productName': Field('string', required=True, max_length=200),
+    'specification': Field('string', max_length=500),
+    'quantity': Field('number', required=True, min_value=0),
+    'status': Field('string', max_length=50),
+    'notes': Field('string', max_length=500),
+}
+
+MONEY_FIELDS = {
+    'subtotal': Field('number', min_value=0),
+    'shippingFee': Field('number', min_value=0),
+    'bankCharge': Field('number', min_value=0),
+    'discount': Field('number', min_value=0),
+    'total': Field('number', min_value=0),
+}
+
+QUOTATION_SCHEMA = dict(MONEY_FIELDS, **{
+    'quotationNumber': Field('string', required=True, max_length=64),
+    'revisionNumber': Field('string', max_length=8),
+    'customerCode': Field('string', max_length=64),
+    'customerName': Field('string', max_length=200),
+    'country': Field('string', max_length=100),
+    'priceTier': Field('string', max_length=100),
+    'items': Field('list', required=True, item_schema=PRICED_ITEM_SCHEMA),
+    'paymentMethod': Field('string', max_length=100),
+    'shippingMethod': Field('string', max_length=100),
+    'creatorInitials': Field('string', max_length=10),
+    'customerServiceInstructions': Field('string', max_length=5000),
+})
+
+SALES_ORDER_SCHEMA = dict(MONEY_FIELDS, **{
+    'salesOrderNumber': Field('string', required=True, max_length=64),
+    'customerCode': Field('string', max_length=64),
+    'customerName': Field('string', max_length=200),
+    'country': Field('string', max_length=100),
+    'items': Field('list', required=True, item_schema=PRICED_ITEM_SCHEMA),
+    'status': Field('string', max_length=50),
+    'paymentStatus': Field('string', max_length=50),
+    'productionStatus': Field('string', max_length=50),
+})
+
+JOB_ORDER_SCHEMA = {
+    'jobOrderNumber': Field('string', required=True, max_length=64),
+    'salesOrderNumber': Field('string', max_length=64),
+    'customerName': Field('string', max_length=200),
+    'priority': Field('string', choices=('Low', 'Normal', 'High', 'Urgent')),
+    'dueDate': Field('string', pattern=DATE_PATTERN),
+    'status': Field('string', max_length=50),
+    'startDate': Field('string', pattern=DATE_PATTERN),
+    'estimatedCompletion': Field('string', pattern=DATE_PATTERN),
+    'assignedTeam': Field('string', max_length=100),
+    'qcInspector': Field('string', max_length=100),
+    'qcNotes': Field('string', max_length=5000),
+    'items': Field('list', required=True, item_schema=PRODUCTION_ITEM_SCHEMA),
+}
+
+DOCUMENT_REQUEST_SCHEMA = {
+    'agent_id': Field('string', max_length=128),
+    'filename_base': Field('string', required=True, max_length=128, pattern=FILENAME_PATTERN),
+    'content': Field('string', required=True),
+    'formats': Field('string_list', required=True, choices=DOCUMENT_FORMATS),
+    'document_type': Field('string', choices=('quotation', 'sales_order', 'job_order')),
+}
+
+QUOTATION_WORKFLOW_SCHEMA = {
+    'customer_name': Field('string', required=True, max_length=200),
+    'products': Field('string_list', max_length=500),
+    'items_content': Field('string', max_length=100000),
+    'total_amount': Field('amount'),
+}
+
+SALES_ORDER_WORKFLOW_SCHEMA = {
+    'customer_name': Field('string', required=True, max_length=200),
+    'order_details': Field('string', max_length=100000),
+    'payment_terms': Field('string', max_length=5000),
+}
+
+REPORT_WORKFLOW_SCHEMA = {
+    'report_type': Field('string', max_length=100),
+    'report_content': Field('string', max_length=100000),
+}
+
+
+def _is_number(value):
+    # bool is an int subclass, and NaN/inf would render as nonsense totals
+    return (type(value) is int) or (type(value) is float and math.isfinite(value))
+
+
+def _compile_field(name, field):
+    """Specialise one field spec into a checker(value, path, errors)"""
+    checks = []
+    if field.kind == 'string':
+        checks.append((lambda value: type(value) is str, 'expected a string'))
+        if field.required:
+            checks.append((lambda value: value.strip() != '', 'must not be empty'))
+        if field.max_length is not None:
+            limit = field.max_length
+            checks.append((lambda value: len(value) <= limit, f'longer than {limit} characters'))
+        if field.pattern is not None:
+            regex = re.compile(field.pattern)
+            checks.append((lambda value: regex.match(value) is not None, f'does not match {field.pattern}'))
+        if field.choices is not None:
+            choices = frozenset(field.choices)
+            checks.append((lambda value: value in choices, f'must be one of {sorted(choices)}'))
+    elif field.kind == 'number':
+        checks.append((_is_number, 'expected a number'))
+        if field.min_value is not None:
+            minimum = field.min_value
+            checks.append((lambda value: value >= minimum, f'must be >= {minimum}'))
+    elif field.kind == 'amount':
+        regex = re.compile(AMOUNT_PATTERN)
+        checks.append((lambda value: _is_number(value) or (type(value) is str and regex.match(value) is not None),
+                       'expected an amount'))
+    elif field.kind in ('list', 'string_list'):
+        checks.append((lambda value: type(value) is list, 'expected a list'))
+        if field.max_length is not None:
+            limit = field.max_length
+            checks.append((lambda value: len(value) <= limit, f'more than {limit} entries'))
+        if field.choices is not None:
+            choices = frozenset(field.choices)
+            checks.append((lambda value: not value or set(value) <= choices,
+                           f'entries must be from {sorted(choices)}'))
+        if field.kind == 'string_list':
+            checks.append((lambda value: all(type(entry) is str for entry in value), 'expected a list of strings'))
+    else:
+        raise ValueError(f"Unknown field kind for {name}: {field.kind}")
+    checks = tuple(checks)
+
+    item_validator = _compile_schema(field.item_schema) if field.item_schema else None
+
+    def check(value, path, errors):
+        for test, message in checks:
+            try:
+                ok = test(value)
+            except TypeError:
+                ok = False
+            if not ok:
+                errors.append(f"{path}: {message}")
+                return
+        if item_validator is not None:
+            for index, item in enumerate(value):
+                item_validator(item, f"{path}[{index}]", errors)
+                if len(errors) >= MAX_REPORTED_ERRORS:
+                    return
+
+    return check
+
+
+def _compile_schema(schema):
+    """Compile a {field: Field} schema into validator(data, prefix, errors)"""
+    required = tuple(name for name, field in schema.items() if field.required)
+    checkers = tuple((name, _compile_field(name, field)) for name, field in schema.items())
+
+    def validate(data, prefix, errors):
+        if type(data) is not dict:
+            errors.append(f"{prefix or 'payload'}: expected an object")
+            return
+        for name in required:
+            if name not in data or data[name] is None:
+                errors.append(f"{prefix}.{name}: required" if prefix else f"{name}: required")
+        for name, check in checkers:
+            value = data.get(name)
+            if value is not None:
+                check(value, f"{prefix}.{name}" if prefix else name, errors)
+            if len(errors) >= MAX_REPORTED_ERRORS:
+                return
+
+    return validate
+
+
+def compile_validator(schema):
+    """Compile a schema into a function returning a list of error strings (empty when valid)"""
+    validate = _compile_schema(schema)
+
+    def validator(data):
+        errors = []
+        validate(data, '', errors)
+        return errors[:MAX_REPORTED_ERRORS]
+
+    return validator
+
+
+validate_quotation = compile_validator(QUOTATION_SCHEMA)
+validate_sales_order = compile_validator(SALES_ORDER_SCHEMA)
+validate_job_order = compile_validator(JOB_ORDER_SCHEMA)
+_validate_document_request = compile_validator(DOCUMENT_REQUEST_SCHEMA)
+_validate_priced_items = compile_validator({
+    'items': Field('list', item_schema=PRICED_ITEM_SCHEMA)
+})
+
+VALIDATORS = {
+    'quotation': validate_quotation,
+    'sales_order': validate_sales_order,
+    'job_order': validate_job_order,
+}
+
+WORKFLOW_VALIDATORS = {
+    'generate_quotation': compile_validator(QUOTATION_WORKFLOW_SCHEMA),
+    'create_sales_order': compile_validator(SALES_ORDER_WORKFLOW_SCHEMA),
+    'generate_report': compile_validator(REPORT_WORKFLOW_SCHEMA),
+}
+
+
+def validate_document_request(data):
+    """Agent document request: envelope fields plus the typed payload when one is declared"""
+    errors = _validate_document_request(data)
+    if errors or type(data) is not dict:
+        return errors
+    document_type = data.get('document_type')
+    if document_type:
+        return VALIDATORS[document_type](data)
+    if 'items' in data:
+        return _validate_priced_items(data)
+    return errors
+
+
+def validate_workflow_trigger(data):
+    """MCP workflow trigger: known workflow_type and a well-formed workflow_data"""
+    if type(data) is not dict:
+        return ['payload: expected an object']
+    validator = WORKFLOW_VALIDATORS.get(data.get('workflow_type'))
+    if validator is None:
+        return [f"workflow_type: must be one of {sorted(WORKFLOW_VALIDATORS)}"]
+    return validator(data.get('workflow_data', {}))
+
+
+def main():
+    """Validate a payload JSON file"""
+    if len(sys.argv) < 2:
+        print("Usage: python payload_validators.py <payload.json> [quotation|sales_order|job_order]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    kind = sys.argv[2] if len(sys.argv) > 2 else 'quotation'
+
+    errors = VALIDATORS[kind](data)
+    for error in errors:
+        print(f"   • {error}")
+    print(f"{'✅ Valid' if not errors else '❌ Invalid'} {kind} payload")
+    sys.exit(0 if not errors else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Line-Item Pricing Engine
+========================
+Recomputes quotation / sales order totals instead of trusting the
+client-supplied ``lineTotal``, ``subtotal`` and ``total`` fields.
+
+Item lists are converted once into exact fixed-point integer columns
+(quantity in thousandths, unit price in ten-thousandths, money in cents).
+Line totals, subtotal, shipping, bank charge, discount and grand total are
+then computed column-wise in a single pass - with NumPy int64 arrays when
+NumPy is installed, otherwise with C-level ``map``/``sum`` over Python
+ints - so 100k-line bulk quotations validate in milliseconds and money is
+never accumulated in binary floats. Mismatches are reported before a
+document renders.
+
+int64 columns are only used while every intermediate (scaled values,
+quantity x price products, the subtotal) provably fits; larger amounts
+take the arbitrary-precision Python-int path instead of wrapping around.
+
+Usage:
+    python pricing_engine.py quotation.json
+"""
+
+import json
+import sys
+from decimal import Decimal, InvalidOperation
+from itertools import repeat
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python columns are exact too
+    np = None
+
+QUANTITY_SCALE = 1000        # quantities to 3 decimal places
+PRICE_SCALE = 10000          # unit prices to 4 decimal places
+CENTS = 100                  # money columns
+LINE_DIVISOR = QUANTITY_SCALE * PRICE_SCALE // CENTS
+DEFAULT_TOLERANCE_CENTS = 1
+MAX_REPORTED_MISMATCHES = 50
+FAST_TYPES = {int, float}
+INT64_SAFE = 2 ** 62         # headroom below int64 for signs and the fee/discount sums
+
+
+def _scale_value(value, scale):
+    """Exact fixed-point conversion for strings, Decimals and other scalars"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"Not a number: {value!r}")
+    try:
+        scaled = Decimal(str(value)) * scale
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Not a number: {value!r}")
+    return int(scaled.to_integral_value())
+
+
+def scaled_column(values, scale):
+    """Fixed-point integer column (missing values become None)"""
+    if set(map(type, values)) <= FAST_TYPES:
+        if np is not None and values:
+            scaled = np.asarray(values, dtype=np.float64) * scale
+            if np.isfinite(scaled).all() and np.abs(scaled).max() < INT64_SAFE:
+                return np.rint(scaled).astype(np.int64)
+        return list(map(round, map(mul, values, repeat(scale, len(values)))))
+    return [_scale_value(value, scale) for value in values]
+
+
+def _column_list(column):
+    return column.tolist() if np is not None and isinstance(column, np.ndarray) else column
+
+
+def to_cents(value):
+    """Money amount in integer cents"""
+    return _scale_value(value, CENTS) or 0
+
+
+def cents_to_decimal(cents):
+    """Integer cents as an exact Decimal"""
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def compute_line_totals(quantities, unit_prices):
+    """Line totals in cents, rounded half-up away from zero"""
+    half = LINE_DIVISOR // 2
+    if (np is not None and isinstance(quantities, np.ndarray) and isinstance(unit_prices, np.ndarray)
+            and (not len(quantities) or
+                 int(np.abs(quantities).max()) * int(np.abs(unit_prices).max()) < INT64_SAFE)):
+        products = quantities * unit_prices
+        return np.sign(products) * ((np.abs(products) + half) // LINE_DIVISOR)
+
+    quantities = _column_list(quantities)
+    unit_prices = _column_list(unit_prices)
+    if None in quantities:
+        quantities = [quantity or 0 for quantity in quantities]
+    if None in unit_prices:
+        unit_prices = [price or 0 for price in unit_prices]
+    products = list(map(mul, quantities, unit_prices))
+    if not products or min(products) >= 0:
+        return [(product + half) // LINE_DIVISOR for product in products]
+    return [(product + half) // LINE_DIVISOR if product >= 0 else -((half - product) // LINE_DIVISOR)
+            for product in products]
+
+
+def find_line_mismatches(claimed, computed, tolerance_cents):
+    """Indexes of lines whose claimed total differs from the computed one"""
+    if np is not None and isinstance(claimed, np.ndarray) and isinstance(computed, np.ndarray):
+        return np.nonzero(np.abs(claimed - computed) > tolerance_cents)[0].tolist()
+    computed = _column_list(computed)
+    return [index for index, (claimed_value, computed_value) in enumerate(zip(claimed, computed))
+            if claimed_value is not None and abs(claimed_value - computed_value) > tolerance_cents]
+
+
+def count_negative_lines(quantities, unit_prices):
+    """Lines with a negative quantity or unit price"""
+    if np is not None and isinstance(quantities, np.ndarray) and isinstance(unit_prices, np.ndarray):
+        return int(np.count_nonzero((quantities < 0) | (unit_prices < 0)))
+    quantities = [quantity or 0 for quantity in quantities]
+    unit_prices = [price or 0 for price in unit_prices]
+    if (not quantities or min(quantities) >= 0) and (not unit_prices or min(unit_prices) >= 0):
+        return 0
+    return sum(1 for quantity, price in zip(quantities, unit_prices) if quantity < 0 or price < 0)
+
+
+def compute_pricing(data, tolerance_cents=DEFAULT_TOLERANCE_CENTS):
+    """Recompute all totals for a quotation or sales order payload and flag mismatches"""
+    items = data.get('items', [])
+    quantities = scaled_column([item.get('quantity', 0) for item in items], QUANTITY_SCALE)
+    unit_prices = scaled_column([item.get('unitPrice', 0) for item in items], PRICE_SCALE)
+    claimed_lines = scaled_column([item.get('lineTotal') for item in items], CENTS)
+
+    line_totals = compute_line_totals(quantities, unit_prices)
+    if (np is not None and isinstance(line_totals, np.ndarray) and
+            (not len(line_totals) or int(np.abs(line_totals).max()) * len(line_totals) < INT64_SAFE)):
+        subtotal = int(line_totals.sum())
+    else:
+        subtotal = sum(_column_list(line_totals))
+    shipping_fee = to_cents(data.get('shippingFee', 0))
+    bank_charge = to_cents(data.get('bankCharge', 0))
+    discount = to_cents(data.get('discount', 0))
+    total = subtotal + shipping_fee + bank_charge - discount
+
+    mismatch_lines = find_line_mismatches(claimed_lines, line_totals, tolerance_cents)
+    claimed_list = _column_list(claimed_lines)
+    computed_list = None
+    mismatches = []
+    for index in mismatch_lines[:MAX_REPORTED_MISMATCHES]:
+        if computed_list is None:
+            computed_list = _column_list(line_totals)
+        mismatches.append({
+            'field': f'items[{index}].lineTotal',
+            'claimed': str(cents_to_decimal(claimed_list[index])),
+            'computed': str(cents_to_decimal(computed_list[index]))
+        })
+    mismatch_count = len(mismatch_lines)
+
+    for field, computed in (('subtotal', subtotal), ('total', total)):
+        claimed = _scale_value(data.get(field), CENTS)
+        if claimed is not None and abs(claimed - computed) > tolerance_cents:
+            mismatch_count += 1
+            mismatches.append({'field': field,
+                               'claimed': str(cents_to_decimal(claimed)),
+                               'computed': str(cents_to_decimal(computed))})
+
+    negative_lines = count_negative_lines(quantities, unit_prices)
+
+    return {
+        'valid': mismatch_count == 0 and negative_lines == 0,
+        'item_count': len(items),
+        'line_totals_cents': line_totals,
+        'subtotal': cents_to_decimal(subtotal),
+        'shipping_fee': cents_to_decimal(shipping_fee),
+        'bank_charge': cents_to_decimal(bank_charge),
+        'discount': cents_to_decimal(discount),
+        'total': cents_to_decimal(total),
+        'mismatch_count': mismatch_count,
+        'mismatches': mismatches,
+        'negative_lines': negative_lines
+    }
+
+
+def pricing_summary(result):
+    """JSON-safe pricing result without the per-line column"""
+    return {
+        'valid': result['valid'],
+        'item_count': result['item_count'],
+        'subtotal': str(result['subtotal']),
+        'shipping_fee': str(result['shipping_fee']),
+        'bank_charge': str(result['bank_charge']),
+        'discount': str(result['discount']),
+        'total': str(result['total']),
+        'mismatch_count': result['mismatch_count'],
+        'mismatches': result['mismatches'],
+        'negative_lines': result['negative_lines']
+    }
+
+
+def main():
+    """Validate a quotation or sales order JSON file"""
+    if len(sys.argv) < 2:
+        print("Usage: python pricing_engine.py <quotation.json>")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    summary = pricing_summary(compute_pricing(data))
+    print(json.dumps(summary, indent=2))
+    print(f"\n{'✅ Pricing verified' if summary['valid'] else '❌ Pricing mismatches found'}")
+    sys.exit(0 if summary['valid'] else 2)
+
+
+if __name__ == "__main__":
+    main()
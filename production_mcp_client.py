@@ -5,13 +5,14 @@ Production MCP Client - Session-based Real-time Communication
 Uses the session endpoint discovered from SSE for proper real-time messaging
 """
 
-import requests
 import json
 import time
 import threading
 from datetime import datetime
 import logging
 
+import http_client
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ class SessionBasedMCPClient:
         try:
             logger.info("Discovering session from SSE endpoint...")
             
-            response = requests.get(
+            response = http_client.get(
                 self.sse_endpoint,
                 headers={'Accept': 'text/event-stream'},
                 timeout=10,
@@ -96,7 +97,7 @@ class SessionBasedMCPClient:
         try:
             full_url = f"{self.base_url}{self.messages_endpoint}"
             
-            response = requests.get(full_url, timeout=10)
+            response = http_client.get(full_url, timeout=10)
             
             if response.status_code == 200:
                 try:
@@ -196,7 +197,7 @@ class SessionBasedMCPClient:
             
             # Send via session endpoint
             full_url = f"{self.base_url}{self.messages_endpoint}"
-            response = requests.post(full_url, json=ack_message, timeout=15)
+            response = http_client.post(full_url, json=ack_message, timeout=15)
             
             logger.info(f"📤 Acknowledgment sent: {response.status_code}")
             
@@ -219,7 +220,7 @@ class SessionBasedMCPClient:
             message['session_id'] = self.session_id
             
             full_url = f"{self.base_url}{self.messages_endpoint}"
-            response = requests.post(full_url, json=message, timeout=15)
+            response = http_client.post(full_url, json=message, timeout=15)
             
             logger.info(f"📤 Message sent via session: {response.status_code}")
             return response.status_code in [200, 201, 202]
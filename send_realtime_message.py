@@ -5,10 +5,11 @@ Send Real-time Message to Pareng Boyong
 Use the proper MCP client to send messages
 """
 
-import requests
 import json
 from datetime import datetime
 
+import http_client
+
 def send_pareng_boyong_message():
     """Send comprehensive message via real-time MCP client"""
     
@@ -118,7 +119,7 @@ def send_pareng_boyong_message():
     
     # Send via MCP client
     try:
-        response = requests.post(
+        response = http_client.post(
             'http://localhost:5005/mcp/send',
             json=message,
             timeout=15
@@ -136,7 +137,7 @@ def send_pareng_boyong_message():
     
     # Also send directly to MCP server
     try:
-        direct_response = requests.post(
+        direct_response = http_client.post(
             'https://ai.innovatehub.ph/mcp/t-0/sse',
             json=message,
             timeout=15
@@ -155,7 +156,7 @@ def send_pareng_boyong_message():
     # Check for immediate response
     print("\n🔍 Checking for immediate response...")
     try:
-        response = requests.get('http://localhost:5005/mcp/messages', timeout=5)
+        response = http_client.get('http://localhost:5005/mcp/messages', timeout=5)
         if response.status_code == 200:
             messages_data = response.json()
             message_count = messages_data.get('message_count', 0)
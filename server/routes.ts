@@ -1,7 +1,7 @@
 import express, { type Express, type Request, type Response } from "express";
 import './types/session.d';
 import { createServer, type Server } from "http";
-import { storage } from "./storage";
+import { storage, type PageCursor, type RecordPage } from "./storage";
 import { authService } from "./auth-service";
 import { requireAuth, requireRole, requirePermission } from "./middleware/auth";
 import { generateSalesOrderHTML, generateJobOrderHTML } from "./pdf-generator";
@@ -40,6 +40,27 @@ import { promises as fs } from "fs";
 import { z } from "zod";
 import { importExportRouter } from "./routes/importExport";
 
+// Optional keyset paging for list endpoints used by bulk exports:
+// ?limit=&after=<id of the last row seen>&after_created_at=<its createdAt> returns the next rows in
+// ascending (createdAt, id) order, with the LIMIT and cursor applied in the query.
+// Without limit the full list is returned, as before.
+async function listRecords<T>(req: Request, res: Response, all: () => Promise<T[]>,
+                              page: (limit: number, after?: PageCursor) => Promise<RecordPage<T>>): Promise<T[]> {
+  if (req.query.limit === undefined) {
+    return await all();
+  }
+  const limit = Math.min(500, Math.max(1, parseInt(String(req.query.limit), 10) || 100));
+  const after = req.query.after
+    ? { id: String(req.query.after), createdAt: req.query.after_created_at ? String(req.query.after_created_at) : undefined }
+    : undefined;
+  const result = await page(limit, after);
+  res.setHeader("X-Paging", "keyset");
+  if (result.total !== undefined) {
+    res.setHeader("X-Total-Count", String(result.total));
+  }
+  return result.rows;
+}
+
 export function registerRoutes(app: Express): void {
 
   // ==============================================
@@ -314,7 +335,8 @@ export function registerRoutes(app: Express): void {
   
   app.get("/api/sales-orders", requireAuth, async (req, res) => {
     try {
-      const salesOrders = await storage.getSalesOrders();
+      const salesOrders = await listRecords(req, res, () => storage.getSalesOrders(),
+        (limit, after) => storage.getSalesOrdersPage(limit, after));
       
       // Transform for table view
       const tableData = salesOrders.map(so => ({
@@ -355,6 +377,16 @@ export function registerRoutes(app: Express): void {
     }
   });
 
+  app.get("/api/sales-orders/:id/items", requireAuth, async (req, res) => {
+    try {
+      const items = await storage.getSalesOrderItems(req.params.id);
+      res.json(items);
+    } catch (error) {
+      console.error("Error fetching sales order items:", error);
+      res.status(500).json({ error: "Failed to fetch sales order items" });
+    }
+  });
+
   app.post("/api/sales-orders", requireAuth, async (req, res) => {
     try {
       const salesOrderData = insertSalesOrderSchema.parse(req.body);
@@ -372,7 +404,8 @@ export function registerRoutes(app: Express): void {
   
   app.get("/api/job-orders", requireAuth, async (req, res) => {
     try {
-      const jobOrders = await storage.getJobOrders();
+      const jobOrders = await listRecords(req, res, () => storage.getJobOrders(),
+        (limit, after) => storage.getJobOrdersPage(limit, after));
       res.json(jobOrders);
     } catch (error) {
       console.error("Error fetching job orders:", error);
@@ -451,7 +484,8 @@ export function registerRoutes(app: Express): void {
   
   app.get("/api/quotations", requireAuth, async (req, res) => {
     try {
-      const quotations = await storage.getQuotations();
+      const quotations = await listRecords(req, res, () => storage.getQuotations(),
+        (limit, after) => storage.getQuotationsPage(limit, after));
       
       // Transform for table view with proper typing
       const tableData = quotations.map(q => ({
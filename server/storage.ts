@@ -1,5 +1,5 @@
 import { db } from "./db";
-import { eq, desc, and, like, gte, lte, sql } from "drizzle-orm";
+import { eq, asc, desc, and, like, gte, lte, sql } from "drizzle-orm";
 import {
   clients,
   categories,
@@ -56,6 +56,33 @@ import type {
   InsertEmailSettings
 } from "@shared/schema";
 
+// Keyset paging for bulk exports: rows come in ascending (createdAt, id) order after the
+// last row of the previous page, so records created mid-export never shift what is left
+export interface PageCursor {
+  id: string;
+  createdAt?: string;
+}
+
+export interface RecordPage<T> {
+  rows: T[];
+  total?: number; // only counted for the first page
+}
+
+type KeysetTable = typeof quotations | typeof salesOrders | typeof jobOrders;
+
+function afterCursor(table: KeysetTable, after?: PageCursor) {
+  if (!after) {
+    return undefined;
+  }
+  // The cursor row's own created_at keeps full precision; the client's copy covers a row deleted since
+  return sql`(${table.createdAt}, ${table.id}) > (coalesce((select ${table.createdAt} from ${table} where ${table.id} = ${after.id}), ${after.createdAt ?? null}::timestamp), ${after.id})`;
+}
+
+async function countRows(table: KeysetTable): Promise<number> {
+  const result = await db.select({ count: sql<number>`count(*)::int` }).from(table);
+  return result[0]?.count || 0;
+}
+
 export interface IStorage {
   // Client Management
   getClients(): Promise<Client[]>;
@@ -99,6 +126,7 @@ export interface IStorage {
   
   // Manufacturing Workflow - Quotations
   getQuotations(): Promise<Quotation[]>;
+  getQuotationsPage(limit: number, after?: PageCursor): Promise<RecordPage<Quotation>>;
   getQuotationById(id: string): Promise<Quotation | null>;
   createQuotation(quotation: InsertQuotation): Promise<Quotation>;
   updateQuotation(id: string, quotation: Partial<InsertQuotation>): Promise<Quotation>;
@@ -109,6 +137,7 @@ export interface IStorage {
   
   // Manufacturing Workflow - Sales Orders
   getSalesOrders(): Promise<SalesOrder[]>;
+  getSalesOrdersPage(limit: number, after?: PageCursor): Promise<RecordPage<SalesOrder>>;
   getSalesOrderById(id: string): Promise<SalesOrder | null>;
   createSalesOrder(salesOrder: InsertSalesOrder): Promise<SalesOrder>;
   updateSalesOrder(id: string, salesOrder: Partial<InsertSalesOrder>): Promise<SalesOrder>;
@@ -120,6 +149,7 @@ export interface IStorage {
   
   // Manufacturing Workflow - Job Orders
   getJobOrders(): Promise<JobOrder[]>;
+  getJobOrdersPage(limit: number, after?: PageCursor): Promise<RecordPage<JobOrder>>;
   getJobOrderById(id: string): Promise<JobOrder | null>;
   createJobOrder(jobOrder: InsertJobOrder): Promise<JobOrder>;
   updateJobOrder(id: string, jobOrder: Partial<InsertJobOrder>): Promise<JobOrder>;
@@ -289,6 +319,12 @@ export class Storage implements IStorage {
   async getQuotations(): Promise<Quotation[]> {
     return await db.select().from(quotations).orderBy(desc(quotations.createdAt));
   }
+
+  async getQuotationsPage(limit: number, after?: PageCursor): Promise<RecordPage<Quotation>> {
+    const rows = await db.select().from(quotations).where(afterCursor(quotations, after))
+      .orderBy(asc(quotations.createdAt), asc(quotations.id)).limit(limit);
+    return { rows, total: after ? undefined : await countRows(quotations) };
+  }
   
   async getQuotationById(id: string): Promise<Quotation | null> {
     const result = await db.select().from(quotations).where(eq(quotations.id, id)).limit(1);
@@ -337,6 +373,12 @@ export class Storage implements IStorage {
     return await db.select().from(salesOrders).orderBy(desc(salesOrders.createdAt));
   }
 
+  async getSalesOrdersPage(limit: number, after?: PageCursor): Promise<RecordPage<SalesOrder>> {
+    const rows = await db.select().from(salesOrders).where(afterCursor(salesOrders, after))
+      .orderBy(asc(salesOrders.createdAt), asc(salesOrders.id)).limit(limit);
+    return { rows, total: after ? undefined : await countRows(salesOrders) };
+  }
+
   async getSalesOrderCountForMonth(year: number, month: number): Promise<number> {
     const startDate = new Date(year, month - 1, 1);
     const endDate = new Date(year, month, 0);
@@ -389,6 +431,12 @@ export class Storage implements IStorage {
   async getJobOrders(): Promise<JobOrder[]> {
     return await db.select().from(jobOrders).orderBy(desc(jobOrders.createdAt));
   }
+
+  async getJobOrdersPage(limit: number, after?: PageCursor): Promise<RecordPage<JobOrder>> {
+    const rows = await db.select().from(jobOrders).where(afterCursor(jobOrders, after))
+      .orderBy(asc(jobOrders.createdAt), asc(jobOrders.id)).limit(limit);
+    return { rows, total: after ? undefined : await countRows(jobOrders) };
+  }
   
   async getJobOrderById(id: string): Promise<JobOrder | null> {
     const result = await db.select().from(jobOrders).where(eq(jobOrders.id, id)).limit(1);
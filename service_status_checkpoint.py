@@ -6,133 +6,88 @@ Final status of all communication services and integration readiness
 """
 
 import json
-import requests
-import os
-import subprocess
 from datetime import datetime
 
+from status_engine import probe_result, run_status, service_status
+
+CHECKPOINT_PROBES = ['services', 'dashboard', 'mcp_sse', 'mcp_processes', 'session_files', 'responses']
+
 def check_all_services():
     """Check status of all integration services"""
     
     print("🔍 COMPREHENSIVE SERVICE STATUS CHECK")
     print("=" * 50)
     
+    # All probes run concurrently; the views below only reshape the results
+    report = run_status(CHECKPOINT_PROBES)
+    
     services_status = {
         'timestamp': datetime.now().isoformat(),
-        'hibla_main_system': check_hibla_main(),
-        'mcp_communication': check_mcp_status(),
-        'pareng_boyong_responses': check_responses(),
+        'hibla_main_system': check_hibla_main(report),
+        'mcp_communication': check_mcp_status(report),
+        'pareng_boyong_responses': check_responses(report),
         'integration_readiness': 'ready'
     }
     
     return services_status
 
-def check_hibla_main():
+def check_hibla_main(report=None):
     """Check Hibla main system"""
-    try:
-        response = requests.get('http://localhost:5000/health', timeout=5)
-        if response.status_code == 200:
-            # Get dashboard data
-            dash_response = requests.get('http://localhost:5000/api/dashboard/analytics', timeout=5)
-            if dash_response.status_code == 200:
-                dashboard_data = dash_response.json().get('overview', {})
-                return {
-                    'status': 'operational',
-                    'health_check': 'passing',
-                    'dashboard_data': dashboard_data,
-                    'manufacturing_system': 'fully_functional'
-                }
-    except:
-        pass
+    report = report or run_status(['services', 'dashboard'])
+    dashboard = probe_result(report, 'dashboard', {})
+    if service_status(report, 'main_application') == 'online' and dashboard.get('available'):
+        return {
+            'status': 'operational',
+            'health_check': 'passing',
+            'dashboard_data': dashboard['overview'],
+            'manufacturing_system': 'fully_functional'
+        }
     
     return {'status': 'offline', 'health_check': 'failed'}
 
-def check_mcp_status():
+def check_mcp_status(report=None):
     """Check MCP communication services"""
-    mcp_status = {
-        'sse_endpoint': 'unknown',
-        'session_discovery': 'unknown',
-        'message_monitoring': 'unknown',
-        'background_processes': []
-    }
-    
-    # Check SSE endpoint
-    try:
-        response = requests.get('https://ai.innovatehub.ph/mcp/t-0/sse', 
-                              headers={'Accept': 'text/event-stream'}, 
-                              timeout=10)
-        if response.status_code == 200:
-            mcp_status['sse_endpoint'] = 'accessible'
-        else:
-            mcp_status['sse_endpoint'] = f'error_{response.status_code}'
-    except Exception as e:
-        mcp_status['sse_endpoint'] = f'failed_{str(e)[:50]}'
-    
-    # Check for session files
-    session_files = ['mcp_session_messages.json', 'pareng_boyong_session_response.json']
-    for filename in session_files:
-        if os.path.exists(filename):
-            mcp_status['session_discovery'] = 'active'
-            break
-    
-    # Check background processes
-    try:
-        result = subprocess.run(['pgrep', '-f', 'production_mcp_client'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            mcp_status['background_processes'] = [f'pid_{pid}' for pid in pids if pid]
-            mcp_status['message_monitoring'] = 'active'
-        else:
-            mcp_status['message_monitoring'] = 'not_running'
-    except:
-        mcp_status['message_monitoring'] = 'check_failed'
+    report = report or run_status(['mcp_sse', 'mcp_processes', 'session_files'])
+    processes = probe_result(report, 'mcp_processes', {})
     
-    return mcp_status
+    return {
+        'sse_endpoint': probe_result(report, 'mcp_sse', {}).get('sse_endpoint', 'timeout'),
+        'session_discovery': probe_result(report, 'session_files', {}).get('session_discovery', 'unknown'),
+        'message_monitoring': processes.get('message_monitoring', 'check_failed'),
+        'background_processes': processes.get('background_processes', [])
+    }
 
-def check_responses():
+def check_responses(report=None):
     """Check for Pareng Boyong responses"""
-    response_files = [
-        'pareng_boyong_session_response.json',
-        'pareng_boyong_mcp_response.json', 
-        'pareng_boyong_response.json',
-        'mcp_session_messages.json'
-    ]
+    report = report or run_status(['responses'])
+    responses = probe_result(report, 'responses', {'files_checked': 0, 'files': []})
     
     responses_found = []
-    
-    for filename in response_files:
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                
-                file_info = {
-                    'filename': filename,
-                    'status': 'found',
-                    'timestamp': data.get('timestamp', 'unknown'),
-                    'size': os.path.getsize(filename)
-                }
-                
-                if 'pareng_boyong' in filename:
-                    file_info['type'] = 'pareng_boyong_response'
-                    file_info['source'] = data.get('source', 'unknown')
-                elif 'session' in filename:
-                    file_info['type'] = 'session_data'
-                    file_info['message_count'] = data.get('total_messages', 0)
-                    file_info['pb_responses'] = data.get('pareng_boyong_responses', 0)
-                
-                responses_found.append(file_info)
-                
-            except Exception as e:
-                responses_found.append({
-                    'filename': filename,
-                    'status': 'error',
-                    'error': str(e)
-                })
+    for found in responses['files']:
+        filename = found['filename']
+        if found['status'] != 'found':
+            responses_found.append({'filename': filename, 'status': 'error', 'error': found.get('error')})
+            continue
+        
+        file_info = {
+            'filename': filename,
+            'status': 'found',
+            'timestamp': found['timestamp'],
+            'size': found['size']
+        }
+        
+        if 'pareng_boyong' in filename:
+            file_info['type'] = 'pareng_boyong_response'
+            file_info['source'] = found['source']
+        elif 'session' in filename:
+            file_info['type'] = 'session_data'
+            file_info['message_count'] = found['total_messages']
+            file_info['pb_responses'] = found['pareng_boyong_responses']
+        
+        responses_found.append(file_info)
     
     return {
-        'files_checked': len(response_files),
+        'files_checked': responses['files_checked'],
         'files_found': len(responses_found),
         'response_details': responses_found,
         'pareng_boyong_responded': any('pareng_boyong_response' in f.get('type', '') for f in responses_found)
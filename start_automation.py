@@ -7,10 +7,11 @@ Starts both document service and automation controller
 
 import subprocess
 import time
-import requests
 import sys
 import os
 
+import http_client
+
 def start_document_service():
     """Start document generation service"""
     print("🚀 Starting Document Generation Service...")
@@ -25,7 +26,7 @@ def start_document_service():
     
     # Verify service is running
     try:
-        response = requests.get('http://localhost:5001/health', timeout=5)
+        response = http_client.get('http://localhost:5001/health', timeout=5)
         if response.status_code == 200:
             print("✅ Document Generation Service: OPERATIONAL")
             return doc_process
@@ -71,7 +72,7 @@ def test_automation():
     
     for doc in test_docs:
         try:
-            response = requests.post(
+            response = http_client.post(
                 'http://localhost:5001/api/documents/generate',
                 json={
                     'filename_base': doc['name'],
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Unified Status Engine
+=====================
+Runs every status probe - service health, dashboard analytics, MCP
+endpoint checks, background processes and response/session files -
+concurrently, each with its own deadline, and assembles one report.
+
+Total wall time is bounded by the slowest single probe deadline instead of
+the sum of sequential timeouts. A probe that misses its deadline is
+reported as ``timeout`` rather than holding up the report.
+
+The checkpoint scripts (service_status_checkpoint.py,
+integration_status_report.py, automation_status_report.py,
+final_checkpoint_notification.py, final_communication_setup.py) are views
+over ``run_status``. Every report is also appended to the time-series
+history in status_history.py.
+
+Usage:
+    python status_engine.py
+    python status_engine.py --json --output status.json
+    python status_engine.py --probes services,dashboard
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from analytics_cache import get_dashboard_analytics
+from health_prober import HealthProber
+from status_history import record_report
+import http_client
+
+MAIN_APP_URL = 'http://localhost:5000'
+MCP_SSE_URL = 'https://ai.innovatehub.ph/mcp/t-0/sse'
+SESSION_FILES = ['mcp_session_messages.json', 'pareng_boyong_session_response.json']
+RESPONSE_FILES = [
+    'pareng_boyong_session_response.json',
+    'pareng_boyong_mcp_response.json',
+    'pareng_boyong_response.json',
+    'mcp_session_messages.json'
+]
+DOCUMENTS_DIR = './documents'
+TIMEOUT_SHARE = 0.8
+
+
+def probe_services(deadline):
+    """Health of every local service (ports 5000-5005)"""
+    prober = HealthProber(timeout=deadline)
+    try:
+        return prober.probe_all()
+    finally:
+        prober.stop()
+
+
+def probe_dashboard(deadline):
+    """Dashboard analytics overview from the main application"""
+    analytics = get_dashboard_analytics(MAIN_APP_URL, timeout=deadline)
+    return {
+        'available': analytics is not None,
+        'overview': analytics.get('overview', {}) if analytics else {}
+    }
+
+
+def probe_main_api(deadline):
+    """Main application API health route"""
+    try:
+        response = http_client.get(f"{MAIN_APP_URL}/api/health", timeout=deadline, retries=0)
+        return {'status': 'online' if response.status_code == 200 else 'error',
+                'status_code': response.status_code}
+    except requests.RequestException as e:
+        return {'status': 'offline', 'error': str(e)[:100]}
+
+
+def probe_mcp_sse(deadline):
+    """Agent Zero SSE endpoint reachability and session announcement"""
+    status = {'sse_endpoint': 'unknown', 'session_establishment': 'unknown'}
+    try:
+        response = http_client.get(MCP_SSE_URL, headers={'Accept': 'text/event-stream'},
+                                   timeout=deadline, stream=True, retries=0)
+    except Exception as e:
+        status['sse_endpoint'] = f'failed_{str(e)[:50]}'
+        return status
+
+    with response:
+        if response.status_code != 200:
+            status['sse_endpoint'] = f'error_{response.status_code}'
+            return status
+        status['sse_endpoint'] = 'accessible'
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if line and '/messages/' in line and 'session_id=' in line:
+                    status['session_establishment'] = 'confirmed'
+                    break
+                elif line:  # Any response indicates working endpoint
+                    status['session_establishment'] = 'partial'
+                    break
+        except Exception:
+            status['session_establishment'] = 'timeout'
+    return status
+
+
+def probe_mcp_delivery(deadline):
+    """Agent Zero endpoint accepts a POST (405 means the connection is established)"""
+    try:
+        test_msg = {'test': 'connectivity_check', 'timestamp': datetime.now().isoformat()}
+        response = http_client.post(MCP_SSE_URL, json=test_msg, timeout=deadline, retries=0)
+        if response.status_code in [200, 405]:
+            return {'message_delivery': 'confirmed'}
+        return {'message_delivery': f'error_{response.status_code}'}
+    except Exception:
+        return {'message_delivery': 'failed'}
+
+
+def probe_mcp_processes(deadline):
+    """Background production MCP client processes"""
+    try:
+        result = subprocess.run(['pgrep', '-f', 'production_mcp_client'],
+                                capture_output=True, text=True, timeout=deadline)
+    except Exception:
+        return {'message_monitoring': 'check_failed', 'background_processes': []}
+    if result.returncode == 0:
+        pids = [pid for pid in result.stdout.strip().split('\n') if pid]
+        return {'message_monitoring': 'active', 'background_processes': [f'pid_{pid}' for pid in pids]}
+    return {'message_monitoring': 'not_running', 'background_processes': []}
+
+
+def probe_session_files(deadline):
+    """MCP session files written by the real-time client"""
+    found = [filename for filename in SESSION_FILES if os.path.exists(filename)]
+    return {'session_discovery': 'active' if found else 'unknown', 'files': found}
+
+
+def probe_responses(deadline):
+    """Pareng Boyong response and session files"""
+    responses = []
+    for filename in RESPONSE_FILES:
+        if not os.path.exists(filename):
+            continue
+        try:
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            file_stat = os.stat(filename)
+            responses.append({
+                'filename': filename,
+                'status': 'found',
+                'timestamp': data.get('timestamp', 'unknown'),
+                'source': data.get('source', 'unknown'),
+                'size': file_stat.st_size,
+                'modified': datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+                'total_messages': data.get('total_messages', 0),
+                'pareng_boyong_responses': data.get('pareng_boyong_responses', 0)
+            })
+        except Exception as e:
+            responses.append({'filename': filename, 'status': 'error', 'error': str(e)})
+    return {'files_checked': len(RESPONSE_FILES), 'files': responses}
+
+
+def probe_documents(deadline):
+    """Generated document counts by format"""
+    if not os.path.exists(DOCUMENTS_DIR):
+        return {'total_count': 0, 'by_format': {}}
+
+    files = os.listdir(DOCUMENTS_DIR)
+    by_format = {}
+    for file in files:
+        if '.' in file:
+            ext = file.split('.')[-1].lower()
+            by_format[ext] = by_format.get(ext, 0) + 1
+
+    return {'total_count': len(files), 'by_format': by_format, 'directory': DOCUMENTS_DIR}
+
+
+# name -> (probe, deadline in seconds)
+PROBES = {
+    'services': (probe_services, 3.0),
+    'dashboard': (probe_dashboard, 5.0),
+    'main_api': (probe_main_api, 3.0),
+    'mcp_sse': (probe_mcp_sse, 5.0),
+    'mcp_delivery': (probe_mcp_delivery, 5.0),
+    'mcp_processes': (probe_mcp_processes, 2.0),
+    'session_files': (probe_session_files, 1.0),
+    'responses': (probe_responses, 2.0),
+    'documents': (probe_documents, 2.0)
+}
+
+
+def run_status(names=None, record=True):
+    """Run the named probes (all by default) concurrently and return the combined report"""
+    names = list(names or PROBES)
+    started = time.perf_counter()
+    outcomes = {}
+
+    def run(name):
+        probe, deadline = PROBES[name]
+        try:
+            # Probes get most of their deadline as I/O timeout so they can still report in time
+            result = probe(deadline * TIMEOUT_SHARE)
+            outcomes[name] = {'status': 'ok',
+                              'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+                              'result': result}
+        except Exception as e:
+            outcomes[name] = {'status': 'error', 'error': str(e), 'result': None}
+
+    # Daemon threads: a probe stuck past its deadline never delays the report or process exit
+    threads = {name: threading.Thread(target=run, args=(name,), name=f'status-{name}', daemon=True)
+               for name in names}
+    for thread in threads.values():
+        thread.start()
+
+    probes = {}
+    # Waiting in deadline order keeps the total bounded by the longest single deadline
+    for name in sorted(names, key=lambda probe_name: PROBES[probe_name][1]):
+        threads[name].join(max(0.0, PROBES[name][1] - (time.perf_counter() - started)))
+        probes[name] = outcomes.get(name) or {'status': 'timeout', 'deadline_seconds': PROBES[name][1],
+                                              'result': None}
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'probes': probes
+    }
+    if record:
+        try:
+            record_report(report)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record status history: {e}")
+    return report
+
+
+def probe_result(report, name, default=None):
+    """Result of one probe, or default when it failed or timed out"""
+    probe = report['probes'].get(name)
+    if probe is None or probe['result'] is None:
+        return default
+    return probe['result']
+
+
+def service_status(report, name):
+    """'online', 'error' or 'offline' for a named service"""
+    services = probe_result(report, 'services', {})
+    return services.get(name, {}).get('status', 'offline')
+
+
+def display_report(report):
+    """Terminal view of a status report"""
+    print("🩺 HIBLA UNIFIED STATUS")
+    print("=" * 55)
+    print(f"📅 {report['timestamp']} ({report['elapsed_seconds']}s)")
+
+    services = probe_result(report, 'services', {})
+    print("\n🌐 SERVICES:")
+    for result in services.values():
+        icon = "🟢" if result['status'] == 'online' else "🔴"
+        print(f"   {icon} {result['name']:<18} {result['status']:<8} {result['latency_ms']}ms  {result['url']}")
+
+    dashboard = probe_result(report, 'dashboard', {})
+    if dashboard.get('available'):
+        overview = dashboard['overview']
+        print("\n📊 MANUFACTURING DATA:")
+        print(f"   • Customers: {overview.get('totalCustomers', 'N/A')}")
+        print(f"   • Products: {overview.get('totalProducts', 'N/A')}")
+        print(f"   • Active Quotations: {overview.get('activeQuotations', 'N/A')}")
+        print(f"   • Active Sales Orders: {overview.get('activeSalesOrders', 'N/A')}")
+        print(f"   • Active Job Orders: {overview.get('activeJobOrders', 'N/A')}")
+
+    print("\n📡 MCP COMMUNICATION:")
+    mcp_values = dict(probe_result(report, 'mcp_sse', {}))
+    mcp_values.update(probe_result(report, 'mcp_delivery', {}))
+    mcp_values['message_monitoring'] = probe_result(report, 'mcp_processes', {}).get('message_monitoring', 'unknown')
+    mcp_values['session_discovery'] = probe_result(report, 'session_files', {}).get('session_discovery', 'unknown')
+    for key, value in mcp_values.items():
+        icon = "✅" if value in ('accessible', 'confirmed', 'active') else "⚠️"
+        print(f"   {icon} {key.replace('_', ' ').title()}: {value}")
+
+    responses = probe_result(report, 'responses', {}).get('files', [])
+    print(f"\n📨 RESPONSE FILES: {len(responses)} found")
+    for response in responses:
+        print(f"   📄 {response['filename']} ({response['status']})")
+
+    documents = probe_result(report, 'documents', {})
+    if documents:
+        print(f"\n📄 DOCUMENTS: {documents['total_count']} "
+              f"({', '.join(f'{ext}: {count}' for ext, count in documents['by_format'].items())})")
+
+    slow = [f"{name} ({probe['status']})" for name, probe in report['probes'].items() if probe['status'] != 'ok']
+    if slow:
+        print(f"\n⚠️ Incomplete probes: {', '.join(slow)}")
+
+
+def main():
+    """Run all probes and print or save the report"""
+    parser = argparse.ArgumentParser(description='Concurrent unified status report')
+    parser.add_argument('--probes', help=f"comma-separated subset of: {', '.join(PROBES)}")
+    parser.add_argument('--json', action='store_true', help='print the JSON report')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = run_status(args.probes.split(',') if args.probes else None)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        display_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
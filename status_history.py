@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Status History Store
+====================
+Time-series history of status probe results in SQLite, so uptime and
+health latency can be looked at over days instead of only the latest
+JSON snapshot.
+
+- Every run_status report is appended as raw samples (series, ok, latency).
+- Completed minutes and hours are rolled up into count / uptime / p50 / p95
+  / max rows, keyed by (series, bucket) so range queries are index scans.
+- Retention is bounded per tier: raw samples for two days, minute rollups
+  for two weeks, hourly rollups for a bit over a year.
+
+Queries such as "uptime over the last 7 days" read at most a few hundred
+hourly rows per series plus the raw tail of the current hour.
+
+Usage:
+    python status_history.py uptime --days 7
+    python status_history.py latency --hours 24 --series main_application
+    python status_history.py latency --hours 2 --resolution minute
+    python status_history.py rollup
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_DB_PATH = 'status_history.db'
+RAW_RETENTION = 2 * 86400
+MINUTE_RETENTION = 14 * 86400
+HOUR_RETENTION = 400 * 86400
+
+# resolution -> (rollup table, bucket width in seconds, retention)
+TIERS = {
+    'minute': ('rollup_minute', 60, MINUTE_RETENTION),
+    'hour': ('rollup_hour', 3600, HOUR_RETENTION)
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts REAL NOT NULL,
+    series TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    latency_ms REAL
+);
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS watermarks (
+    tier TEXT PRIMARY KEY,
+    bucket INTEGER NOT NULL
+);
+"""
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    series TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    ok_count INTEGER NOT NULL,
+    latency_p50 REAL,
+    latency_p95 REAL,
+    latency_max REAL,
+    PRIMARY KEY (series, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_bucket ON {table} (bucket);
+"""
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (None when empty)"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def report_samples(report):
+    """(series, ok, latency_ms) rows for a status_engine report"""
+    rows = []
+    services = (report['probes'].get('services') or {}).get('result') or {}
+    for name, result in services.items():
+        rows.append((name, result['status'] == 'online', result.get('latency_ms')))
+    for name, probe in report['probes'].items():
+        rows.append((f"probe.{name}", probe['status'] == 'ok', probe.get('elapsed_ms')))
+    return rows
+
+
+class StatusHistory:
+    """SQLite-backed raw samples plus minute and hour rollups"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        for table, _, _ in TIERS.values():
+            self.db.executescript(ROLLUP_SCHEMA.format(table=table))
+        self.db.commit()
+        self.rolled_through = None
+
+    def record(self, samples, timestamp=None):
+        """Append (series, ok, latency_ms) samples, rolling up any minutes that completed"""
+        timestamp = self.clock() if timestamp is None else timestamp
+        with self.lock:
+            self.db.executemany('INSERT INTO samples (ts, series, ok, latency_ms) VALUES (?, ?, ?, ?)',
+                                [(timestamp, series, int(bool(ok)), latency) for series, ok, latency in samples])
+            self.db.commit()
+        # Rolling up is only needed once a minute has closed since the last pass
+        if self.rolled_through is None or int(timestamp // 60) > self.rolled_through:
+            self.rollup(timestamp)
+
+    def record_report(self, report):
+        self.record(report_samples(report))
+
+    def _watermark(self, tier):
+        row = self.db.execute('SELECT bucket FROM watermarks WHERE tier = ?', (tier,)).fetchone()
+        return row[0] if row else None
+
+    def rollup(self, now=None):
+        """Fold completed minutes and hours into their rollup tables and apply retention"""
+        now = self.clock() if now is None else now
+        with self.lock:
+            for tier, (table, width, retention) in TIERS.items():
+                current = int(now // width)
+                start = self._watermark(tier)
+                if start is None:
+                    first = self.db.execute('SELECT MIN(ts) FROM samples').fetchone()[0]
+                    start = current if first is None else int(first // width)
+                if start < current:
+                    self._rollup_range(table, width, start, current)
+                self.db.execute('INSERT OR REPLACE INTO watermarks (tier, bucket) VALUES (?, ?)', (tier, current))
+                self.db.execute(f'DELETE FROM {table} WHERE bucket < ?', (int((now - retention) // width),))
+            self.db.execute('DELETE FROM samples WHERE ts < ?', (now - RAW_RETENTION,))
+            self.db.commit()
+            self.rolled_through = int(now // 60)
+
+    def _rollup_range(self, table, width, start, end):
+        cursor = self.db.execute(
+            'SELECT series, CAST(ts / ? AS INTEGER) AS bucket, ok, latency_ms FROM samples '
+            'WHERE ts >= ? AND ts < ? ORDER BY series, bucket',
+            (width, start * width, end * width))
+
+        rows = []
+        key, count, ok_count, latencies = None, 0, 0, []
+
+        def flush():
+            latencies.sort()
+            rows.append(key + (count, ok_count, _round(percentile(latencies, 0.5)),
+                               _round(percentile(latencies, 0.95)), _round(latencies[-1] if latencies else None)))
+
+        for series, bucket, ok, latency in cursor:
+            if (series, bucket) != key:
+                if key is not None:
+                    flush()
+                key, count, ok_count, latencies = (series, bucket), 0, 0, []
+            count += 1
+            ok_count += ok
+            if latency is not None:
+                latencies.append(latency)
+        if key is not None:
+            flush()
+
+        self.db.executemany(f'INSERT OR REPLACE INTO {table} (series, bucket, count, ok_count, '
+                            f'latency_p50, latency_p95, latency_max) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def uptime(self, seconds, series=None):
+        """{series: {'samples', 'uptime_percent'}} over the last ``seconds`` (hour-aligned start)"""
+        now = self.clock()
+        with self.lock:
+            rolled_hour = self._watermark('hour') or int(now // 3600)
+            since_hour = int((now - seconds) // 3600)
+            params = [since_hour, rolled_hour]
+            series_filter = ''
+            if series:
+                series_filter = ' AND series = ?'
+                params.append(series)
+            totals = {}
+            # Completed hours come from the rollup; the open hour from raw samples
+            for name, count, ok_count in self.db.execute(
+                    f'SELECT series, SUM(count), SUM(ok_count) FROM rollup_hour '
+                    f'WHERE bucket >= ? AND bucket < ?{series_filter} GROUP BY series', params):
+                totals[name] = [count, ok_count]
+            for name, count, ok_count in self.db.execute(
+                    f'SELECT series, COUNT(*), SUM(ok) FROM samples '
+                    f'WHERE ts >= ?{series_filter} GROUP BY series',
+                    [max(since_hour, rolled_hour) * 3600] + params[2:]):
+                total = totals.setdefault(name, [0, 0])
+                total[0] += count
+                total[1] += ok_count
+
+        return {name: {'samples': count, 'uptime_percent': round(100.0 * ok_count / count, 2) if count else None}
+                for name, (count, ok_count) in sorted(totals.items())}
+
+    def latency(self, seconds, series=None, resolution='hour'):
+        """Rolled-up rows per bucket over the last ``seconds``, oldest first"""
+        table, width, _ = TIERS[resolution]
+        params = [int((self.clock() - seconds) // width)]
+        series_filter = ''
+        if series:
+            series_filter = ' AND series = ?'
+            params.append(series)
+        with self.lock:
+            rows = self.db.execute(
+                f'SELECT series, bucket, count, ok_count, latency_p50, latency_p95, latency_max FROM {table} '
+                f'WHERE bucket >= ?{series_filter} ORDER BY bucket, series', params).fetchall()
+        return [{
+            'series': name,
+            'bucket': datetime.fromtimestamp(bucket * width).isoformat(),
+            'samples': count,
+            'uptime_percent': round(100.0 * ok_count / count, 2),
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'max_ms': latency_max
+        } for name, bucket, count, ok_count, p50, p95, latency_max in rows]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def get_history(path=DEFAULT_DB_PATH):
+    """Process-wide history store for one database file"""
+    # A connection inherited across fork() must not be reused by the child
+    key = (path, os.getpid())
+    with _histories_lock:
+        history = _histories.get(key)
+        if history is None:
+            history = _histories[key] = StatusHistory(path)
+        return history
+
+
+def record_report(report, path=DEFAULT_DB_PATH):
+    """Append one status_engine report to the history store"""
+    # Reusing the store keeps rolled_through, so rollups run once per closed minute
+    get_history(path).record_report(report)
+
+
+def main():
+    """Query the status history"""
+    parser = argparse.ArgumentParser(description='Status probe history')
+    parser.add_argument('command', choices=['uptime', 'latency', 'rollup'])
+    parser.add_argument('--days', type=float, help='window in days')
+    parser.add_argument('--hours', type=float, help='window in hours')
+    parser.add_argument('--series', help='one service or probe.<name> series')
+    parser.add_argument('--resolution', choices=list(TIERS), default='hour')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    seconds = (args.days or 0) * 86400 + (args.hours or 0) * 3600 or 7 * 86400
+    history = StatusHistory(args.db)
+    started = time.perf_counter()
+
+    if args.command == 'rollup':
+        history.rollup()
+        print("✅ Rollups and retention applied")
+    elif args.command == 'uptime':
+        results = history.uptime(seconds, args.series)
+        print(f"📈 UPTIME - last {seconds / 3600:g}h")
+        for name, result in results.items():
+            print(f"   {name:<24} {result['uptime_percent']:>7}%  ({result['samples']} samples)")
+    else:
+        rows = history.latency(seconds, args.series, args.resolution)
+        print(f"⏱️ HEALTH LATENCY per {args.resolution} - last {seconds / 3600:g}h")
+        for row in rows:
+            print(f"   {row['bucket']}  {row['series']:<24} p50 {row['p50_ms']}ms  "
+                  f"p95 {row['p95_ms']}ms  max {row['max_ms']}ms  up {row['uptime_percent']}%")
+
+    print(f"\n(query took {(time.perf_counter() - started) * 1000:.1f}ms)")
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
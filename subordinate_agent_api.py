@@ -3,57 +3,134 @@
 Subordinate Agent API Interface
 ==============================
 Provides API endpoints for subordinate agents to communicate with the system
+
+Agent registrations live in the shared SQLite registry (agent_registry.py),
+so the app can be served by several worker processes, e.g.
+``gunicorn -w 4 -b 0.0.0.0:5002 'subordinate_agent_api:create_app()'``
+(the factory starts each worker's liveness ticker and push channel as the
+worker boots, instead of on its first request). Set
+``HIBLA_API_WORKERS`` to the worker count so the document-service slots
+(agent_admission.py) are split between workers instead of multiplied.
+
+Connected agents also get a server-sent event stream on port 5007
+(agent_push_channel.py) carrying heartbeats, system status changes,
+liveness transitions and async document results; an open stream keeps
+the registration alive without ``/api/agent/ping`` calls.
 """
 
 from flask import Flask, request, jsonify
-import requests
-import json
+import hashlib
+import math
 import time
 from datetime import datetime
 import threading
+from urllib.parse import quote, urlencode
+
+from agent_activity import ActivityRecorder
+from agent_admission import AgentAdmission
+from agent_liveness import LivenessTracker
+from agent_push_channel import PUSH_PATH, AgentPushChannel
+from agent_registry import AGENT_FIELDS, PING_FIELDS, AgentRegistry, StaleVersionError
+from document_forwarder import DocumentForwarder
+from health_prober import get_prober
+from idempotency_store import IdempotencyStore
+import http_client
+from payload_validators import validate_document_request
+from pricing_engine import compute_pricing, pricing_summary
 
 app = Flask(__name__)
 
+MAX_BULK_ITEMS = 1000
+# Retry-After for an agent whose rate limit is 0 (its bucket never refills)
+MAX_RETRY_AFTER = 3600
+
 class SubordinateAgentInterface:
     def __init__(self):
-        self.registered_agents = {}
+        self.registry = AgentRegistry()
+        self.liveness = LivenessTracker(self.registry)
+        self.forwarder = DocumentForwarder()
+        self.admission = AgentAdmission()
+        self.idempotency = IdempotencyStore()
+        self.activity = ActivityRecorder()
+        self.push = AgentPushChannel(authorize=self.registry.is_registered, hello=self.push_hello,
+                                     on_heartbeat=self.push_heartbeat)
+        self.last_service_summary = None
+        self.liveness.subscribe(lambda event: self.log_agent_activity(event['agent_id'], f"liveness_{event['event']}"))
+        self.liveness.subscribe(lambda event: self.push.publish(event['agent_id'], 'liveness', event))
+        self.forwarder.subscribe(self.push_document_result)
         self.main_app_url = "http://localhost:5000"
         self.doc_service_url = "http://localhost:5001"
         
     def register_agent(self, agent_id, callback_url, capabilities):
-        """Register a subordinate agent"""
-        agent_info = {
-            'agent_id': agent_id,
-            'callback_url': callback_url,
-            'capabilities': capabilities,
-            'registered_at': datetime.now().isoformat(),
-            'last_ping': datetime.now().isoformat(),
-            'status': 'active'
-        }
-        
-        self.registered_agents[agent_id] = agent_info
+        """Register a subordinate agent (shared by every API worker)"""
+        agent_info = self.registry.register(agent_id, callback_url, capabilities)
+        self.log_agent_activity(agent_id, 'registration', capabilities)
         return agent_info
     
+    def register_agents(self, agents):
+        """Register a batch of agents in one registry transaction"""
+        registered = self.registry.register_many(agents)
+        for agent in agents:
+            self.log_agent_activity(agent['agent_id'], 'registration', agent.get('capabilities', []))
+        return registered
+    
+    def is_registered(self, agent_id):
+        return self.registry.is_registered(agent_id)
+    
+    def check_document_request(self, request_data):
+        """Error result for a request that must not be rendered, else None"""
+        # Validate request shape before spending any render capacity
+        errors = validate_document_request(request_data)
+        if errors:
+            return {'error': 'Invalid document request', 'details': errors}
+        
+        # Structured quotations/orders must price out before anything is rendered
+        if 'items' in request_data:
+            pricing = pricing_summary(compute_pricing(request_data))
+            if not pricing['valid']:
+                return {'error': 'Pricing mismatch', 'pricing': pricing}
+        return None
+    
     def process_document_request(self, agent_id, request_data):
         """Process document generation request from subordinate agent"""
         try:
-            # Validate request
-            required_fields = ['filename_base', 'content', 'formats']
-            if not all(field in request_data for field in required_fields):
-                return {'error': 'Missing required fields', 'required': required_fields}
-            
-            # Forward to document service
-            doc_response = requests.post(
-                f"{self.doc_service_url}/api/documents/generate",
-                json=request_data,
-                timeout=30
-            )
+            rejected = self.check_document_request(request_data)
+            if rejected:
+                return rejected
+            return self.render_document(agent_id, request_data)
+        except Exception as e:
+            return {'error': str(e), 'agent_id': agent_id}
+    
+    def submit_document_request(self, agent_id, request_data):
+        """Accept a request for background rendering; the result goes to the agent's callback_url"""
+        rejected = self.check_document_request(request_data)
+        if rejected:
+            return rejected
+        agent = self.registry.get(agent_id) or {}
+        return self.forwarder.submit(agent_id, agent.get('callback_url'),
+                                     lambda: self.render_document(agent_id, request_data))
+    
+    def render_document(self, agent_id, request_data):
+        """Forward a checked request to the document service (blocking)"""
+        started = time.perf_counter()
+        content = request_data.get('content') or ''
+        try:
+            # Forward to document service once this agent's fair turn comes up
+            with self.admission.document_slot(agent_id, len(content)) as granted:
+                if not granted:
+                    self.log_agent_activity(agent_id, 'document_generation', content, started, 'queue_timeout')
+                    return {'error': 'Document service queue timeout', 'agent_id': agent_id}
+                doc_response = http_client.post(
+                    f"{self.doc_service_url}/api/documents/generate",
+                    json=request_data,
+                    timeout=30
+                )
             
             if doc_response.status_code == 200:
                 result = doc_response.json()
                 
                 # Log the request
-                self.log_agent_activity(agent_id, 'document_generation', request_data)
+                self.log_agent_activity(agent_id, 'document_generation', content, started)
                 
                 return {
                     'success': True,
@@ -63,9 +140,12 @@ class SubordinateAgentInterface:
                     'timestamp': datetime.now().isoformat()
                 }
             else:
+                self.log_agent_activity(agent_id, 'document_generation', content, started,
+                                        f'http_{doc_response.status_code}')
                 return {'error': 'Document service unavailable', 'status': doc_response.status_code}
                 
         except Exception as e:
+            self.log_agent_activity(agent_id, 'document_generation', content, started, type(e).__name__)
             return {'error': str(e), 'agent_id': agent_id}
     
     def get_system_status(self):
@@ -87,56 +167,134 @@ class SubordinateAgentInterface:
                     'status': 'online' if doc_service_healthy else 'offline'
                 }
             },
-            'registered_agents': len(self.registered_agents),
+            'service_health': get_prober().get_snapshot(),
+            'registered_agents': self.registry.count(),
+            'agent_liveness': self.liveness.get_stats(),
+            'document_forwarding': self.forwarder.get_stats(),
+            'document_admission': self.admission.get_summary(),
+            'idempotency': self.idempotency.get_stats(),
+            'activity_log': self.activity.get_stats(),
+            'push_channel': self.push.get_stats(),
             'available_endpoints': [
                 '/api/agent/register',
                 '/api/agent/document/generate',
+                '/api/agent/pricing/validate',
                 '/api/agent/status',
-                '/api/agent/ping'
+                '/api/agent/ping',
+                '/api/agent/route',
+                '/api/agent/unregister',
+                '/api/agent/register/bulk',
+                '/api/agent/ping/bulk',
+                '/api/agent/unregister/bulk',
+                '/api/agent/events',
+                '/api/agent/quotas',
+                '/api/agent/activity'
             ]
         }
     
-    def check_service_health(self, url):
-        """Check if a service is responding"""
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
-    
-    def log_agent_activity(self, agent_id, activity_type, data):
-        """Log subordinate agent activity"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'agent_id': agent_id,
-            'activity': activity_type,
-            'data': data
+    def get_service_summary(self):
+        """Overall status and each service's state, as pushed to connected agents"""
+        healthy = self.check_service_health(self.main_app_url) and self.check_service_health(self.doc_service_url)
+        return {
+            'status': 'operational' if healthy else 'partial',
+            'services': {name: result['status'] for name, result in get_prober().get_snapshot().items()}
         }
-        print(f"📝 Agent Activity: {json.dumps(log_entry, indent=2)}")
     
-    def ping_agent(self, agent_id):
-        """Update agent last ping time"""
-        if agent_id in self.registered_agents:
-            self.registered_agents[agent_id]['last_ping'] = datetime.now().isoformat()
-            return True
-        return False
+    def push_hello(self, agent_id):
+        """First event on a new push stream"""
+        return {'system_status': self.get_service_summary()}
+    
+    def push_heartbeat(self, agent_ids):
+        """Every push heartbeat: keep connected agents registered and announce status changes"""
+        pinged = self.registry.ping_many([(agent_id, None) for agent_id in agent_ids])
+        for agent_id, success in zip(agent_ids, pinged):
+            if not success:
+                self.push.disconnect(agent_id)  # evicted or unregistered meanwhile
+        
+        summary = self.get_service_summary()
+        if summary != self.last_service_summary:
+            if self.last_service_summary is not None:
+                self.push.publish(None, 'system_status', dict(summary, timestamp=datetime.now().isoformat()))
+            self.last_service_summary = summary
+    
+    def push_document_result(self, job):
+        """Forward a finished async document job to the agent's push stream"""
+        self.push.publish(job['agent_id'], 'document_result',
+                          {key: job.get(key) for key in ('job_id', 'status', 'result', 'completed_at')})
+    
+    def check_service_health(self, url):
+        """Check if a service is responding (cached background probe)"""
+        return get_prober().is_healthy(url)
+    
+    def log_agent_activity(self, agent_id, activity_type, data=None, started=None, outcome='ok'):
+        """Queue a compact activity record (size and hash of ``data``, not the data itself)"""
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else None
+        self.activity.record(agent_id, activity_type, data, latency_ms, outcome)
+    
+    def ping_agent(self, agent_id, load=None):
+        """Update agent last ping time (and reported load, used for routing)"""
+        return self.registry.ping(agent_id, load)
+    
+    def ping_agents(self, pings):
+        """Record a batch of (agent_id, load) pings in one registry transaction"""
+        return self.registry.ping_many(pings)
+    
+    def unregister_agents(self, agent_ids):
+        """Remove a batch of agents in one registry transaction"""
+        removed = self.registry.unregister_many(agent_ids)
+        for agent_id, success in zip(agent_ids, removed):
+            if success:
+                self.log_agent_activity(agent_id, 'unregistration')
+                self.push.disconnect(agent_id)
+        return removed
+    
+    def unregister_agent(self, agent_id):
+        """Remove an agent from the registry and the capability index"""
+        removed = self.registry.unregister(agent_id)
+        if removed:
+            self.log_agent_activity(agent_id, 'unregistration')
+            self.push.disconnect(agent_id)
+        return removed
+    
+    def route_request(self, capabilities):
+        """Least-loaded registered agent offering every required capability"""
+        return self.registry.route(capabilities)
 
 # Initialize interface
 agent_interface = SubordinateAgentInterface()
 
 # API Endpoints for Subordinate Agents
 
+def start_background_services():
+    """Start the eviction ticker and push channel in this process (no-op once running)"""
+    agent_interface.liveness.start()
+    agent_interface.push.start()
+
+def create_app():
+    """WSGI entry for gunicorn: the push port listens as soon as the worker is up"""
+    start_background_services()
+    return app
+
+@app.before_request
+def ensure_background_services():
+    """Restart the background threads in a process forked after startup (e.g. gunicorn --preload)"""
+    start_background_services()
+
 @app.route('/api/agent/register', methods=['POST'])
 def register_agent():
     """Register a subordinate agent"""
     try:
         data = request.json
+        if not isinstance(data, dict) or not data.get('agent_id'):
+            return jsonify({'error': 'agent_id is required'}), 400
         agent_id = data.get('agent_id')
         callback_url = data.get('callback_url')
-        capabilities = data.get('capabilities', [])
+        capabilities = data.get('capabilities') or []
         
-        if not agent_id:
-            return jsonify({'error': 'agent_id is required'}), 400
+        # A bare string such as "pdf" would otherwise be indexed one character at a time
+        error = check_registration_item(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         agent_info = agent_interface.register_agent(agent_id, callback_url, capabilities)
         
@@ -147,7 +305,8 @@ def register_agent():
             'system_endpoints': {
                 'document_generation': '/api/agent/document/generate',
                 'status_check': '/api/agent/status',
-                'ping': '/api/agent/ping'
+                'ping': '/api/agent/ping',
+                'push': f"http://{request.host.split(':')[0]}:{agent_interface.push.port}{PUSH_PATH}{quote(agent_id, safe='')}"
             }
         })
         
@@ -164,20 +323,123 @@ def generate_document_for_agent():
         if not agent_id:
             return jsonify({'error': 'agent_id is required'}), 400
         
-        if agent_id not in agent_interface.registered_agents:
+        agent = agent_interface.registry.get(agent_id)
+        if agent is None:
             return jsonify({'error': 'Agent not registered'}), 403
         
-        # Process the document request
-        result = agent_interface.process_document_request(agent_id, data)
+        # Retries carrying the same Idempotency-Key (or request_id) replay the first outcome
+        key = request.headers.get('Idempotency-Key') or data.get('request_id')
+        if not key:
+            return generate_document_response(agent, data)
         
-        if 'error' in result:
-            return jsonify(result), 400
+        entry, owner = agent_interface.idempotency.begin(agent_id, key, data)
+        if entry is None:
+            return jsonify({'error': 'Idempotency key reused with a different payload',
+                            'idempotency_key': key}), 422
+        if not owner:
+            body, status = agent_interface.idempotency.wait(entry)
+            if body is None:
+                return jsonify({'error': 'Original request still in progress', 'idempotency_key': key}), 409
+            response = jsonify(body)
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response, status
         
-        return jsonify(result)
+        try:
+            response, status = generate_document_response(agent, data)
+        except Exception:
+            agent_interface.idempotency.finish(agent_id, key, {'error': 'Original request failed'}, 500)
+            raise
+        agent_interface.idempotency.finish(agent_id, key, response.get_json(), status)
+        return response, status
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def generate_document_response(agent, data):
+    """(response, status) for an admitted agent document request"""
+    agent_id = agent['agent_id']
+    admitted, retry_after = agent_interface.admission.admit(agent_id, agent['capabilities'])
+    if not admitted:
+        retry_after = min(retry_after, MAX_RETRY_AFTER)
+        response = jsonify({'error': 'Rate limit exceeded', 'agent_id': agent_id,
+                            'retry_after': round(retry_after, 2)})
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response, 429
+    
+    # "async": true (or Prefer: respond-async) returns 202 at once; the result goes to callback_url
+    run_async = data.pop('async', False) or 'respond-async' in request.headers.get('Prefer', '')
+    if run_async:
+        try:
+            job = agent_interface.submit_document_request(agent_id, data)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'agent_id': agent_id}), 400
+        if 'error' in job:
+            return jsonify(job), 400
+        job['status_url'] = f"/api/agent/document/jobs/{job['job_id']}"
+        return jsonify(job), 202
+    
+    # Process the document request
+    result = agent_interface.process_document_request(agent_id, data)
+    
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result), 200
+
+@app.route('/api/agent/document/jobs/<job_id>', methods=['GET'])
+def get_document_job(job_id):
+    """Status and result of an asynchronous document request"""
+    job = agent_interface.forwarder.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/api/agent/activity', methods=['GET'])
+def get_agent_activity():
+    """Activity records, oldest first, filtered by agent_id and since (paginated by cursor)"""
+    try:
+        page = agent_interface.activity.query(
+            agent_id=request.args.get('agent_id'),
+            since=request.args.get('since'),
+            limit=request.args.get('limit', 100),
+            cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query: {e}'}), 400
+    page['count'] = len(page['records'])
+    return jsonify(page)
+
+@app.route('/api/agent/quotas', methods=['GET'])
+def get_agent_quotas():
+    """Per-agent admitted, throttled and queued counts"""
+    return jsonify({
+        'agents': agent_interface.admission.get_stats(request.args.get('agent_id')),
+        'summary': agent_interface.admission.get_summary()
+    })
+
+@app.route('/api/agent/pricing/validate', methods=['POST'])
+def validate_pricing_for_agent():
+    """Recompute line totals and order totals for an item list"""
+    try:
+        data = request.json
+        agent_id = data.get('agent_id')
+        
+        if not agent_id:
+            return jsonify({'error': 'agent_id is required'}), 400
+        
+        if not agent_interface.is_registered(agent_id):
+            return jsonify({'error': 'Agent not registered'}), 403
+        
+        if not isinstance(data.get('items'), list):
+            return jsonify({'error': 'items must be a list'}), 400
+        
+        return jsonify(pricing_summary(compute_pricing(data)))
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/agent/status', methods=['GET'])
 def get_status_for_agents():
     """Get system status for subordinate agents"""
@@ -193,7 +455,11 @@ def ping_agent():
         if not agent_id:
             return jsonify({'error': 'agent_id is required'}), 400
         
-        success = agent_interface.ping_agent(agent_id)
+        load = data.get('load')
+        if load is not None and (type(load) is not int or load < 0):
+            return jsonify({'error': 'load must be a non-negative integer'}), 400
+        
+        success = agent_interface.ping_agent(agent_id, load)
         
         if success:
             return jsonify({'success': True, 'message': f'Ping received from {agent_id}'})
@@ -203,14 +469,233 @@ def ping_agent():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/agent/list', methods=['GET'])
-def list_registered_agents():
-    """List all registered agents"""
+@app.route('/api/agent/unregister', methods=['POST'])
+def unregister_agent():
+    """Remove a subordinate agent"""
+    try:
+        data = request.json
+        agent_id = data.get('agent_id')
+        
+        if not agent_id:
+            return jsonify({'error': 'agent_id is required'}), 400
+        
+        if agent_interface.unregister_agent(agent_id):
+            return jsonify({'success': True, 'message': f'Agent {agent_id} unregistered'})
+        return jsonify({'error': 'Agent not registered'}), 404
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def bulk_agent_items(data, item_error):
+    """Split a bulk body {"agents": [...]} into (valid items, per-item errors, request error)
+
+    ``item_error(item)`` returns an error message or None; plain strings are
+    accepted as ``{"agent_id": <string>}``.
+    """
+    agents = (data or {}).get('agents') if isinstance(data, dict) else None
+    if not isinstance(agents, list) or not agents:
+        return None, None, 'agents must be a non-empty list'
+    if len(agents) > MAX_BULK_ITEMS:
+        return None, None, f'at most {MAX_BULK_ITEMS} agents per request'
+    
+    valid, errors = [], {}
+    for index, item in enumerate(agents):
+        if isinstance(item, str):
+            item = {'agent_id': item}
+        if not isinstance(item, dict) or not isinstance(item.get('agent_id'), str) or not item['agent_id']:
+            errors[index] = 'agent_id is required'
+            continue
+        error = item_error(item)
+        if error:
+            errors[index] = error
+        else:
+            valid.append((index, item))
+    return valid, errors, None
+
+def bulk_response(agents, valid, errors, succeeded, failure):
+    """Per-item results in request order plus success / failure counts"""
+    outcomes = {index: ok for (index, _), ok in zip(valid, succeeded)}
+    results = []
+    for index, item in enumerate(agents):
+        agent_id = item if isinstance(item, str) else (item.get('agent_id') if isinstance(item, dict) else None)
+        if index in errors:
+            results.append({'index': index, 'agent_id': agent_id, 'success': False, 'error': errors[index]})
+        elif outcomes[index]:
+            results.append({'index': index, 'agent_id': agent_id, 'success': True})
+        else:
+            results.append({'index': index, 'agent_id': agent_id, 'success': False, 'error': failure})
+    succeeded_count = sum(1 for result in results if result['success'])
     return jsonify({
-        'registered_agents': agent_interface.registered_agents,
-        'total_count': len(agent_interface.registered_agents)
+        'success': succeeded_count == len(results),
+        'succeeded': succeeded_count,
+        'failed': len(results) - succeeded_count,
+        'results': results
     })
 
+def check_registration_item(item):
+    capabilities = item.get('capabilities')
+    if capabilities is None:
+        return None
+    if not isinstance(capabilities, list) or not all(isinstance(c, str) for c in capabilities):
+        return 'capabilities must be a list of strings'
+    return None
+
+def check_ping_item(item):
+    load = item.get('load')
+    if load is not None and (type(load) is not int or load < 0):
+        return 'load must be a non-negative integer'
+    return None
+
+@app.route('/api/agent/register/bulk', methods=['POST'])
+def register_agents_bulk():
+    """Register many agents in one registry transaction; results are per item"""
+    try:
+        data = request.json
+        valid, errors, error = bulk_agent_items(data, check_registration_item)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        agent_interface.register_agents([item for _, item in valid])
+        return bulk_response(data['agents'], valid, errors, [True] * len(valid), None)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/agent/ping/bulk', methods=['POST'])
+def ping_agents_bulk():
+    """Ping many agents (optionally with load) in one registry transaction"""
+    try:
+        data = request.json
+        valid, errors, error = bulk_agent_items(data, check_ping_item)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        pinged = agent_interface.ping_agents([(item['agent_id'], item.get('load')) for _, item in valid])
+        return bulk_response(data['agents'], valid, errors, pinged, 'Agent not registered')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/agent/unregister/bulk', methods=['POST'])
+def unregister_agents_bulk():
+    """Remove many agents in one registry transaction"""
+    try:
+        data = request.json
+        valid, errors, error = bulk_agent_items(data, lambda item: None)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        removed = agent_interface.unregister_agents([item['agent_id'] for _, item in valid])
+        return bulk_response(data['agents'], valid, errors, removed, 'Agent not registered')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/agent/route', methods=['GET', 'POST'])
+def route_to_agent():
+    """Pick the best agent for a set of required capabilities"""
+    try:
+        if request.method == 'POST':
+            capabilities = (request.json or {}).get('capabilities', [])
+        else:
+            capabilities = [c for c in request.args.get('capabilities', '').split(',') if c]
+        
+        if not isinstance(capabilities, list) or not all(isinstance(c, str) for c in capabilities):
+            return jsonify({'error': 'capabilities must be a list of strings'}), 400
+        
+        agent, candidates = agent_interface.route_request(capabilities)
+        if agent is None:
+            return jsonify({'error': 'No registered agent has the required capabilities',
+                            'capabilities': capabilities}), 404
+        
+        return jsonify({
+            'success': True,
+            'agent': agent,
+            'required_capabilities': capabilities,
+            'candidates': candidates
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/agent/events', methods=['GET'])
+def agent_liveness_events():
+    """Recent suspect / evicted / recovered transitions"""
+    events = agent_interface.liveness.recent_events(request.args.get('since'))
+    return jsonify({'events': events, 'total_count': len(events)})
+
+@app.route('/api/agent/list', methods=['GET'])
+def list_registered_agents():
+    """Registered agents, one page at a time (or only what changed since a version)
+    
+    Query parameters: ``status``, ``capability``, ``fields`` (comma separated),
+    ``limit`` / ``cursor`` for paging, ``changed_since=<version>`` for a delta
+    (410 with ``resync`` when that version predates purged tombstones).
+    Responses carry an ETag made of the registry version and a hash of the
+    normalized query, so each page and filter has its own; a matching
+    If-None-Match gets 304 Not Modified. Pings move the version of listings
+    that show ``last_ping`` or ``load``; ask for ``fields`` without them to
+    get an ETag that only moves on registration, status and removal changes.
+    """
+    registry = agent_interface.registry
+    try:
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+        changed_since = request.args.get('changed_since')
+        changed_since = int(changed_since) if changed_since not in (None, '') else None
+    except ValueError:
+        return jsonify({'error': 'limit and changed_since must be integers'}), 400
+    
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    unknown = [field for field in fields if field not in AGENT_FIELDS]
+    if unknown:
+        return jsonify({'error': f'Unknown fields: {", ".join(unknown)}', 'available_fields': AGENT_FIELDS}), 400
+    
+    def project(agent):
+        if not fields:
+            return agent
+        return {field: agent[field] for field in ['agent_id'] + fields}
+    
+    # Computed before reading, so a body is never labelled with a newer version than it shows
+    include_pings = changed_since is not None or not fields or any(field in PING_FIELDS for field in fields)
+    query = urlencode(sorted(request.args.items(multi=True)))
+    etag = f"agents-{registry.version(include_pings)}-{hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    if changed_since is not None:
+        # Deltas are unfiltered: an agent leaving a filter must still reach the poller
+        try:
+            changed, removed, version, more = registry.changes_since(changed_since, limit)
+        except StaleVersionError as e:
+            # Removals after that version may be gone; the poller has to re-list
+            return jsonify({'error': str(e), 'resync': True, 'version': registry.version()}), 410
+        body = {
+            'changed_agents': {agent['agent_id']: project(agent) for agent in changed},
+            'removed_agents': removed,
+            'version': version,
+            'more': more
+        }
+    else:
+        agents, next_cursor, version = registry.list_page(
+            status=request.args.get('status'),
+            capability=request.args.get('capability'),
+            after=request.args.get('cursor'),
+            limit=limit
+        )
+        body = {
+            'registered_agents': {agent['agent_id']: project(agent) for agent in agents},
+            'count': len(agents),
+            'total_count': registry.count(),
+            'next_cursor': next_cursor,
+            'version': version
+        }
+    
+    response = jsonify(body)
+    response.set_etag(etag, weak=True)
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check for agent interface"""
@@ -221,11 +706,21 @@ def run_agent_api():
     print("🤖 Starting Subordinate Agent API Interface...")
     print("📡 Available endpoints:")
     print("   POST /api/agent/register - Register an agent")
-    print("   POST /api/agent/document/generate - Generate documents")
+    print("   POST /api/agent/document/generate - Generate documents (\"async\": true for callbacks)")
+    print("   GET  /api/agent/document/jobs/<job_id> - Async document job status")
+    print("   POST /api/agent/pricing/validate - Validate line-item pricing")
     print("   GET  /api/agent/status - Get system status")
     print("   POST /api/agent/ping - Agent ping")
-    print("   GET  /api/agent/list - List registered agents")
+    print("   POST /api/agent/unregister - Unregister an agent")
+    print(f"   POST /api/agent/{{register,ping,unregister}}/bulk - Up to {MAX_BULK_ITEMS} agents per call")
+    print("   GET  /api/agent/route - Best agent for required capabilities")
+    print("   GET  /api/agent/list - List registered agents (paged, filtered, ETag / changed_since)")
+    print("   GET  /api/agent/events - Agent liveness events")
+    print("   GET  /api/agent/quotas - Per-agent admission counters")
+    print("   GET  /api/agent/activity - Agent activity log (agent_id, since, cursor)")
     print("   GET  /health - Health check")
+    start_background_services()
+    print(f"📨 Agent push stream: GET :{agent_interface.push.port}{PUSH_PATH}<agent_id> (server-sent events)")
     
     app.run(host='0.0.0.0', port=5002, debug=False)
 
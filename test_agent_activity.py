@@ -0,0 +1,67 @@
+"""Tests for agent_activity.py segment retention and queries"""
+
+import json
+import os
+import subprocess
+
+from agent_activity import ActivityRecorder
+
+
+def write_segment(directory, name, mtime, agent_id='agent-1'):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'ts': mtime, 'agent_id': agent_id, 'activity': 'ping'}) + '\n')
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def finished_pid():
+    process = subprocess.Popen(['true'])
+    process.wait()
+    return process.pid
+
+
+def test_retention_keeps_other_workers_open_segments(tmp_path):
+    directory = str(tmp_path)
+    live, dead = os.getppid(), finished_pid()
+    live_open = write_segment(directory, f'{live}-000002.jsonl', 1000.0)  # oldest, but still being written
+    dead_last = write_segment(directory, f'{dead}-000001.jsonl', 2000.0)
+    live_closed = write_segment(directory, f'{live}-000001.jsonl', 3000.0)
+
+    recorder = ActivityRecorder(directory=directory, max_segments=3)
+    recorder.pid = os.getpid()
+    assert len(recorder.query()['records']) == 3
+    recorder._roll()
+
+    assert os.path.exists(live_open) and os.path.exists(live_closed) and not os.path.exists(dead_last)
+    assert dead_last not in recorder.segments
+
+    recorder.max_segments = 1
+    recorder._roll()
+    remaining = sorted(os.listdir(directory))
+    assert remaining == sorted([os.path.basename(live_open), os.path.basename(recorder.segment_path)])
+    assert set(recorder.segments) == {live_open}
+
+
+def test_query_pages_by_agent_and_since(tmp_path):
+    directory = str(tmp_path)
+    for i in range(5):
+        write_segment(directory, f'{os.getppid()}-{i + 1:06d}.jsonl', 1000.0 + i, agent_id=f'agent-{i % 2}')
+    recorder = ActivityRecorder(directory=directory)
+
+    page = recorder.query(agent_id='agent-0', limit=2)
+    assert [record['ts'] for record in page['records']] == [1000.0, 1002.0]
+    page = recorder.query(agent_id='agent-0', limit=2, cursor=page['next_cursor'])
+    assert [record['ts'] for record in page['records']] == [1004.0] and page['next_cursor'] is None
+    assert [record['ts'] for record in recorder.query(since=1003.0)['records']] == [1003.0, 1004.0]
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    directory = str(tmp_path / 'activity')
+    recorder = ActivityRecorder(directory=directory)
+    assert not os.path.exists(directory)
+    assert recorder.query() == {'records': [], 'next_cursor': None}
+
+    recorder.pid = os.getpid()
+    recorder._write([(1000.0, 'agent-1', 'ping', None, None, 'ok')])
+    assert [record['agent_id'] for record in recorder.query()['records']] == ['agent-1']
@@ -0,0 +1,62 @@
+"""Tests for agent_admission.py (two admissions on one database stand in for two API workers)"""
+
+import threading
+import time
+
+from agent_admission import AgentAdmission, FairQueue, SharedTokenBuckets
+
+LIMITS = {'default': {'rate': 2, 'burst': 4}, 'tiers': {'bulk': {'rate': 10, 'burst': 20}}, 'agents': {}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_workers_share_one_bucket_per_agent(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'registry.db')
+    workers = [AgentAdmission(LIMITS, buckets=SharedTokenBuckets(path, clock)) for _ in range(2)]
+
+    admitted = [workers[i % 2].admit('agent-1')[0] for i in range(8)]
+    assert admitted.count(True) == 4  # the burst, not burst x workers
+
+    allowed, retry_after = workers[0].admit('agent-1')
+    assert not allowed and retry_after == 0.5
+
+    clock.now += 1.0
+    assert [workers[1].admit('agent-1')[0] for _ in range(3)] == [True, True, False]
+
+
+def test_limits_come_from_capability_tiers(tmp_path):
+    admission = AgentAdmission(LIMITS, buckets=SharedTokenBuckets(str(tmp_path / 'registry.db'), FakeClock()))
+    results = [admission.admit('bulk-agent', ['bulk'])[0] for _ in range(25)]
+    assert results.count(True) == 20
+    assert admission.get_stats('bulk-agent')['bulk-agent']['rate'] == 10
+
+
+def test_fair_queue_alternates_between_agents():
+    queue = FairQueue(slots=1, quantum=1)
+    order = []
+    assert queue.acquire('holder')  # keep the only slot busy while both agents queue up
+
+    def request(agent_id):
+        with queue.slot(agent_id, timeout=5) as granted:
+            order.append(agent_id if granted else None)
+
+    threads = []
+    for agent_id in ['a', 'a', 'a', 'b', 'b', 'b']:
+        queued = queue.queued(agent_id)
+        thread = threading.Thread(target=request, args=(agent_id,))
+        thread.start()
+        threads.append(thread)
+        while queue.queued(agent_id) == queued:  # enqueue in a known order
+            time.sleep(0.001)
+
+    queue.release()
+    for thread in threads:
+        thread.join(5)
+    assert order == ['a', 'b', 'a', 'b', 'a', 'b']
@@ -0,0 +1,62 @@
+"""Tests for agent_liveness.py on a fake clock"""
+
+from agent_liveness import LivenessTracker, TimingWheel
+from agent_registry import AgentRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_keys_with_fractional_deadlines_expire_on_the_next_tick():
+    clock = FakeClock()
+    wheel = TimingWheel(tick=1.0, slots=16, clock=clock)
+    wheel.schedule('a', 1005.5)
+    wheel.schedule('b', 1003.0)
+
+    fired = {}
+    while clock.now < 1030:
+        clock.now += 1.0
+        for key in wheel.advance():
+            fired[key] = clock.now
+    assert fired == {'b': 1003.0, 'a': 1006.0}
+    assert len(wheel) == 0
+
+
+def test_keys_more_than_one_lap_away_wait_for_their_lap():
+    clock = FakeClock()
+    wheel = TimingWheel(tick=1.0, slots=8, clock=clock)
+    wheel.schedule('far', 1020.2)
+
+    fired = []
+    while clock.now < 1030:
+        clock.now += 1.0
+        fired.extend((key, clock.now) for key in wheel.advance())
+    assert fired == [('far', 1021.0)]
+
+
+def test_suspect_and_evict_fire_within_one_tick_of_their_deadlines(tmp_path):
+    clock = FakeClock()
+    registry = AgentRegistry(str(tmp_path / 'registry.db'))
+    tracker = LivenessTracker(registry, suspect_after=10.0, evict_after=30.0, tick=1.0, clock=clock)
+    events = []
+    tracker.subscribe(lambda event: events.append((event['event'], clock.now)))
+
+    registry.register('agent-1', None, ['pdf'])
+    # Wall-clock age seeding leaves the deadline just short of a tick boundary
+    suspect_deadline = tracker.wheel.deadlines['agent-1']
+    assert suspect_deadline <= 1010.0
+
+    while clock.now < 1100 and len(events) < 2:
+        clock.now += 0.25
+        tracker.check()
+
+    (suspect, suspect_at), (evicted, evicted_at) = events
+    assert (suspect, evicted) == ('suspect', 'evicted')
+    assert suspect_deadline <= suspect_at <= suspect_deadline + 1.0
+    assert suspect_at + 20.0 <= evicted_at <= suspect_at + 21.0
+    assert registry.get('agent-1') is None
@@ -0,0 +1,94 @@
+"""Tests for agent_push_channel.py (a second channel on the same port stands in for another API worker)"""
+
+import socket
+import time
+
+import pytest
+
+from agent_push_channel import AgentPushChannel, PushOutbox
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def read_event(stream, name):
+    """Data line of the next ``name`` event on a raw SSE stream"""
+    event = None
+    for line in stream:
+        line = line.decode('utf-8').rstrip('\n')
+        if line.startswith('event: '):
+            event = line[len('event: '):]
+        elif line.startswith('data: ') and event == name:
+            return line[len('data: '):]
+    return None
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / 'registry.db')
+    serving = AgentPushChannel(host='127.0.0.1', port=0, outbox=PushOutbox(path)).start()
+    other = AgentPushChannel(host='127.0.0.1', port=serving.port, outbox=PushOutbox(path)).start()
+    return serving, other
+
+
+def test_only_one_worker_serves_the_port(workers):
+    serving, other = workers
+    assert serving.serving and serving.port
+    assert not other.serving and other.get_stats()['error']
+
+
+def test_events_from_other_workers_reach_the_stream(workers):
+    serving, other = workers
+    with socket.create_connection(('127.0.0.1', serving.port), timeout=5) as client:
+        client.sendall(b'GET /api/agent/push/agent-1 HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        stream = client.makefile('rb')
+        assert '"agent_id":"agent-1"' in read_event(stream, 'connected')
+
+        assert other.publish('agent-1', 'document_result', {'job_id': 'job-1'})
+        assert read_event(stream, 'document_result') == '{"job_id":"job-1"}'
+
+        other.disconnect('agent-1')
+        assert stream.read().strip() == b''  # closed by the serving worker
+    assert serving.get_stats()['outbox_received'] == 2
+
+
+def test_undrained_outbox_events_expire(tmp_path):
+    clock = FakeClock()
+    outbox = PushOutbox(str(tmp_path / 'registry.db'), ttl=60.0, clock=clock)
+    outbox.put('agent-1', 'liveness', {'event': 'suspect'})
+    clock.now += 61
+    outbox.put('agent-2', 'liveness', {'event': 'recovered'})
+
+    assert outbox.take() == [('agent-2', 'liveness', {'event': 'recovered'})]
+    assert outbox.take() == []
+
+
+def test_connection_counts_are_readable_from_other_threads(workers):
+    serving, _ = workers
+    clients = []
+    try:
+        for _ in range(2):
+            client = socket.create_connection(('127.0.0.1', serving.port), timeout=5)
+            client.sendall(b'GET /api/agent/push/agent-1 HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            stream = client.makefile('rb')
+            assert read_event(stream, 'connected')
+            clients.append((client, stream))
+
+        assert serving.is_connected('agent-1') and not serving.is_connected('agent-2')
+        stats = serving.get_stats()
+        assert (stats['connections'], stats['connected_agents'], stats['peak_connections']) == (2, 1, 2)
+    finally:
+        for client, stream in clients:
+            stream.close()
+            client.close()
+
+    deadline = time.monotonic() + 5
+    while serving.get_stats()['connections'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not serving.is_connected('agent-1')
+    assert serving.get_stats()['connected_agents'] == 0 and serving.get_stats()['closed'] == 2
@@ -0,0 +1,73 @@
+"""Tests for agent_registry.py (two registries on one file stand in for two API workers)"""
+
+import pytest
+
+from agent_registry import AgentRegistry, StaleVersionError
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / 'registry.db')
+    return AgentRegistry(path), AgentRegistry(path)
+
+
+def age_tombstones(registry, removed_at='2000-01-01T00:00:00'):
+    registry._connection().execute('UPDATE agents SET removed_at = ? WHERE removed = 1', (removed_at,))
+
+
+def test_purge_only_deletes_old_tombstones(workers):
+    a, _ = workers
+    a.register_many([{'agent_id': f'agent-{i}', 'capabilities': ['pdf']} for i in range(3)])
+    a.unregister('agent-0')
+    age_tombstones(a)
+    a.unregister('agent-1')
+
+    assert a.purge_tombstones(older_than=3600) == 1
+    rows = a._connection().execute('SELECT agent_id, removed FROM agents ORDER BY agent_id').fetchall()
+    assert rows == [('agent-1', 1), ('agent-2', 0)]
+
+
+def test_sequence_numbers_never_go_backwards_after_a_purge(workers):
+    a, _ = workers
+    a.register('agent-0', None, [])
+    a.unregister('agent-0')
+    version = a.version()
+    age_tombstones(a)
+    a.purge_tombstones()
+
+    a.register('agent-1', None, [])
+    assert a.version() == version + 1
+
+
+def test_worker_that_missed_a_purged_tombstone_drops_the_agent(workers):
+    a, b = workers
+    events = []
+    a.register('agent-0', None, ['pdf'])
+    a.register('agent-1', None, ['pdf'])
+    assert b.count() == 2
+    b.subscribe(lambda agent_id, agent: events.append((agent_id, agent)))
+
+    a.unregister('agent-0')
+    age_tombstones(a)
+    a.purge_tombstones()
+
+    assert sorted(b.all()) == ['agent-1']
+    assert b.route(['pdf'])[0]['agent_id'] == 'agent-1'
+    assert events == [('agent-0', None)]
+    assert b.version() == a.version()
+
+
+def test_changes_since_a_purged_version_requires_a_resync(workers):
+    a, b = workers
+    a.register('agent-0', None, [])
+    stale = a.version()
+    a.unregister('agent-0')
+    age_tombstones(a)
+    a.purge_tombstones()
+    a.register('agent-1', None, [])
+
+    with pytest.raises(StaleVersionError):
+        b.changes_since(stale)
+    changed, removed, version, more = b.changes_since(0)
+    assert [agent['agent_id'] for agent in changed] == ['agent-1'] and removed == [] and not more
+    assert b.changes_since(version) == ([], [], version, False)
@@ -0,0 +1,122 @@
+"""Tests for async_workflow.py against a stubbed document service session"""
+
+import asyncio
+import threading
+import time
+
+import requests
+
+from async_workflow import AsyncHiblaDocumentWorkflow, DOCUMENT_TYPES, sample_workflow
+
+
+class StubResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        self.text = str(body)
+
+    def json(self):
+        return self.body
+
+
+class StubSession:
+    """Records in-flight requests; fails any filename_base listed in ``fail`` or ``error``"""
+
+    def __init__(self, delay=0.02, fail=(), error=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.error = set(error)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.posted = []
+
+    def post(self, url, json=None, **kwargs):
+        name = json['filename_base']
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.posted.append(name)
+        try:
+            time.sleep(self.delay)
+            if name in self.error:
+                raise requests.ConnectionError(f"connection reset while rendering {name}")
+            if name in self.fail:
+                return StubResponse(500, {'error': 'render failed'})
+            return StubResponse(200, {'paths': {fmt: f"/docs/{name}.{fmt}" for fmt in json['formats']}})
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+def make_workflow(session, concurrency):
+    workflow = AsyncHiblaDocumentWorkflow(concurrency=concurrency)
+    workflow.http = session
+    return workflow
+
+
+def test_documents_are_generated_concurrently_within_the_limit():
+    session = StubSession()
+    workflow = make_workflow(session, concurrency=4)
+    try:
+        report = asyncio.run(workflow.run_workflows([sample_workflow(i) for i in range(1, 6)]))
+    finally:
+        workflow.close()
+
+    assert report['documents_requested'] == 5 * len(DOCUMENT_TYPES)
+    assert report['documents_generated'] == report['documents_requested']
+    assert report['documents_failed'] == 0
+    assert len(session.posted) == len(set(session.posted)) == 15
+    assert 1 < session.peak <= 4
+    assert set(report['results'][0]) == {kind for kind, _ in DOCUMENT_TYPES}
+    assert report['results'][0]['quotation']['pdf'].endswith('.pdf')
+
+
+def test_one_workflow_runs_its_documents_in_parallel():
+    session = StubSession(delay=0.2)
+    workflow = make_workflow(session, concurrency=8)
+    try:
+        started = time.monotonic()
+        result = asyncio.run(workflow.run_workflows([sample_workflow(1)]))
+        elapsed = time.monotonic() - started
+    finally:
+        workflow.close()
+
+    assert result['documents_generated'] == 3
+    assert session.peak == 3
+    assert elapsed < 0.5
+
+
+def test_service_errors_and_rejections_count_as_failures():
+    stamp = sample_workflow(1)['quotation']['quotationNumber'].split('-')[1]
+    session = StubSession(fail=[f"quotation_QT-{stamp}-B00001"], error=[f"job_order_JO-{stamp}-B00002"])
+    workflow = make_workflow(session, concurrency=4)
+    try:
+        report = asyncio.run(workflow.run_workflows([sample_workflow(1), sample_workflow(2)]))
+    finally:
+        workflow.close()
+
+    assert report['documents_requested'] == 6
+    assert report['documents_generated'] == 4
+    assert report['documents_failed'] == 2
+    first, second = report['results']
+    assert first['quotation'] is None and first['sales_order'] and first['job_order']
+    assert second['job_order'] is None and second['quotation'] and second['sales_order']
+
+
+def test_invalid_payload_is_not_sent():
+    session = StubSession()
+    workflow = make_workflow(session, concurrency=2)
+    broken = sample_workflow(1)
+    broken['quotation']['total'] = 1.00
+    try:
+        result = asyncio.run(workflow.run_workflows([broken]))
+    finally:
+        workflow.close()
+
+    assert result['results'][0]['quotation'] is None
+    assert result['documents_generated'] == 2
+    assert not any(name.startswith('quotation_') for name in session.posted)
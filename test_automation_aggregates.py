@@ -0,0 +1,71 @@
+"""Tests for automation_aggregates.py"""
+
+import json
+
+from automation_aggregates import AutomationAggregateStore
+
+
+def make_store(tmp_path):
+    return AutomationAggregateStore(state_path=str(tmp_path / 'aggregates.json'),
+                                    history_path=str(tmp_path / 'events.jsonl'))
+
+
+def test_counts_by_day_status_and_customer(tmp_path):
+    store = make_store(tmp_path)
+    store.record_event('quotation', {'id': 'QT-1', 'status': 'accepted', 'customer': 'A', 'total': 100},
+                       timestamp='2026-10-01T09:00:00')
+    store.record_event('quotation', {'id': 'QT-2', 'status': 'pending', 'customer': 'A', 'total': 50},
+                       timestamp='2026-10-01T10:00:00')
+
+    assert store.count('quotation', day='2026-10-01') == (2, 150.0)
+    assert store.count('quotation', status='accepted') == (1, 100.0)
+    assert store.count('quotation', customer='A') == (2, 150.0)
+    assert store.daily_summary('2026-10-01')['quotation'] == {'count': 2, 'amount': 150.0}
+
+
+def test_events_after_last_save_survive_a_restart(tmp_path):
+    store = make_store(tmp_path)
+    store.record_event('document', {'id': 'doc-1'}, timestamp='2026-10-01T09:00:00')
+    store.save()
+    # Recorded but never saved, as if the process died before the next save
+    store.record_event('document', {'id': 'doc-2'}, timestamp='2026-10-01T09:05:00')
+
+    restarted = make_store(tmp_path)
+    assert restarted.count('document', day='2026-10-01') == (2, 0.0)
+    assert restarted.save_if_changed()
+    assert not restarted.save_if_changed()
+
+    # The replayed event is not applied twice on the next start
+    assert make_store(tmp_path).count('document', day='2026-10-01') == (2, 0.0)
+
+
+def test_restart_without_saved_state_replays_history(tmp_path):
+    store = make_store(tmp_path)
+    store.record_event('order', {'id': 'SO-1', 'total': 10}, timestamp='2026-10-01T09:00:00')
+
+    assert make_store(tmp_path).count('order', day='2026-10-01') == (1, 10.0)
+
+
+def test_backfill_matches_incremental_counters(tmp_path):
+    store = make_store(tmp_path)
+    for index in range(5):
+        store.record_event('quotation', {'id': f'QT-{index}', 'total': index},
+                           timestamp='2026-10-02T08:00:00')
+    incremental = store.count('quotation', day='2026-10-02')
+
+    assert store.backfill() == 5
+    assert store.count('quotation', day='2026-10-02') == incremental
+    with open(store.state_path, encoding='utf-8') as f:
+        assert json.load(f)['events_applied'] == 5
+
+
+def test_corrupt_state_file_is_rebuilt_from_history(tmp_path):
+    store = make_store(tmp_path)
+    store.record_event('document', {'id': 'doc-1'}, timestamp='2026-10-01T09:00:00')
+    store.record_event('document', {'id': 'doc-2'}, timestamp='2026-10-01T09:05:00')
+    store.save()
+    (tmp_path / 'aggregates.json').write_text('{"by_day": {"document|2026-10-01": [2', encoding='utf-8')
+
+    restarted = make_store(tmp_path)
+    assert restarted.count('document', day='2026-10-01') == (2, 0.0)
+    assert restarted.history_offset == (tmp_path / 'events.jsonl').stat().st_size
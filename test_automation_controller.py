@@ -0,0 +1,107 @@
+"""Tests for automation_controller.py (document DAGs and deferral while the breaker is open)"""
+
+import threading
+
+from automation_aggregates import AutomationAggregateStore
+from automation_controller import HiblaAutomationController
+from circuit_breaker import CLOSED, CircuitBreaker
+from document_task_dag import DEFERRED, SKIPPED, SUCCEEDED, DocumentTaskDAG
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    status_code = 200
+    text = '{"success": true}'
+
+    def json(self):
+        return {'success': True}
+
+
+class RecordingController(HiblaAutomationController):
+    """Controller whose document service is an in-memory recorder"""
+
+    def __init__(self, tmp_path):
+        super().__init__(aggregates=AutomationAggregateStore(
+            state_path=str(tmp_path / 'aggregates.json'), history_path=str(tmp_path / 'events.jsonl')))
+        self.clock = FakeClock()
+        self.doc_breaker = CircuitBreaker('document_service', failure_threshold=3, clock=self.clock)
+        self.submitted = []
+        self.submitted_lock = threading.Lock()
+
+    def submit_document(self, doc_data):
+        with self.submitted_lock:
+            self.submitted.append((doc_data['filename_base'], tuple(doc_data['formats'])))
+        return FakeResponse()
+
+
+ACCEPTED_QUOTATION = {'id': 'QT-T-001', 'customer': 'Test Customer', 'status': 'accepted', 'total': 1200}
+
+
+def test_document_chain_runs_every_format_and_stage(tmp_path):
+    controller = RecordingController(tmp_path)
+    dag = DocumentTaskDAG(executor=controller.dag_executor)
+    controller.expand_quotation_event(dag, ACCEPTED_QUOTATION)
+
+    summary = controller.run_document_dag(dag)
+
+    assert summary == {SUCCEEDED: len(dag.tasks)}
+    assert len(controller.submitted) == 6  # quotation, sales order, job order x pdf/docx
+    assert controller.aggregates.count('job_order', status='created') == (1, 0.0)
+    # One document per stage, however many formats it was rendered in
+    assert controller.aggregates.count('document', status='generated') == (3, 0.0)
+
+
+def test_open_breaker_defers_every_format_and_flush_resumes_the_chain(tmp_path):
+    controller = RecordingController(tmp_path)
+    for _ in range(3):
+        controller.doc_breaker.record_failure()
+
+    dag = DocumentTaskDAG(executor=controller.dag_executor)
+    controller.expand_quotation_event(dag, ACCEPTED_QUOTATION)
+    controller.run_document_dag(dag)
+
+    assert dag.tasks['quotation:QT-T-001:pdf'].status == DEFERRED
+    assert dag.tasks['quotation:QT-T-001:docx'].status == DEFERRED
+    assert dag.tasks['sales_order:SO-T-001:pdf'].status == SKIPPED
+    # Both formats are queued, not just the last one deferred
+    assert list(controller.deferred_documents) == [('auto_quotation_QT-T-001', ('pdf',)),
+                                                   ('auto_quotation_QT-T-001', ('docx',))]
+    assert controller.submitted == []
+
+    controller.clock.now += controller.doc_breaker.retry_in() + 1
+    controller.flush_deferred_documents()
+    assert dag.wait(timeout=5)
+
+    assert controller.doc_breaker.state == CLOSED
+    assert not controller.deferred_documents
+    assert all(task.status == SUCCEEDED for task in dag.tasks.values()), dag.summary()
+    assert sorted(controller.submitted) == sorted(
+        (f'auto_{stage}_{record_id}', (fmt,))
+        for stage, record_id in (('quotation', 'QT-T-001'), ('sales_order', 'SO-T-001'),
+                                 ('job_order', 'SO-T-001'))
+        for fmt in ('pdf', 'docx'))
+    assert controller.aggregates.count('quotation', customer='Test Customer') == (1, 1200.0)
+    assert controller.aggregates.count('order', customer='Test Customer') == (1, 1200.0)
+    assert controller.aggregates.count('job_order', customer='Test Customer') == (1, 0.0)
+    assert controller.aggregates.count('document', status='generated') == (3, 0.0)
+
+
+def test_redeferring_a_document_keeps_every_waiter(tmp_path):
+    controller = RecordingController(tmp_path)
+    results = []
+    doc = {'filename_base': 'report', 'content': 'x', 'formats': ['pdf']}
+    controller.defer_document(doc, [results.append])
+    controller.defer_document(dict(doc, content='y'), [results.append])
+
+    controller.flush_deferred_documents()
+
+    assert controller.submitted == [('report', ('pdf',))]
+    assert len(results) == 2
+    assert controller.aggregates.count('document', status='generated') == (1, 0.0)
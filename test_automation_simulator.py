@@ -0,0 +1,50 @@
+"""Tests for automation_simulator.py"""
+
+import os
+
+from automation_simulator import AutomationSimulator, EventStream, StubResponse, backlog_slope
+from circuit_breaker import OPEN
+
+
+def test_backlog_slope_uses_every_sample():
+    assert backlog_slope([(0, 0), (10, 10), (20, 20)]) == 1.0
+    # Same endpoints, but a mid-run spike no longer hides behind them
+    assert backlog_slope([(0, 0), (10, 30), (20, 0)]) == 0.0
+    assert backlog_slope([(0, 5)]) == 0.0
+
+
+def test_replay_reports_documents_and_cleans_up():
+    stream = EventStream.synthetic(3600, quotations_per_hour=20, orders_per_hour=10)
+    with AutomationSimulator(stream, 3600) as simulator:
+        workdir = simulator.workdir.name
+        report = simulator.run()
+        assert os.path.isdir(workdir)
+    assert not os.path.exists(workdir)
+    assert report['events'] == len(stream.events)
+    assert report['documents'] > 0
+    assert report['lag_seconds']['max'] >= report['lag_seconds']['p50']
+
+
+def test_breaker_backoff_runs_on_virtual_time():
+    stream = EventStream.synthetic(3600, quotations_per_hour=60, orders_per_hour=0)
+    with AutomationSimulator(stream, 3600) as simulator:
+        controller = simulator.controller
+        healthy = controller.submit_document
+        outage = {'until': 1800}
+
+        def flaky(doc_data):
+            if simulator.clock.now() < outage['until']:
+                return StubResponse(503, {'error': 'down'})
+            return healthy(doc_data)
+
+        controller.submit_document = flaky
+        simulator.clock.advance(600)
+        for _ in range(3):
+            controller.generate_document({'filename_base': 'probe', 'content': '', 'formats': ['pdf']})
+        assert controller.doc_breaker.state == OPEN
+        # Backoff is measured in simulated seconds, so it expires on the virtual clock
+        assert 0 < controller.doc_breaker.retry_in() <= controller.doc_breaker.base_delay
+
+        report = simulator.run()
+    assert controller.get_breaker_metrics()['deferred_documents'] == 0
+    assert report['documents'] > 0
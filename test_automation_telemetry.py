@@ -0,0 +1,90 @@
+"""Tests for automation_telemetry.py"""
+
+from automation_telemetry import AutomationTelemetry, create_status_app, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1790000000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_each_run_is_recorded_with_duration_items_and_lag():
+    clock = FakeClock()
+    telemetry = AutomationTelemetry(clock=clock)
+
+    def job():
+        clock.now += 2.0
+        return {'items': 3, 'errors': 0}
+
+    run = telemetry.instrument('monitor_quotations', 60, job)
+    clock.now += 65.0  # five seconds late
+    run()
+
+    summary = telemetry.snapshot()['jobs']['monitor_quotations']
+    assert summary['total_runs'] == 1 and summary['items_processed'] == 3
+    record = summary['recent_runs'][0]
+    assert (record['duration'], record['lag'], record['items'], record['overrun']) == (2.0, 5.0, 3, False)
+
+
+def test_exceptions_count_as_failures_and_raise_alerts():
+    clock = FakeClock()
+    telemetry = AutomationTelemetry(clock=clock)
+
+    def broken():
+        raise RuntimeError('main app down')
+
+    run = telemetry.instrument('process_pending_orders', 10, broken)
+    for _ in range(3):
+        clock.now += 10.0
+        run()
+
+    snapshot = telemetry.snapshot()
+    job = snapshot['jobs']['process_pending_orders']
+    assert job['consecutive_failures'] == 3 and job['errors'] == 3
+    assert job['recent_runs'][-1]['error'] == 'main app down'
+    assert snapshot['alerts'] == ['process_pending_orders: 3 consecutive failed runs']
+
+
+def test_overruns_and_skipped_runs_are_flagged():
+    clock = FakeClock()
+    telemetry = AutomationTelemetry(clock=clock)
+
+    def slow():
+        clock.now += 9.0
+        return {'items': 1}
+
+    run = telemetry.instrument('generate_reports', 10, slow)
+    clock.now += 35.0  # two scheduled runs were missed
+    run()
+
+    job = telemetry.snapshot()['jobs']['generate_reports']
+    assert job['skipped_runs'] == 2
+    assert job['alerts'] == ['last run took 9.0s of a 10s interval',
+                             '2 scheduled run(s) skipped before the last run']
+
+
+def test_percentiles_are_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2], 50) == 1
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([5], 0) == 5
+
+
+def test_status_endpoint_reports_jobs_and_breaker():
+    class Controller:
+        running = True
+        telemetry = AutomationTelemetry()
+
+        def get_breaker_metrics(self):
+            return {'state': 'closed', 'deferred_documents': 0}
+
+    controller = Controller()
+    controller.telemetry.instrument('monitor_quotations', 60, lambda: {'items': 1})()
+    body = create_status_app(controller).test_client().get('/automation/status').get_json()
+
+    assert body['running'] and body['document_service']['state'] == 'closed'
+    assert body['jobs']['monitor_quotations']['total_runs'] == 1
@@ -0,0 +1,145 @@
+"""Tests for bulk_rerender.py against a stubbed main API (keyset paging, resume, stage failures)"""
+
+import json
+import threading
+
+from bulk_rerender import BulkRerenderer, RerenderCheckpoint
+
+
+class StubResponse:
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+        self.status_code = 200
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class StubMainApi:
+    """Quotations listed in ascending (createdAt, id) order, like the keyset route"""
+
+    def __init__(self, count, keyset=True):
+        self.quotations = [self.quotation(i) for i in range(count)]
+        self.keyset = keyset
+        self.list_calls = 0
+
+    @staticmethod
+    def quotation(i):
+        return {'id': f"q{i:03d}", 'number': f"QT-{i:03d}", 'createdAt': f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z"}
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        path = url.split('5000', 1)[1]
+        if path == '/api/quotations':
+            self.list_calls += 1
+            ordered = sorted(self.quotations, key=lambda row: (row['createdAt'], row['id']))
+            if not self.keyset:
+                return StubResponse(list(reversed(ordered)))
+            if params.get('after'):
+                ordered = [row for row in ordered if (row['createdAt'], row['id']) >
+                           (params['after_created_at'], params['after'])]
+            headers = {'X-Paging': 'keyset'}
+            if not params.get('after'):
+                headers['X-Total-Count'] = str(len(self.quotations))
+            return StubResponse(ordered[:params['limit']], headers)
+        record_id = path.split('/')[3]
+        if path.endswith('/items'):
+            return StubResponse([{'productName': 'Hair', 'quantity': '1', 'unitPrice': '10', 'lineTotal': '10'}])
+        return StubResponse({'number': f"QT-{record_id}", 'subtotal': '10', 'total': '10'})
+
+    def close(self):
+        pass
+
+
+def make_rerenderer(api, checkpoint_path, rendered, fail=(), stop_after=None, page_size=5):
+    rerenderer = BulkRerenderer(checkpoint=RerenderCheckpoint(str(checkpoint_path)), page_size=page_size,
+                                fetch_workers=2, render_workers=2)
+    rerenderer.http = api
+    lock = threading.Lock()
+
+    def render(kind, payload):
+        number = payload['quotationNumber']
+        if number in fail:
+            raise ValueError(f"template error in {number}")
+        with lock:
+            rendered.append(number)
+            if stop_after is not None and len(rendered) >= stop_after:
+                # Like Ctrl-C: records already fetched finish, nothing new is fetched
+                rerenderer.stop_event.set()
+        return {'pdf': f"/docs/{number}.pdf"}
+
+    rerenderer.render = render
+    return rerenderer
+
+
+def test_every_record_is_rendered_once_in_ascending_order(tmp_path):
+    api = StubMainApi(23)
+    rendered = []
+    entry = make_rerenderer(api, tmp_path / 'checkpoint.json', rendered).rerender('quotation')
+
+    assert sorted(rendered) == [f"QT-q{i:03d}" for i in range(23)]
+    assert entry['complete'] and entry['rendered'] == 23 and entry['failed'] == []
+    assert entry['after']['id'] == 'q022' and entry['position'] == 23
+    assert api.list_calls == 6  # five pages of five, the last one partial, then an empty page
+
+
+def test_interrupted_run_resumes_after_the_checkpointed_cursor(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    api = StubMainApi(30)
+    first = []
+    make_rerenderer(api, path, first, stop_after=12).rerender('quotation')
+
+    saved = json.loads(path.read_text())['quotation']
+    assert not saved['complete']
+    done = saved['position']
+    assert saved['after']['id'] == f"q{done - 1:03d}"
+    assert {f"QT-q{i:03d}" for i in range(done)} <= set(first)
+
+    # A record created while the run was paused sorts after the cursor and must not shift anything
+    api.quotations.append(StubMainApi.quotation(30))
+    second = []
+    entry = make_rerenderer(api, path, second).rerender('quotation')
+
+    assert entry['complete']
+    assert sorted(second) == [f"QT-q{i:03d}" for i in range(done, 31)]
+    assert entry['rendered'] == 31 and entry['position'] == 31
+
+
+def test_stage_failures_are_recorded_and_do_not_stall_the_checkpoint(tmp_path, monkeypatch):
+    api = StubMainApi(12)
+    rendered = []
+    rerenderer = make_rerenderer(api, tmp_path / 'checkpoint.json', rendered, fail={'QT-q003'})
+    build_payload = rerenderer.build_payload
+
+    def flaky_build(kind, summary):
+        if summary['id'] == 'q007':
+            raise KeyError('clientCode')
+        return build_payload(kind, summary)
+
+    monkeypatch.setattr(rerenderer, 'build_payload', flaky_build)
+    entry = rerenderer.rerender('quotation')
+
+    assert entry['complete'] and entry['position'] == 12
+    assert entry['rendered'] == 10 and len(rendered) == 10
+    failed = {failure['id']: failure['error'] for failure in entry['failed']}
+    assert set(failed) == {'q003', 'q007'}
+    assert 'ValueError' in failed['q003'] and 'KeyError' in failed['q007']
+
+
+def test_server_without_keyset_paging_is_listed_once(tmp_path):
+    api = StubMainApi(11, keyset=False)
+    rendered = []
+    entry = make_rerenderer(api, tmp_path / 'checkpoint.json', rendered).rerender('quotation')
+
+    assert entry['complete'] and sorted(rendered) == [f"QT-q{i:03d}" for i in range(11)]
+    assert api.list_calls == 1
+
+
+def test_offset_checkpoints_from_older_runs_start_over(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text(json.dumps({'quotation': {'offset': 200, 'rendered': 200, 'failed': [], 'complete': False}}))
+    entry = RerenderCheckpoint(str(path)).entry('quotation')
+    assert entry['after'] is None and entry['position'] == 0 and 'offset' not in entry
@@ -0,0 +1,43 @@
+"""Tests for capability_index.py"""
+
+from capability_index import CapabilityIndex
+
+
+def test_route_requires_every_capability_and_prefers_low_load():
+    index = CapabilityIndex()
+    index.add('a', ['pdf', 'docx'], load=3)
+    index.add('b', ['pdf'], load=0)
+    index.add('c', ['pdf', 'docx'], load=1)
+
+    assert index.route(['pdf', 'docx']) == ('c', 2)
+    assert index.route(['pdf']) == ('b', 3)
+    assert index.route(['xlsx']) == (None, 0)
+
+
+def test_ties_are_broken_round_robin():
+    index = CapabilityIndex()
+    for agent_id in ('a', 'b', 'c'):
+        index.add(agent_id, ['pdf'])
+    assert [index.route(['pdf'])[0] for _ in range(4)] == ['a', 'b', 'c', 'a']
+
+
+def test_remove_frees_the_slot_and_empty_bitsets():
+    index = CapabilityIndex()
+    index.add('a', ['pdf'])
+    index.add('b', ['docx'])
+    assert index.remove('a')
+    assert not index.remove('a')
+    assert 'pdf' not in index.by_capability
+
+    index.add('c', ['pdf'], load=2)
+    assert index.slots['c'] == 0
+    assert index.stats() == {'agents': 2, 'capabilities': {'docx': 1, 'pdf': 1}, 'load_levels': {0: 1, 2: 1}}
+
+
+def test_re_adding_with_new_capabilities_reindexes():
+    index = CapabilityIndex()
+    index.add('a', ['pdf'])
+    index.add('a', ['docx'], load=5)
+    assert index.route(['pdf']) == (None, 0)
+    assert index.route(['docx']) == ('a', 1)
+    assert index.loads['a'] == 5
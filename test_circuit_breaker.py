@@ -0,0 +1,81 @@
+"""Tests for circuit_breaker.py"""
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(failure_threshold=3, base_delay=10.0, max_delay=40.0)
+    options.update(kwargs)
+    return CircuitBreaker('docs', clock=clock, **options)
+
+
+def test_opens_after_consecutive_failures_only():
+    breaker = make_breaker(FakeClock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_metrics()['calls']['rejected'] == 1
+
+
+def test_backoff_is_jittered_between_half_and_full_delay():
+    clock = FakeClock()
+    breaker = make_breaker(clock, failure_threshold=1)
+    breaker.record_failure()
+    assert 5.0 <= breaker.retry_in() <= 10.0
+
+    clock.now += 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()  # failed probe doubles the delay
+    assert 10.0 <= breaker.retry_in() <= 20.0
+
+
+def test_half_open_admits_limited_probes_and_closes_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock, failure_threshold=1)
+    breaker.record_failure()
+    clock.now += 10.0
+
+    assert breaker.is_available()
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+    assert not breaker.is_available()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.get_metrics()['transitions'] == {'closed->open': 1, 'open->half_open': 1, 'half_open->closed': 1}
+
+
+def test_call_raises_when_open_and_records_outcomes():
+    clock = FakeClock()
+    breaker = make_breaker(clock, failure_threshold=1)
+
+    def boom():
+        raise RuntimeError('down')
+
+    with pytest.raises(RuntimeError):
+        breaker.call(boom)
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.call(lambda: 'ok')
+    assert error.value.retry_in > 0
+
+    clock.now += 10.0
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
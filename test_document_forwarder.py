@@ -0,0 +1,92 @@
+"""Tests for document_forwarder.py (two forwarders on one database stand in for two API workers)"""
+
+import time
+
+import pytest
+import requests
+
+import document_forwarder
+from document_forwarder import DocumentForwarder, JobTable
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_jobs_accepted_by_one_worker_are_visible_to_another(tmp_path):
+    path = str(tmp_path / 'registry.db')
+    accepting = DocumentForwarder(job_table=JobTable(path))
+    polling = DocumentForwarder(job_table=JobTable(path))
+    finished = []
+    accepting.subscribe(finished.append)
+
+    job = accepting.submit('agent-1', None, lambda: {'success': True, 'files': ['report.pdf']})
+
+    assert polling.get_job(job['job_id'])['agent_id'] == 'agent-1'
+    done = wait_for(lambda: (polling.get_job(job['job_id']) or {}).get('status') == 'completed')
+    assert done, polling.get_job(job['job_id'])
+    assert polling.get_job(job['job_id'])['result'] == {'success': True, 'files': ['report.pdf']}
+    assert finished[0]['job_id'] == job['job_id']
+
+
+def test_render_errors_mark_the_job_failed(tmp_path):
+    forwarder = DocumentForwarder(job_table=JobTable(str(tmp_path / 'registry.db')))
+
+    def broken():
+        raise RuntimeError('document service down')
+
+    job = forwarder.submit('agent-1', None, broken)
+    assert wait_for(lambda: forwarder.get_job(job['job_id'])['status'] == 'failed')
+    assert forwarder.get_job(job['job_id'])['result'] == {'error': 'document service down'}
+
+
+def test_job_table_keeps_only_the_newest_jobs(tmp_path):
+    table = JobTable(str(tmp_path / 'registry.db'), max_jobs=3)
+    for i in range(5):
+        table.insert({'job_id': f'job-{i}', 'status': 'accepted'})
+    assert [table.get(f'job-{i}') is not None for i in range(5)] == [False, False, True, True, True]
+    assert table.get('missing') is None
+
+
+@pytest.mark.parametrize('outcomes, callback, posts', [
+    ([200], 'delivered', 1),
+    ([503, 502, 200], 'delivered', 3),
+    ([requests.ConnectionError('reset'), 204], 'delivered', 2),
+    ([404], 'failed', 1),
+    ([302], 'failed', 1),
+    ([500, 500, 500, 500], 'failed', 4),
+])
+def test_only_2xx_callbacks_are_delivered_and_only_5xx_are_retried(tmp_path, monkeypatch, outcomes, callback, posts):
+    monkeypatch.setattr(document_forwarder.random, 'uniform', lambda low, high: 0)
+    calls = []
+
+    def post(url, json=None, **kwargs):
+        calls.append(json)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return StubResponse(outcome)
+
+    monkeypatch.setattr(document_forwarder.http_client, 'post', post)
+    forwarder = DocumentForwarder(job_table=JobTable(str(tmp_path / 'registry.db')), batch_window=0)
+    job = forwarder.submit('agent-1', 'http://agent.local/callback', lambda: {'success': True})
+
+    assert wait_for(lambda: forwarder.get_job(job['job_id']).get('callback'))
+    stored = forwarder.get_job(job['job_id'])
+    assert stored['callback'] == callback
+    assert len(calls) == posts
+    assert calls[0]['results'][0]['job_id'] == job['job_id']
+    if callback == 'failed':
+        assert stored['callback_error'] == f"HTTP {outcomes[-1]}"
+    assert forwarder.get_stats()['callback_retries'] == posts - 1
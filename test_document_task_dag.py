@@ -0,0 +1,76 @@
+"""Tests for document_task_dag.py"""
+
+import threading
+
+import pytest
+
+from document_task_dag import DEFERRED, FAILED, SKIPPED, SUCCEEDED, DocumentTaskDAG, TaskDeferred
+
+
+def deferred():
+    raise TaskDeferred('service unavailable')
+
+
+def test_children_run_after_parents_and_failures_skip_the_subtree():
+    order = []
+    lock = threading.Lock()
+
+    def step(name, ok=True):
+        with lock:
+            order.append(name)
+        return ok
+
+    dag = DocumentTaskDAG(max_workers=2)
+    dag.add_task('a', step, ('a',))
+    dag.add_task('b', step, ('b', False))
+    dag.add_task('c', step, ('c',), ['a'])
+    dag.add_task('d', step, ('d',), ['a', 'b'])
+    dag.add_task('e', step, ('e',), ['d'])
+    dag.run(timeout=5)
+
+    assert dag.summary() == {SUCCEEDED: 2, FAILED: 1, SKIPPED: 2}
+    assert order.index('c') > order.index('a')
+    assert 'd' not in order and 'e' not in order
+    assert dag.tasks['e'].error == 'Dependency d skipped'
+
+
+def test_add_task_rejects_duplicates_and_unknown_parents():
+    dag = DocumentTaskDAG(max_workers=1)
+    dag.add_task('a', lambda: True)
+    with pytest.raises(ValueError):
+        dag.add_task('a', lambda: True)
+    with pytest.raises(ValueError):
+        dag.add_task('b', lambda: True, (), ['missing'])
+
+
+def test_resume_runs_the_skipped_subtree_once_every_deferred_parent_is_done():
+    ran = []
+    dag = DocumentTaskDAG(max_workers=2)
+    dag.add_task('qt:pdf', deferred)
+    dag.add_task('qt:docx', deferred)
+    dag.add_task('so:pdf', lambda: ran.append('so:pdf') or True, (), ['qt:pdf', 'qt:docx'])
+    dag.add_task('so:record', lambda: ran.append('so:record') or True, (), ['so:pdf'])
+    dag.run(timeout=5)
+    assert dag.summary() == {DEFERRED: 2, SKIPPED: 2}
+
+    dag.resume('qt:pdf', {'ok': True})
+    assert dag.wait(timeout=5)
+    assert ran == []  # still waiting on qt:docx
+    assert dag.tasks['so:pdf'].error == 'Dependency qt:docx deferred'
+
+    dag.resume('qt:docx', {'ok': True})
+    assert dag.wait(timeout=5)
+    assert ran == ['so:pdf', 'so:record']
+    assert dag.summary() == {SUCCEEDED: 4}
+
+
+def test_resume_leaves_tasks_with_a_failed_parent_skipped():
+    dag = DocumentTaskDAG(max_workers=2)
+    dag.add_task('deferred', deferred)
+    dag.add_task('broken', lambda: False)
+    dag.add_task('child', lambda: True, (), ['deferred', 'broken'])
+    dag.run(timeout=5)
+
+    assert dag.resume('deferred', True) == []
+    assert dag.tasks['child'].status == SKIPPED
+    assert dag.wait(timeout=1)
@@ -0,0 +1,89 @@
+"""Tests for health_prober.py against a stubbed HTTP client"""
+
+import threading
+
+import requests
+
+from health_prober import HealthProber
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class StubClient:
+    """Answers /health from ``statuses`` (url -> status code, or None for connection refused)"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.gates = {}  # url -> Event the probe waits on before answering
+
+    def get(self, url, timeout=None):
+        base = url[:-len('/health')]
+        gate = self.gates.get(base)
+        if gate is not None:
+            gate.wait(5)
+        status = self.statuses.get(base)
+        if status is None:
+            raise requests.ConnectionError(f"connection refused: {base}")
+        return StubResponse(status)
+
+    def close(self):
+        pass
+
+
+def make(services, statuses):
+    prober = HealthProber(services=services)
+    prober.client = StubClient(statuses)
+    return prober
+
+
+def test_statuses_and_failure_streaks():
+    statuses = {'http://a': 200, 'http://b': 503, 'http://c': None}
+    prober = make({'a': 'http://a', 'b': 'http://b', 'c': 'http://c'}, statuses)
+    try:
+        first = prober.probe_all()
+        assert {name: result['status'] for name, result in first.items()} == \
+            {'a': 'online', 'b': 'error', 'c': 'offline'}
+        assert first['c']['error'] == 'ConnectionError' and first['b']['status_code'] == 503
+
+        statuses['http://b'] = 200
+        second = prober.probe_all()
+        assert second['a']['since'] == first['a']['since'] and second['a']['consecutive_failures'] == 0
+        assert second['b']['status'] == 'online' and second['b']['since'] == second['b']['checked_at']
+        assert second['c']['consecutive_failures'] == 2
+        assert prober.is_healthy('http://b/') and not prober.is_healthy('http://c')
+    finally:
+        prober.stop()
+
+
+def test_service_added_during_a_round_is_kept():
+    statuses = {'http://a': 200, 'http://slow': 200, 'http://late': 200}
+    client_gate = threading.Event()
+    prober = make({'a': 'http://a', 'slow': 'http://slow'}, statuses)
+    prober.client.gates['http://slow'] = client_gate
+    try:
+        round_done = threading.Event()
+        threading.Thread(target=lambda: (prober.probe_all(), round_done.set()), daemon=True).start()
+
+        assert prober.add_service('late', 'http://late/')['status'] == 'online'
+        client_gate.set()
+        assert round_done.wait(5)
+
+        snapshot = prober.get_snapshot()
+        assert set(snapshot) == {'a', 'slow', 'late'}
+        assert prober.get_status('http://late') == 'online'
+        assert prober.probe_all()['late']['consecutive_failures'] == 0
+    finally:
+        prober.stop()
+
+
+def test_unknown_url_is_probed_and_tracked():
+    prober = make({}, {'http://x': 200})
+    try:
+        assert prober.get_status('http://x') == 'online'
+        assert 'http://x' in prober.services and 'http://x' in prober.get_snapshot()
+        assert 'http://x' in prober.probe_all()
+    finally:
+        prober.stop()
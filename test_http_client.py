@@ -0,0 +1,146 @@
+"""Tests for http_client.py retry rules and the HTTP/2 response wrapper (session stubbed)"""
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+import http_client
+from http_client import Http2Response, HttpClient, _connection_not_established
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def refused():
+    """What requests raises when nothing listens on the port"""
+    reason = NewConnectionError(None, 'Failed to establish a new connection: [Errno 111] Connection refused')
+    return requests.ConnectionError(MaxRetryError(None, 'http://localhost:5001/', reason))
+
+
+def reset():
+    """A connection that was up and dropped mid-request"""
+    return requests.ConnectionError('Connection aborted.', ConnectionResetError(104, 'Connection reset by peer'))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(http_client.time, 'sleep', lambda seconds: None)
+    client = HttpClient(retries=2)
+    client.outcomes = []
+    client.calls = []
+
+    def request(method, url, **kwargs):
+        client.calls.append(method)
+        outcome = client.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return StubResponse(outcome)
+
+    monkeypatch.setattr(client.session, 'request', request)
+    yield client
+    client.close()
+
+
+def test_connection_not_established():
+    assert _connection_not_established(refused())
+    assert _connection_not_established(requests.ConnectTimeout('connect timed out'))
+    assert not _connection_not_established(reset())
+    assert not _connection_not_established(requests.ReadTimeout('read timed out'))
+
+
+@pytest.mark.parametrize('status', [502, 503, 504])
+def test_idempotent_requests_retry_gateway_errors(client, status):
+    client.outcomes = [status, 200]
+    assert client.get('http://svc/health').status_code == 200
+    assert client.calls == ['GET', 'GET']
+    assert client.stats == {'requests': 2, 'retries': 1, 'failures': 0}
+
+
+def test_retries_are_bounded_and_return_the_last_response(client):
+    client.outcomes = [503, 503, 503]
+    assert client.get('http://svc/health').status_code == 503
+    assert len(client.calls) == 3
+
+
+def test_other_statuses_are_not_retried(client):
+    client.outcomes = [500]
+    assert client.get('http://svc/health').status_code == 500
+    assert client.calls == ['GET']
+
+
+def test_idempotent_requests_retry_dropped_connections_and_timeouts(client):
+    client.outcomes = [reset(), requests.ReadTimeout('read timed out'), 200]
+    assert client.put('http://svc/item', json={}).status_code == 200
+    assert len(client.calls) == 3
+
+
+def test_post_is_not_retried_once_it_may_have_been_sent(client):
+    client.outcomes = [503]
+    assert client.post('http://svc/generate', json={}).status_code == 503
+
+    client.outcomes = [reset()]
+    with pytest.raises(requests.ConnectionError):
+        client.post('http://svc/generate', json={})
+
+    client.outcomes = [requests.ReadTimeout('read timed out')]
+    with pytest.raises(requests.ReadTimeout):
+        client.post('http://svc/generate', json={})
+    assert client.calls == ['POST'] * 3
+    assert client.stats['failures'] == 2
+
+
+def test_post_retries_when_the_connection_was_never_established(client):
+    client.outcomes = [refused(), requests.ConnectTimeout('connect timed out'), 200]
+    assert client.post('http://svc/generate', json={}).status_code == 200
+    assert client.calls == ['POST'] * 3
+
+
+def test_post_marked_idempotent_retries_like_get(client):
+    client.outcomes = [504, reset(), 200]
+    assert client.post('http://svc/generate', json={}, idempotent=True).status_code == 200
+    assert len(client.calls) == 3
+
+
+def test_exhausted_retries_raise(client):
+    client.outcomes = [refused()] * 3
+    with pytest.raises(requests.ConnectionError):
+        client.get('http://svc/health')
+    assert client.stats == {'requests': 3, 'retries': 2, 'failures': 1}
+
+
+class FakeHttpxResponse:
+    def __init__(self, status_code, content=b'{"ok": true}', history=()):
+        self.status_code = status_code
+        self.headers = {'content-type': 'application/json'}
+        self.url = 'https://ai.innovatehub.ph/api/status'
+        self.reason_phrase = 'Service Unavailable' if status_code == 503 else 'OK'
+        self.history = list(history)
+        self.content = content
+        self.text = content.decode()
+        self.encoding = 'utf-8'
+
+
+def test_http2_responses_raise_requests_errors():
+    response = Http2Response(FakeHttpxResponse(503))
+    assert not response.ok
+    with pytest.raises(requests.HTTPError) as raised:
+        response.raise_for_status()
+    assert raised.value.response is response
+    assert str(raised.value) == '503 Server Error: Service Unavailable for url: https://ai.innovatehub.ph/api/status'
+
+    with pytest.raises(requests.RequestException):
+        Http2Response(FakeHttpxResponse(200, content=b'<html>')).json()
+
+
+def test_http2_response_reads_like_requests():
+    response = Http2Response(FakeHttpxResponse(200, history=[FakeHttpxResponse(301)]))
+    response.raise_for_status()
+    assert response.ok and response.json() == {'ok': True}
+    assert response.headers['content-type'] == 'application/json'
+    assert [redirect.status_code for redirect in response.history] == [301]
@@ -0,0 +1,96 @@
+"""Tests for idempotency_store.py (two stores on one database stand in for two API workers)"""
+
+import threading
+
+import pytest
+
+from idempotency_store import IdempotencyStore
+
+PAYLOAD = {'agent_id': 'agent-1', 'filename_base': 'report', 'formats': ['pdf']}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def workers(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'registry.db')
+    return IdempotencyStore(path, clock=clock), IdempotencyStore(path, clock=clock), clock
+
+
+def test_duplicate_on_another_worker_waits_for_the_original(workers):
+    a, b, _ = workers
+    entry, owner = a.begin('agent-1', 'key-1', PAYLOAD)
+    assert owner
+
+    duplicate, owner = b.begin('agent-1', 'key-1', PAYLOAD)
+    assert not owner and not duplicate['done']
+    outcome = []
+    waiter = threading.Thread(target=lambda: outcome.append(b.wait(duplicate, timeout=5)))
+    waiter.start()
+
+    a.finish('agent-1', 'key-1', {'success': True}, 200)
+    waiter.join(5)
+    assert outcome == [({'success': True}, 200)]
+
+    replay, owner = b.begin('agent-1', 'key-1', PAYLOAD)
+    assert not owner and b.wait(replay) == ({'success': True}, 200)
+    assert b.get_stats()['attached'] == 1 and b.get_stats()['replayed'] == 1
+
+
+def test_key_reused_with_a_different_payload_is_rejected(workers):
+    a, b, _ = workers
+    a.begin('agent-1', 'key-1', PAYLOAD)
+    assert b.begin('agent-1', 'key-1', dict(PAYLOAD, formats=['docx'])) == (None, False)
+    assert b.begin('agent-2', 'key-1', PAYLOAD)[1]  # keys are per agent
+
+
+def test_failures_reach_waiters_and_are_then_forgotten(workers):
+    a, b, _ = workers
+    a.begin('agent-1', 'key-1', PAYLOAD)
+    duplicate, _ = b.begin('agent-1', 'key-1', PAYLOAD)
+    a.finish('agent-1', 'key-1', {'error': 'down'}, 503)
+
+    assert b.wait(duplicate, timeout=1) == ({'error': 'down'}, 503)
+    assert b.begin('agent-1', 'key-1', PAYLOAD)[1]
+
+
+def test_waiting_times_out_while_the_original_runs(workers):
+    a, b, _ = workers
+    a.begin('agent-1', 'key-1', PAYLOAD)
+    duplicate, _ = b.begin('agent-1', 'key-1', PAYLOAD)
+    assert b.wait(duplicate, timeout=0.1) == (None, None)
+
+
+def test_expired_and_abandoned_entries_are_replaced(workers):
+    a, b, clock = workers
+    a.begin('agent-1', 'done', PAYLOAD)
+    a.finish('agent-1', 'done', {'success': True}, 200)
+    a.begin('agent-1', 'abandoned', PAYLOAD)
+
+    clock.now += a.stale_after + 1
+    assert not b.begin('agent-1', 'done', PAYLOAD)[1]
+    assert b.begin('agent-1', 'abandoned', PAYLOAD)[1]
+
+    clock.now += a.ttl
+    assert b.begin('agent-1', 'done', PAYLOAD)[1]
+
+
+def test_capacity_evicts_the_oldest_completed_entries(tmp_path):
+    clock = FakeClock()
+    store = IdempotencyStore(str(tmp_path / 'registry.db'), capacity=2, clock=clock)
+    for i in range(3):
+        clock.now += 1
+        store.begin('agent-1', f'key-{i}', PAYLOAD)
+        store.finish('agent-1', f'key-{i}', {'n': i}, 200)
+    store.begin('agent-1', 'in-flight', PAYLOAD)
+
+    assert store.get_stats()['entries'] == 2
+    assert store.begin('agent-1', 'key-0', PAYLOAD)[1]
+    assert not store.begin('agent-1', 'in-flight', PAYLOAD)[1]
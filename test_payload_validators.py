@@ -0,0 +1,62 @@
+"""Tests for payload_validators.py"""
+
+from payload_validators import (MAX_REPORTED_ERRORS, validate_document_request, validate_job_order,
+                                validate_quotation, validate_workflow_trigger)
+
+ITEM = {'productName': 'Lace wig', 'quantity': 2, 'unitPrice': 10.5, 'lineTotal': 21}
+
+
+def test_valid_quotation_passes():
+    assert validate_quotation({'quotationNumber': 'QT-1', 'items': [ITEM], 'total': 21}) == []
+
+
+def test_missing_and_mistyped_fields_are_reported_with_paths():
+    errors = validate_quotation({'items': [dict(ITEM, quantity='2', unitPrice=float('nan'))], 'discount': -1})
+    assert sorted(errors) == ['discount: must be >= 0',
+                              'items[0].quantity: expected a number',
+                              'items[0].unitPrice: expected a number',
+                              'quotationNumber: required']
+
+
+def test_bools_are_not_numbers():
+    assert validate_quotation({'quotationNumber': 'QT-1', 'items': [dict(ITEM, lineTotal=True)]}) == \
+        ['items[0].lineTotal: expected a number']
+
+
+def test_job_order_choices_and_dates():
+    errors = validate_job_order({'jobOrderNumber': 'JO-1', 'items': [], 'priority': 'ASAP', 'dueDate': '01/02/2026'})
+    assert errors == ["priority: must be one of ['High', 'Low', 'Normal', 'Urgent']",
+                      'dueDate: does not match ^\\d{4}-\\d{2}-\\d{2}']
+
+
+def test_reported_errors_are_capped():
+    errors = validate_quotation({'quotationNumber': 'QT-1', 'items': [{}] * 50})
+    assert len(errors) == MAX_REPORTED_ERRORS
+
+
+def test_document_request_envelope():
+    ok = {'filename_base': 'report_1', 'content': '# Report', 'formats': ['pdf', 'docx']}
+    assert validate_document_request(ok) == []
+    assert validate_document_request(dict(ok, filename_base='../etc')) == \
+        ['filename_base: does not match ^[A-Za-z0-9][A-Za-z0-9_.-]*$']
+    assert validate_document_request(dict(ok, formats=['exe'])) == \
+        ["formats: entries must be from ['docx', 'md', 'pdf']"]
+    assert validate_document_request(['not', 'a', 'dict']) == ['payload: expected an object']
+
+
+def test_document_request_checks_the_declared_payload_type():
+    request = {'filename_base': 'qt', 'content': 'x', 'formats': ['pdf'], 'document_type': 'quotation'}
+    assert validate_document_request(request) == ['quotationNumber: required', 'items: required']
+    assert validate_document_request(dict(request, quotationNumber='QT-1', items=[ITEM])) == []
+
+    untyped = {'filename_base': 'qt', 'content': 'x', 'formats': ['pdf'], 'items': [{'productName': 'x'}]}
+    assert 'items[0].quantity: required' in validate_document_request(untyped)
+
+
+def test_workflow_trigger():
+    assert validate_workflow_trigger({'workflow_type': 'generate_quotation',
+                                      'workflow_data': {'customer_name': 'A', 'total_amount': '12.50'}}) == []
+    assert validate_workflow_trigger({'workflow_type': 'generate_quotation',
+                                      'workflow_data': {'customer_name': 'A', 'total_amount': '12,50'}}) == \
+        ['total_amount: expected an amount']
+    assert validate_workflow_trigger({'workflow_type': 'delete_everything'})[0].startswith('workflow_type:')
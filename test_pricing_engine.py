@@ -0,0 +1,74 @@
+"""Tests for pricing_engine.py (run on the NumPy columns when installed and on plain Python ints)"""
+
+from decimal import Decimal
+
+import pytest
+
+import pricing_engine
+from pricing_engine import compute_pricing, pricing_summary
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'numpy':
+        if numpy is None:
+            pytest.skip('NumPy not installed')
+        monkeypatch.setattr(pricing_engine, 'np', numpy)
+    else:
+        monkeypatch.setattr(pricing_engine, 'np', None)
+    return request.param
+
+
+def test_totals_are_exact_fixed_point(engine):
+    data = {
+        'items': [{'quantity': 3, 'unitPrice': 0.1, 'lineTotal': 0.3},
+                  {'quantity': '2.5', 'unitPrice': '19.99', 'lineTotal': '49.98'}],
+        'shippingFee': 10, 'bankCharge': '1.50', 'discount': 5,
+        'subtotal': 50.28, 'total': 56.78
+    }
+    result = compute_pricing(data)
+
+    assert result['valid']
+    assert result['subtotal'] == Decimal('50.28')
+    assert result['total'] == Decimal('56.78')
+
+
+def test_line_totals_round_half_away_from_zero(engine):
+    result = compute_pricing({'items': [{'quantity': 1, 'unitPrice': 0.005},
+                                        {'quantity': -1, 'unitPrice': 0.005}]})
+    assert list(pricing_engine._column_list(result['line_totals_cents'])) == [1, -1]
+    assert result['negative_lines'] == 1
+    assert not result['valid']
+
+
+def test_mismatches_are_reported(engine):
+    result = pricing_summary(compute_pricing({
+        'items': [{'quantity': 2, 'unitPrice': 10, 'lineTotal': 25}],
+        'subtotal': 25, 'total': 25
+    }))
+    assert result['mismatch_count'] == 3
+    assert result['mismatches'][0] == {'field': 'items[0].lineTotal', 'claimed': '25.00', 'computed': '20.00'}
+
+
+def test_large_amounts_do_not_overflow(engine):
+    # quantity x price in fixed point is ~1.5e20, past int64
+    data = {'items': [{'quantity': 5000000, 'unitPrice': 3000000.5, 'lineTotal': 15000002500000}],
+            'total': 15000002500000}
+    result = compute_pricing(data)
+    assert result['valid'], pricing_summary(result)['mismatches']
+    assert result['total'] == Decimal('15000002500000.00')
+
+
+def test_huge_scaled_values_fall_back_to_python_ints(engine):
+    data = {'items': [{'quantity': 1, 'unitPrice': 1e15}] * 3}
+    assert compute_pricing(data)['subtotal'] == Decimal('3000000000000000.00')
+
+
+def test_non_numeric_values_are_rejected(engine):
+    with pytest.raises(ValueError):
+        compute_pricing({'items': [{'quantity': 'two', 'unitPrice': 1}]})
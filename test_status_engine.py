@@ -0,0 +1,38 @@
+"""Tests for status_engine.py probe deadlines"""
+
+import threading
+import time
+
+import analytics_cache
+import status_engine
+from analytics_cache import AnalyticsCache
+
+
+def test_cache_get_returns_within_timeout_and_fills_later():
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(5)
+        return {'overview': {'total_quotations': 3}}
+
+    cache = AnalyticsCache(slow_fetch)
+    started = time.monotonic()
+    assert cache.get(timeout=0.05) is None
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    assert cache.get(timeout=1.0) == {'overview': {'total_quotations': 3}}
+    assert cache.get_stats()['refreshes'] == 1
+
+
+def test_probe_dashboard_honours_its_deadline(monkeypatch):
+    release = threading.Event()
+    cache = AnalyticsCache(lambda: release.wait(5) and {'overview': {'total_orders': 1}})
+    monkeypatch.setitem(analytics_cache._caches, status_engine.MAIN_APP_URL, cache)
+
+    started = time.monotonic()
+    assert status_engine.probe_dashboard(0.05) == {'available': False, 'overview': {}}
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    assert status_engine.probe_dashboard(1.0) == {'available': True, 'overview': {'total_orders': 1}}
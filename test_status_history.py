@@ -0,0 +1,111 @@
+"""Tests for status_history.py rollups, retention and uptime"""
+
+import pytest
+
+import status_history
+from status_history import StatusHistory, percentile
+
+HOUR = 3600
+T0 = 500000 * HOUR  # hour-aligned
+
+
+class FakeClock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def history(tmp_path):
+    clock = FakeClock()
+    history = StatusHistory(str(tmp_path / 'history.db'), clock=clock)
+    history.fake_clock = clock
+    yield history
+    history.close()
+
+
+def record_at(history, offset, samples):
+    history.fake_clock.now = T0 + offset
+    history.record(samples)
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 21))
+    assert percentile(values, 0.5) == 10
+    assert percentile(values, 0.95) == 19
+    assert percentile(values, 1.0) == 20
+    assert percentile([7], 0.95) == 7
+    assert percentile([], 0.5) is None
+
+
+def test_completed_minutes_and_hours_are_rolled_up(history):
+    for latency in range(1, 21):
+        record_at(history, 10, [('main_application', latency != 20, float(latency))])
+    record_at(history, 70, [('main_application', True, 5.0)])
+    record_at(history, HOUR + 5, [('main_application', True, 1.0)])
+
+    minute = history.latency(2 * HOUR, 'main_application', resolution='minute')
+    assert [(row['samples'], row['p50_ms'], row['p95_ms'], row['max_ms'], row['uptime_percent'])
+            for row in minute] == [(20, 10.0, 19.0, 20.0, 95.0), (1, 5.0, 5.0, 5.0, 100.0)]
+
+    hour = history.latency(2 * HOUR, 'main_application')
+    assert len(hour) == 1 and hour[0]['samples'] == 21 and hour[0]['p95_ms'] == 19.0
+
+
+def test_uptime_counts_rolled_hours_and_the_open_hour_once(history):
+    record_at(history, 10, [('a', True, 1.0), ('b', False, None)])
+    record_at(history, 130, [('a', False, 1.0), ('b', False, None)])
+    record_at(history, HOUR + 30, [('a', True, 1.0)])
+    record_at(history, HOUR + 200, [('a', True, 1.0), ('b', True, 2.0)])
+
+    # The first hour is in rollup_hour and still in raw samples; it must count once
+    assert history._watermark('hour') == T0 // HOUR + 1
+    assert history.uptime(2 * HOUR) == {
+        'a': {'samples': 4, 'uptime_percent': 75.0},
+        'b': {'samples': 3, 'uptime_percent': 33.33}
+    }
+    assert history.uptime(2 * HOUR, series='b') == {'b': {'samples': 3, 'uptime_percent': 33.33}}
+    # A window starting inside the open hour reads raw samples from the start of that hour
+    assert history.uptime(150)['a']['samples'] == 2
+
+
+def test_retention_drops_each_tier_on_its_own_schedule(history):
+    record_at(history, 10, [('a', True, 1.0)])
+    record_at(history, HOUR + 10, [('a', False, 2.0)])
+
+    history.fake_clock.now = T0 + 3 * 86400
+    history.rollup()
+    count = history.db.execute('SELECT COUNT(*) FROM samples').fetchone()[0]
+    assert count == 0
+    assert len(history.latency(4 * 86400, resolution='minute')) == 2
+
+    history.fake_clock.now = T0 + 15 * 86400
+    history.rollup()
+    assert history.latency(16 * 86400, resolution='minute') == []
+    assert history.uptime(16 * 86400) == {'a': {'samples': 2, 'uptime_percent': 50.0}}
+
+
+def test_record_report_reuses_one_store_and_throttles_rollups(tmp_path, monkeypatch):
+    monkeypatch.setattr(status_history, '_histories', {})
+    path = str(tmp_path / 'history.db')
+    report = {'probes': {'services': {'status': 'ok', 'elapsed_ms': 12.0,
+                                      'result': {'main_application': {'status': 'online', 'latency_ms': 3.0}}}}}
+
+    history = status_history.get_history(path)
+    history.clock = FakeClock(T0 + 5)
+    rollups = []
+    rollup = history.rollup
+    monkeypatch.setattr(history, 'rollup', lambda now=None: (rollups.append(now), rollup(now)))
+
+    status_history.record_report(report, path)
+    status_history.record_report(report, path)
+    history.clock.now = T0 + 65
+    status_history.record_report(report, path)
+
+    assert status_history.get_history(path) is history
+    assert rollups == [T0 + 5, T0 + 65]
+    assert history.uptime(HOUR)['main_application']['samples'] == 3
+    assert history.uptime(HOUR)['probe.services'] == {'samples': 3, 'uptime_percent': 100.0}
+    history.close()
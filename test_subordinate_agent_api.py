@@ -0,0 +1,138 @@
+"""Tests for subordinate_agent_api.py endpoints (Flask test client, registry in a temp directory)"""
+
+import pytest
+
+import subordinate_agent_api as api
+from agent_activity import ActivityRecorder
+from agent_admission import SharedTokenBuckets
+from agent_push_channel import PushOutbox
+from agent_registry import AgentRegistry
+from document_forwarder import JobTable
+from idempotency_store import IdempotencyStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    interface = api.agent_interface
+    monkeypatch.setattr(interface, 'registry', AgentRegistry(str(tmp_path / 'registry.db')))
+    monkeypatch.setattr(interface, 'activity', ActivityRecorder(directory=str(tmp_path / 'activity')))
+    monkeypatch.setattr(interface.forwarder, 'job_table', JobTable(str(tmp_path / 'registry.db')))
+    monkeypatch.setattr(interface.admission, 'buckets', SharedTokenBuckets(str(tmp_path / 'registry.db')))
+    monkeypatch.setattr(interface, 'idempotency', IdempotencyStore(str(tmp_path / 'registry.db')))
+    monkeypatch.setattr(interface.push, 'outbox', PushOutbox(str(tmp_path / 'registry.db')))
+    # No background ticker or push server in tests
+    monkeypatch.setattr(interface.liveness, 'start', lambda: interface.liveness)
+    monkeypatch.setattr(interface.push, 'start', lambda: None)
+    return api.app.test_client()
+
+
+def test_register_indexes_capabilities(client):
+    response = client.post('/api/agent/register', json={'agent_id': 'agent-1', 'capabilities': ['pdf', 'docx']})
+    assert response.status_code == 200
+    assert response.get_json()['agent_info']['capabilities'] == ['pdf', 'docx']
+    assert api.agent_interface.registry.route(['pdf'])[0]['agent_id'] == 'agent-1'
+
+
+@pytest.mark.parametrize('capabilities', ['pdf', ['pdf', 3], {'pdf': True}])
+def test_register_rejects_malformed_capabilities(client, capabilities):
+    response = client.post('/api/agent/register', json={'agent_id': 'agent-1', 'capabilities': capabilities})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'capabilities must be a list of strings'
+    assert api.agent_interface.registry.count() == 0
+    assert api.agent_interface.registry.index_stats()['capabilities'] == {}
+
+
+def test_register_requires_an_agent_id(client):
+    assert client.post('/api/agent/register', json={'capabilities': []}).status_code == 400
+    assert client.post('/api/agent/register', json=['agent-1']).status_code == 400
+
+
+def test_document_jobs_are_read_from_the_shared_table(client):
+    table = api.agent_interface.forwarder.job_table
+    table.insert({'job_id': 'job-1', 'agent_id': 'agent-1', 'status': 'accepted'})
+    table.update({'job_id': 'job-1', 'agent_id': 'agent-1', 'status': 'completed', 'result': {'success': True}})
+
+    response = client.get('/api/agent/document/jobs/job-1')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'completed'
+    assert client.get('/api/agent/document/jobs/job-2').status_code == 404
+
+
+def test_retried_document_request_is_replayed(client, monkeypatch):
+    calls = []
+
+    def render(agent, data):
+        calls.append(data['filename_base'])
+        return api.jsonify({'success': True, 'files': ['report.pdf']}), 200
+
+    monkeypatch.setattr(api, 'generate_document_response', render)
+    client.post('/api/agent/register', json={'agent_id': 'agent-1', 'capabilities': ['pdf']})
+    body = {'agent_id': 'agent-1', 'filename_base': 'report', 'content': 'x', 'formats': ['pdf']}
+
+    first = client.post('/api/agent/document/generate', json=body, headers={'Idempotency-Key': 'k1'})
+    retry = client.post('/api/agent/document/generate', json=body, headers={'Idempotency-Key': 'k1'})
+    assert first.get_json() == retry.get_json() == {'success': True, 'files': ['report.pdf']}
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert calls == ['report']
+
+    changed = client.post('/api/agent/document/generate', json=dict(body, content='y'),
+                          headers={'Idempotency-Key': 'k1'})
+    assert changed.status_code == 422
+
+
+def register(client, count):
+    for i in range(count):
+        client.post('/api/agent/register', json={'agent_id': f'agent-{i}', 'capabilities': ['pdf']})
+
+
+def test_each_page_has_its_own_etag(client):
+    register(client, 3)
+    first = client.get('/api/agent/list?limit=2')
+    second = client.get(f"/api/agent/list?limit=2&cursor={first.get_json()['next_cursor']}")
+    assert list(second.get_json()['registered_agents']) == ['agent-2']
+    assert first.headers['ETag'] != second.headers['ETag']
+
+    # The first page's ETag must not validate the second page
+    revalidated = client.get(f"/api/agent/list?limit=2&cursor={first.get_json()['next_cursor']}",
+                             headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 200
+
+    # Parameter order does not matter
+    same = client.get(f"/api/agent/list?cursor={first.get_json()['next_cursor']}&limit=2",
+                      headers={'If-None-Match': second.headers['ETag']})
+    assert same.status_code == 304
+
+
+def test_pings_only_move_etags_of_listings_that_show_them(client):
+    register(client, 2)
+    full = client.get('/api/agent/list')
+    slim = client.get('/api/agent/list?fields=capabilities,status')
+
+    client.post('/api/agent/ping', json={'agent_id': 'agent-0', 'load': 3})
+    assert client.get('/api/agent/list', headers={'If-None-Match': full.headers['ETag']}).status_code == 200
+    assert client.get('/api/agent/list?fields=capabilities,status',
+                      headers={'If-None-Match': slim.headers['ETag']}).status_code == 304
+
+    api.agent_interface.registry.set_status('agent-1', 'suspect')
+    assert client.get('/api/agent/list?fields=capabilities,status',
+                      headers={'If-None-Match': slim.headers['ETag']}).status_code == 200
+
+
+def test_agent_with_a_zero_rate_gets_a_capped_retry_after(client, monkeypatch):
+    client.post('/api/agent/register', json={'agent_id': 'agent-1', 'capabilities': ['pdf']})
+    monkeypatch.setitem(api.agent_interface.admission.bucket_limits, 'agent-1', {'rate': 0, 'burst': 0})
+
+    response = client.post('/api/agent/document/generate',
+                           json={'agent_id': 'agent-1', 'filename_base': 'report', 'content': 'x', 'formats': ['pdf']})
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == str(api.MAX_RETRY_AFTER)
+    assert response.get_json()['retry_after'] == api.MAX_RETRY_AFTER
+
+
+def test_create_app_starts_background_services_before_any_request(client, monkeypatch):
+    started = []
+    monkeypatch.setattr(api.agent_interface.liveness, 'start', lambda: started.append('liveness'))
+    monkeypatch.setattr(api.agent_interface.push, 'start', lambda: started.append('push'))
+
+    assert api.create_app() is api.app
+    assert started == ['liveness', 'push']
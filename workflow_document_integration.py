@@ -15,20 +15,51 @@ import json
 import os
 from datetime import datetime, timedelta
 
+from payload_validators import VALIDATORS
+from pricing_engine import compute_pricing
+
+# Orders with at least this many item rows are streamed to the document service
+STREAMING_ITEM_THRESHOLD = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def iter_content_chunks(pieces, chunk_size=STREAM_CHUNK_SIZE):
+    """Batch small content pieces into chunks of roughly chunk_size characters"""
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+def iter_json_document_body(filename_base, content_chunks, formats):
+    """Encode a generate request as a JSON byte stream without joining the content"""
+    yield f'{{"filename_base": {json.dumps(filename_base)}, "formats": {json.dumps(list(formats))}, "content": "'.encode('utf-8')
+    for chunk in content_chunks:
+        # JSON string escaping is per character, so chunks can be escaped independently
+        yield json.dumps(chunk)[1:-1].encode('utf-8')
+    yield b'"}'
+
 class HiblaDocumentWorkflow:
     def __init__(self, doc_service_url="http://localhost:5001", main_api_url="http://localhost:5000"):
         self.doc_service_url = doc_service_url
         self.main_api_url = main_api_url
+        # Subclasses may swap in a pooled http_client.HttpClient
+        self.http = requests
         
     def check_services_health(self):
         """Check if both services are running"""
         try:
             # Check document generation service
-            doc_health = requests.get(f"{self.doc_service_url}/health", timeout=5)
+            doc_health = self.http.get(f"{self.doc_service_url}/health", timeout=5)
             print(f"📄 Document Service: {'✅ Online' if doc_health.status_code == 200 else '❌ Offline'}")
             
             # Check main application service  
-            main_health = requests.get(f"{self.main_api_url}/health", timeout=5)
+            main_health = self.http.get(f"{self.main_api_url}/health", timeout=5)
             print(f"🏢 Main Application: {'✅ Online' if main_health.status_code == 200 else '❌ Offline'}")
             
             return doc_health.status_code == 200 and main_health.status_code == 200
@@ -36,77 +67,117 @@ class HiblaDocumentWorkflow:
             print(f"❌ Service health check failed: {e}")
             return False
     
+    def validate_payload(self, data, kind, label):
+        """Reject malformed payloads before any content is built"""
+        errors = VALIDATORS[kind](data)
+        if not errors:
+            return True
+        
+        print(f"❌ {label.capitalize()} payload rejected: {len(errors)} problem(s)")
+        for error in errors[:10]:
+            print(f"   • {error}")
+        return False
+    
+    def validate_pricing(self, data, label):
+        """Recompute totals and refuse to render documents whose prices do not add up"""
+        result = compute_pricing(data)
+        if result['valid']:
+            return True
+        
+        print(f"❌ {label.capitalize()} pricing check failed: {result['mismatch_count']} mismatch(es)")
+        for mismatch in result['mismatches'][:10]:
+            print(f"   • {mismatch['field']}: claimed {mismatch['claimed']}, computed {mismatch['computed']}")
+        if result['negative_lines']:
+            print(f"   • {result['negative_lines']} line(s) with negative quantity or price")
+        return False
+    
     def generate_quotation_document(self, quotation_data):
         """Generate a quotation document from structured data"""
-        # Create quotation content from data
-        content = self._build_quotation_content(quotation_data)
+        if not self.validate_payload(quotation_data, "quotation", "quotation"):
+            return None
+        if not self.validate_pricing(quotation_data, "quotation"):
+            return None
         
-        # Generate document via service
-        response = requests.post(
-            f"{self.doc_service_url}/api/documents/generate",
-            json={
-                "filename_base": f"quotation_{quotation_data.get('quotationNumber', 'draft')}",
-                "content": content,
-                "formats": ["md", "pdf", "docx"]
-            }
+        return self._submit_document(
+            f"quotation_{quotation_data.get('quotationNumber', 'draft')}",
+            self._iter_quotation_content(quotation_data),
+            len(quotation_data.get('items', [])),
+            "quotation"
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Generated quotation documents: {list(result['paths'].keys())}")
-            return result['paths']
-        else:
-            print(f"❌ Document generation failed: {response.text}")
-            return None
     
     def generate_sales_order_document(self, sales_order_data):
         """Generate a sales order document from structured data"""
-        content = self._build_sales_order_content(sales_order_data)
+        if not self.validate_payload(sales_order_data, "sales_order", "sales order"):
+            return None
+        if not self.validate_pricing(sales_order_data, "sales order"):
+            return None
         
-        response = requests.post(
-            f"{self.doc_service_url}/api/documents/generate",
-            json={
-                "filename_base": f"sales_order_{sales_order_data.get('salesOrderNumber', 'draft')}",
-                "content": content,
-                "formats": ["md", "pdf", "docx"]
-            }
+        return self._submit_document(
+            f"sales_order_{sales_order_data.get('salesOrderNumber', 'draft')}",
+            self._iter_sales_order_content(sales_order_data),
+            len(sales_order_data.get('items', [])),
+            "sales order"
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Generated sales order documents: {list(result['paths'].keys())}")
-            return result['paths']
-        else:
-            print(f"❌ Document generation failed: {response.text}")
-            return None
     
     def generate_job_order_document(self, job_order_data):
         """Generate a job order document from structured data"""
-        content = self._build_job_order_content(job_order_data)
+        if not self.validate_payload(job_order_data, "job_order", "job order"):
+            return None
         
-        response = requests.post(
-            f"{self.doc_service_url}/api/documents/generate",
-            json={
-                "filename_base": f"job_order_{job_order_data.get('jobOrderNumber', 'draft')}",
-                "content": content,
-                "formats": ["md", "pdf", "docx"]
-            }
+        return self._submit_document(
+            f"job_order_{job_order_data.get('jobOrderNumber', 'draft')}",
+            self._iter_job_order_content(job_order_data),
+            len(job_order_data.get('items', [])),
+            "job order"
         )
+    
+    def _submit_document(self, filename_base, content_pieces, item_count, label, formats=("md", "pdf", "docx")):
+        """Send content to the document service, streaming the body for bulk orders"""
+        url = f"{self.doc_service_url}/api/documents/generate"
+        
+        if item_count >= STREAMING_ITEM_THRESHOLD:
+            # Chunked upload: the JSON body is produced while rows are still being rendered
+            response = self.http.post(
+                url,
+                data=iter_json_document_body(filename_base, iter_content_chunks(content_pieces), formats),
+                headers={'Content-Type': 'application/json'}
+            )
+        else:
+            response = self.http.post(
+                url,
+                json={
+                    "filename_base": filename_base,
+                    "content": ''.join(content_pieces),
+                    "formats": list(formats)
+                }
+            )
         
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ Generated job order documents: {list(result['paths'].keys())}")
+            print(f"✅ Generated {label} documents: {list(result['paths'].keys())}")
             return result['paths']
         else:
             print(f"❌ Document generation failed: {response.text}")
             return None
     
+    def _priced_item_row(self, item):
+        """Markdown table row for quotation and sales order items"""
+        return f"\n| {item.get('productName', 'Product')} | {item.get('specification', 'Standard')} | {item.get('quantity', 0)} | ${item.get('unitPrice', 0):.2f} | ${item.get('lineTotal', 0):.2f} |"
+    
+    def _production_item_row(self, item):
+        """Markdown table row for job order production items"""
+        return f"\n| {item.get('productName', 'Product')} | {item.get('specification', 'Standard')} | {item.get('quantity', 0)} | {item.get('status', 'Pending')} | {item.get('notes', '-')} |"
+    
     def _build_quotation_content(self, data):
         """Build quotation document content"""
+        return ''.join(self._iter_quotation_content(data))
+    
+    def _iter_quotation_content(self, data):
+        """Yield quotation content as header, one piece per item row, then footer"""
         today = datetime.now().strftime("%Y-%m-%d")
         valid_until = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
         
-        content = f"""# HIBLA MANUFACTURING QUOTATION
+        yield f"""# HIBLA MANUFACTURING QUOTATION
 
 **Company:** Hibla Filipino Hair Manufacturing & Supply  
 **Date:** {today}  
@@ -126,9 +197,9 @@ class HiblaDocumentWorkflow:
 
         # Add line items
         for item in data.get('items', []):
-            content += f"\n| {item.get('productName', 'Product')} | {item.get('specification', 'Standard')} | {item.get('quantity', 0)} | ${item.get('unitPrice', 0):.2f} | ${item.get('lineTotal', 0):.2f} |"
+            yield self._priced_item_row(item)
 
-        content += f"""
+        yield f"""
 
 ## Pricing Summary
 - **Subtotal:** ${data.get('subtotal', 0):.2f}
@@ -150,13 +221,16 @@ class HiblaDocumentWorkflow:
 *Generated by Hibla Manufacturing System - Internal Operations Platform*  
 *Document generated on {today}*
 """
-        return content
     
     def _build_sales_order_content(self, data):
         """Build sales order document content"""
+        return ''.join(self._iter_sales_order_content(data))
+    
+    def _iter_sales_order_content(self, data):
+        """Yield sales order content as header, one piece per item row, then footer"""
         today = datetime.now().strftime("%Y-%m-%d")
         
-        content = f"""# HIBLA MANUFACTURING SALES ORDER
+        yield f"""# HIBLA MANUFACTURING SALES ORDER
 
 **Company:** Hibla Filipino Hair Manufacturing & Supply  
 **Date:** {today}  
@@ -173,9 +247,9 @@ class HiblaDocumentWorkflow:
 |---------|--------------|----------|------------|------------|"""
 
         for item in data.get('items', []):
-            content += f"\n| {item.get('productName', 'Product')} | {item.get('specification', 'Standard')} | {item.get('quantity', 0)} | ${item.get('unitPrice', 0):.2f} | ${item.get('lineTotal', 0):.2f} |"
+            yield self._priced_item_row(item)
 
-        content += f"""
+        yield f"""
 
 ## Order Summary
 - **Subtotal:** ${data.get('subtotal', 0):.2f}
@@ -193,13 +267,16 @@ class HiblaDocumentWorkflow:
 *Generated by Hibla Manufacturing System - Internal Operations Platform*  
 *Document generated on {today}*
 """
-        return content
     
     def _build_job_order_content(self, data):
         """Build job order document content"""
+        return ''.join(self._iter_job_order_content(data))
+    
+    def _iter_job_order_content(self, data):
+        """Yield job order content as header, one piece per item row, then footer"""
         today = datetime.now().strftime("%Y-%m-%d")
         
-        content = f"""# HIBLA MANUFACTURING JOB ORDER
+        yield f"""# HIBLA MANUFACTURING JOB ORDER
 
 **Company:** Hibla Filipino Hair Manufacturing & Supply  
 **Date:** {today}  
@@ -218,9 +295,9 @@ class HiblaDocumentWorkflow:
 |---------|--------------|----------|--------|-------|"""
 
         for item in data.get('items', []):
-            content += f"\n| {item.get('productName', 'Product')} | {item.get('specification', 'Standard')} | {item.get('quantity', 0)} | {item.get('status', 'Pending')} | {item.get('notes', '-')} |"
+            yield self._production_item_row(item)
 
-        content += f"""
+        yield f"""
 
 ## Production Schedule
 - **Start Date:** {data.get('startDate', 'TBD')}
@@ -235,7 +312,6 @@ class HiblaDocumentWorkflow:
 *Generated by Hibla Manufacturing System - Internal Operations Platform*  
 *Job Order created on {today}*
 """
-        return content
 
 def main():
     """Main workflow demonstration"""